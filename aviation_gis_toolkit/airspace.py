@@ -0,0 +1,301 @@
+"""
+airspace.py
+airspace module provides functionality to classify large sets of points (track points, obstacles) as inside
+or outside of airspace polygons with geodesic or rhumb line edges, and to compute areas and perimeters
+of collections of polygons with geodesic edges.
+"""
+import numpy as np
+
+from .bounding_box import in_bbox
+from .area import get_geodesic_area
+from .const import *
+from .distance import Distance
+from .ellipsoid_calc import get_geodesic
+from .rhumb import get_rhumb
+
+# Edge types
+EDGE_GEODESIC = 'EDGE_GEODESIC'
+EDGE_RHUMB = 'EDGE_RHUMB'
+
+# Tolerance and maximum number of iterations of the search for the point of the geodesic edge on given meridian;
+# decimal degrees
+POLYGON_LONGITUDE_TOLERANCE = 1e-12
+POLYGON_MAX_ITERATIONS = 100
+
+# Latitude bounds of the edges and polygons are extended by this margin against rounding errors; decimal degrees
+POLYGON_MARGIN = 1e-9
+
+
+def _wrap(lon):
+    """ Normalizes longitudes to <-180, 180). """
+    return (lon + 180) % 360 - 180
+
+
+class AirspacePolygon:
+    """ Class keeps polygon with data of its edges precomputed for point in polygon tests.
+    Point is inside if the meridian from the point to the North Pole crosses the boundary odd number of times
+    (even number if the polygon contains the North Pole). Only edges which span the longitude of the point
+    are tested and latitude of the edge on that meridian is computed only if the latitude of the point is between
+    the latitude bounds of the edge.
+    Polygon can cross the antimeridian. Vertices at a pole are replaced by pole edges along the pole.
+    Polygon which boundary circles around a pole contains the pole with the same sign as the mean latitude
+    of its vertices.
+    Attributes:
+    -----------
+    ellipsoid_name : str
+        Ellipsoid short name, e.g.: WGS84.
+    lon1, lat1, lon2, lat2 : ndarray
+        Start and end points of the edges in decimal degrees format.
+    edge_type : ndarray
+        Types of the edges: EDGE_GEODESIC or EDGE_RHUMB.
+    lat_min, lat_max : ndarray
+        Latitude bounds of the edges in decimal degrees format.
+    north_pole_inside, south_pole_inside : bool
+        True if polygon contains the pole.
+    bbox : tuple
+        Bounding box of the polygon: lon_west, lat_south, lon_east, lat_north, see bounding_box.in_bbox.
+    """
+
+    def __init__(self, lon, lat, ellipsoid_name, edge_type=EDGE_GEODESIC):
+        """
+        :param lon: array_like, longitudes of the vertices in decimal degrees format, e.g. extracted by
+                    CoordinatePairExtraction and converted by Angle, closing vertex is optional
+        :param lat: array_like, latitudes of the vertices in decimal degrees format
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :param edge_type: str or array_like, type of all edges or of each edge, edge i starts at vertex i
+        """
+        self.ellipsoid_name = ellipsoid_name
+        geodesic = get_geodesic(ellipsoid_name)
+        lon = _wrap(np.asarray(lon, dtype=np.float64).ravel())
+        lat = np.asarray(lat, dtype=np.float64).ravel()
+        if len(lon) > 1 and lon[0] == lon[-1] and lat[0] == lat[-1]:
+            lon, lat = lon[:-1], lat[:-1]
+        if len(lon) < 3:
+            raise ValueError('Polygon error. Polygon requires at least 3 vertices.')
+        edge_type = np.broadcast_to(np.asarray(edge_type), lon.shape)
+        for t in np.unique(edge_type):
+            if t not in (EDGE_GEODESIC, EDGE_RHUMB):
+                raise ValueError('Polygon error. Edge type {} is not valid.'.format(t))
+
+        # Vertex at a pole becomes pole edge from the longitude of the previous vertex to the longitude
+        # of the next one, so edges to and from the pole are meridians
+        vertices = []
+        n = len(lon)
+        for i in range(n):
+            if abs(lat[i]) == 90:
+                vertices.append((lon[i - 1], lat[i], edge_type[i]))
+                vertices.append((lon[(i + 1) % n], lat[i], edge_type[i]))
+            else:
+                vertices.append((lon[i], lat[i], edge_type[i]))
+        lon = np.array([v[0] for v in vertices])
+        lat = np.array([v[1] for v in vertices])
+        self.edge_type = np.array([v[2] for v in vertices])
+        self.lon1, self.lat1 = lon, lat
+        self.lon2, self.lat2 = np.roll(lon, -1), np.roll(lat, -1)
+        d_lon = _wrap(self.lon2 - self.lon1)
+
+        # Latitude bounds of the edges, geodesic edge reaches its vertex between end points if cosine
+        # of the azimuth changes its sign
+        self.lat_min = np.minimum(self.lat1, self.lat2)
+        self.lat_max = np.maximum(self.lat1, self.lat2)
+        self._azimuth = np.zeros(len(lon))
+        self._length = np.zeros(len(lon))
+        rhumb = get_rhumb(ellipsoid_name)
+        self._isometric_lat1 = rhumb.isometric_latitude(self.lat1)
+        self._isometric_lat2 = rhumb.isometric_latitude(self.lat2)
+        idx = np.flatnonzero((self.edge_type == EDGE_GEODESIC) & (np.fabs(self.lat1) < 90) & (d_lon != 0))
+        if idx.size:
+            length, azimuth, azimuth_reverse = geodesic.inverse_batch(self.lon1[idx], self.lat1[idx],
+                                                                      self.lon2[idx], self.lat2[idx])
+            unsolved = np.flatnonzero(np.isnan(length))
+            if unsolved.size:
+                raise ValueError('Polygon error. Geodesic edges {} between nearly antipodal vertices '
+                                 'can not be solved.'.format(idx[unsolved].tolist()))
+            self._azimuth[idx], self._length[idx] = azimuth, length
+            cos_azimuth1 = np.cos(np.radians(azimuth))
+            cos_azimuth2 = -np.cos(np.radians(azimuth_reverse))
+            beta1 = np.arctan(geodesic.one_minus_f * np.tan(np.radians(self.lat1[idx])))
+            sin_alfa0 = np.sin(np.radians(azimuth)) * np.cos(beta1)
+            lat_vertex = np.degrees(np.arctan(np.tan(np.arccos(np.fabs(sin_alfa0))) / geodesic.one_minus_f))
+            has_vertex = cos_azimuth1 * cos_azimuth2 < 0
+            north = has_vertex & (cos_azimuth1 > 0)
+            south = has_vertex & (cos_azimuth1 < 0)
+            self.lat_max[idx[north]] = lat_vertex[north]
+            self.lat_min[idx[south]] = -lat_vertex[south]
+        self.lat_min -= POLYGON_MARGIN
+        self.lat_max += POLYGON_MARGIN
+
+        # Boundary circling around a pole changes longitude by 360 degrees
+        winding = abs(np.sum(d_lon)) > 180
+        self.north_pole_inside = bool(winding and np.mean(lat) > 0)
+        self.south_pole_inside = bool(winding and np.mean(lat) <= 0)
+        lat_south = -90.0 if self.south_pole_inside else max(-90.0, float(self.lat_min.min()))
+        lat_north = 90.0 if self.north_pole_inside else min(90.0, float(self.lat_max.max()))
+        cumulative = self.lon1[0] + np.concatenate(([0], np.cumsum(d_lon)))
+        if winding or cumulative.max() - cumulative.min() >= 360:
+            self.bbox = (-180.0, lat_south, 180.0, lat_north)
+        else:
+            self.bbox = (float(_wrap(cumulative.min())), lat_south, float(_wrap(cumulative.max())), lat_north)
+
+    def __len__(self):
+        return len(self.lon1)
+
+    def _geodesic_edge_lat(self, edges, lon):
+        """ Returns latitudes of the geodesic edges on the meridians of given longitudes. Longitude changes
+        monotonically along a geodesic, so the distance from the start of the edge to the meridian is found
+        by regula falsi bracketed by the end points of the edge.
+        """
+        geodesic = get_geodesic(self.ellipsoid_name)
+        lon1, lat1, azimuth = self.lon1[edges], self.lat1[edges], self._azimuth[edges]
+        lo, f_lo = np.zeros(edges.size), _wrap(lon1 - lon)
+        hi, f_hi = self._length[edges], _wrap(self.lon2[edges] - lon)
+        distance = np.zeros(edges.size)
+        lat = np.empty(edges.size)
+        active = np.arange(edges.size)
+        side = np.zeros(edges.size, dtype=np.int8)
+        for _ in range(POLYGON_MAX_ITERATIONS):
+            if not active.size:
+                break
+            s = (lo[active] * f_hi[active] - hi[active] * f_lo[active]) / (f_hi[active] - f_lo[active])
+            distance[active] = s
+            lon_s, lat[active] = geodesic.direct_batch(lon1[active], lat1[active], azimuth[active], s)
+            f = _wrap(lon_s - lon[active])
+
+            # Illinois modification, sign of f at hi is opposite to the sign at lo
+            upper = np.sign(f) == np.sign(f_hi[active])
+            lower = ~upper
+            au, al = active[upper], active[lower]
+            hi[au], f_hi[au] = s[upper], f[upper]
+            f_lo[au] = np.where(side[au] == 1, f_lo[au] / 2, f_lo[au])
+            lo[al], f_lo[al] = s[lower], f[lower]
+            f_hi[al] = np.where(side[al] == -1, f_hi[al] / 2, f_hi[al])
+            side[au], side[al] = 1, -1
+
+            active = active[(np.fabs(f) > POLYGON_LONGITUDE_TOLERANCE) & (hi[active] - lo[active] > 0)]
+        return lat
+
+    def contains(self, lon, lat):
+        """ Checks if points are inside the polygon, arguments are broadcast against each other.
+        :param lon: float or array_like, longitudes of the points in decimal degrees format
+        :param lat: float or array_like, latitudes of the points in decimal degrees format
+        :return: ndarray, bool, True for the points inside the polygon
+        """
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+        shape = lon.shape
+        lon, lat = _wrap(lon.ravel()), lat.ravel()
+        result = np.zeros(lon.size, dtype=bool)
+
+        candidates = np.flatnonzero(in_bbox(lon, lat, *self.bbox))
+        order = candidates[np.argsort(lon[candidates], kind='stable')]
+        lon_sorted = lon[order]
+
+        # Points which longitudes are within longitude ranges of the edges, ranges crossing the antimeridian
+        # are split in two
+        d_lon = _wrap(self.lon2 - self.lon1)
+        west = np.where(d_lon >= 0, self.lon1, self.lon2) - POLYGON_MARGIN
+        east = west + np.fabs(d_lon) + 2 * POLYGON_MARGIN
+        ranges = [(np.arange(len(self)), west, np.minimum(east, 180.0)),
+                  (np.flatnonzero(west < -180), _wrap(west[west < -180]), np.full(np.sum(west < -180), 180.0)),
+                  (np.flatnonzero(east > 180), np.full(np.sum(east > 180), -180.0), east[east > 180] - 360)]
+        pair_edges, pair_points = [], []
+        for edges, lon_west, lon_east in ranges:
+            start = np.searchsorted(lon_sorted, lon_west)
+            end = np.searchsorted(lon_sorted, lon_east)
+            counts = np.maximum(end - start, 0)
+            pair_edges.append(np.repeat(edges, counts))
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            pair_points.append(order[np.repeat(start, counts) + offsets])
+        pair_edges = np.concatenate(pair_edges)
+        pair_points = np.concatenate(pair_points)
+
+        # Edge crosses the meridian of the point if its end points are on the opposite sides of the meridian,
+        # end point on the meridian counts as being on its east side, so shared vertex is counted once
+        lon_p, lat_p = lon[pair_points], lat[pair_points]
+        r1 = _wrap(self.lon1[pair_edges] - lon_p)
+        r2 = _wrap(self.lon2[pair_edges] - lon_p)
+        crossing = ((r1 >= 0) != (r2 >= 0)) & (np.fabs(r2 - r1) < 180)
+        pair_edges, pair_points = pair_edges[crossing], pair_points[crossing]
+        lon_p, lat_p, r1, r2 = lon_p[crossing], lat_p[crossing], r1[crossing], r2[crossing]
+
+        # Edges entirely north of the point are crossed by the meridian to the North Pole, edges entirely
+        # south are not, latitude of the other edges on the meridian is computed
+        above = lat_p < self.lat_min[pair_edges]
+        exact = np.flatnonzero(~above & (lat_p <= self.lat_max[pair_edges]))
+        edges = pair_edges[exact]
+        rhumb = self.edge_type[edges] == EDGE_RHUMB
+        idx = exact[rhumb]
+        fraction = r1[idx] / (r1[idx] - r2[idx])
+        isometric_lat = self._isometric_lat1[pair_edges[idx]] * (1 - fraction) + \
+            self._isometric_lat2[pair_edges[idx]] * fraction
+        above[idx] = isometric_lat > get_rhumb(self.ellipsoid_name).isometric_latitude(lat_p[idx])
+        idx = exact[~rhumb]
+        above[idx] = self._geodesic_edge_lat(pair_edges[idx], lon_p[idx]) > lat_p[idx]
+
+        crossings = np.bincount(pair_points[above], minlength=lon.size)
+        result[candidates] = (crossings[candidates] % 2 == 1) != self.north_pole_inside
+        return result.reshape(shape)
+
+
+def contains_batch(polygons, lon, lat):
+    """ Checks which points are inside each of the polygons.
+    :param polygons: list of AirspacePolygon
+    :param lon: float or array_like, longitudes of the points in decimal degrees format, shape P
+    :param lat: float or array_like, latitudes of the points in decimal degrees format, shape P
+    :return: ndarray, bool, shape (len(polygons), ) + P, True for the points inside the polygon
+    """
+    lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+    result = np.zeros((len(polygons), ) + lon.shape, dtype=bool)
+    for i, polygon in enumerate(polygons):
+        result[i] = polygon.contains(lon, lat)
+    return result
+
+
+def polygon_area_perimeter_batch(lon, lat, offsets, ellipsoid_name, uom=UOM_M):
+    """ Computes areas and perimeters of the polygons with geodesic edges, all edges of all polygons are solved
+    at once. Area of a polygon is the sum of the areas between its edges and the equator, see
+    GeodesicArea.inverse_area_batch, corrected by half of the ellipsoid area if the boundary circles around a pole.
+    Area is independent of the orientation of the boundary, it is the area of the smaller of the two parts
+    of the ellipsoid surface separated by the boundary. Edges between nearly antipodal vertices, for which
+    the inverse solution does not converge, raise ValueError.
+    :param lon: array_like, longitudes of the vertices of all polygons in decimal degrees format, vertices
+                of polygon i are lon[offsets[i]:offsets[i + 1]], closing vertex is optional
+    :param lat: array_like, latitudes of the vertices of all polygons in decimal degrees format
+    :param offsets: array_like, int, K + 1 offsets of the vertices of K polygons, first is 0, last is len(lon)
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param uom: str, unit of measure of the perimeters, e.g. UOM_NM
+    :return area, perimeter: ndarray, ndarray areas in square meters and perimeters of K polygons
+    """
+    is_valid, err_msg = Distance.is_uom(uom)
+    if not is_valid:
+        raise ValueError(err_msg)
+    lon = np.asarray(lon, dtype=np.float64).ravel()
+    lat = np.asarray(lat, dtype=np.float64).ravel()
+    offsets = np.asarray(offsets, dtype=np.int64).ravel()
+    if offsets[0] != 0 or offsets[-1] != len(lon) or np.any(np.diff(offsets) < 0):
+        raise ValueError('Polygon error. Offsets of the vertices are not valid.')
+    geodesic_area = get_geodesic_area(ellipsoid_name)
+    counts = np.diff(offsets)
+    polygon = np.repeat(np.arange(len(counts)), counts)
+
+    # Edge i ends at vertex i + 1, last edge of the polygon ends at its first vertex
+    end = np.arange(1, len(lon) + 1)
+    last = counts > 0
+    end[offsets[1:][last] - 1] = offsets[:-1][last]
+    distance, area = geodesic_area.inverse_area_batch(lon, lat, lon[end], lat[end])
+    unsolved = np.flatnonzero(np.isnan(distance))
+    if unsolved.size:
+        raise ValueError('Polygon error. Geodesic edges {} between nearly antipodal vertices '
+                         'can not be solved.'.format(unsolved.tolist()))
+
+    # Crossings of the prime meridian: eastward +1, westward -1
+    lon1, lon2 = _wrap(lon), _wrap(lon[end])
+    d_lon = _wrap(lon2 - lon1)
+    transit = np.where((d_lon > 0) & (((lon1 < 0) & (lon2 >= 0)) | ((lon1 > 0) & (lon2 == 0))), 1,
+                       np.where((d_lon < 0) & (lon1 >= 0) & (lon2 < 0), -1, 0))
+
+    perimeter = np.bincount(polygon, distance, minlength=len(counts))
+    area = np.remainder(np.bincount(polygon, area, minlength=len(counts)), geodesic_area.area)
+    crossings = np.bincount(polygon, transit, minlength=len(counts)).astype(np.int64)
+    area = np.fabs(np.where(crossings % 2 == 1, area - geodesic_area.area / 2, area))
+    area = np.minimum(area, geodesic_area.area - area)
+    return area, Distance.convert_m_to_given_uom(perimeter, uom)
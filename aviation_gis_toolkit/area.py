@@ -0,0 +1,181 @@
+"""
+area.py
+area module provides functionality to compute areas between geodesics and the equator on the ellipsoid,
+summed up they give areas of the geodesic polygons.
+"""
+import math
+
+import numpy as np
+
+from .ellipsoid_calc import _polyval, _sin_series, get_geodesic
+
+# Tolerance and maximum number of the corrections of the longitude difference on the auxiliary sphere of Vincenty
+# solution; radians. Each correction reduces its error by the factor of the order of the flattening, 2 - 5 of them
+# reach the rounding error.
+AREA_OMEGA_TOLERANCE = 1e-15
+AREA_OMEGA_MAX_ITERATIONS = 10
+
+
+def _cos_series(sin_x, cos_x, coeffs):
+    """ Evaluates sum of coeffs[k] * cos((2 * k + 1) * x), k = 0..len(coeffs) - 1, using Clenshaw summation.
+    :param sin_x: float or ndarray, sine of x
+    :param cos_x: float or ndarray, cosine of x
+    :param coeffs: list of floats or ndarrays, coefficients of the series
+    :return: float or ndarray, sum of the series
+    """
+    ar = 2 * (cos_x - sin_x) * (cos_x + sin_x)  # 2 * cos(2 * x)
+    y0, y1 = 0, 0
+    for coeff in reversed(coeffs):
+        y0, y1 = ar * y0 - y1 + coeff, y0
+    return cos_x * (y0 - y1)
+
+
+# Coefficients of the series C4[l] of the area between geodesic and the equator by Charles F. F. Karney:
+# for l = 0..5 coefficients of eps^j, j = 5..l, as (coefficients of the polynomial in the third flattening
+# from the highest power, denominator)
+_C4_COEFFS = [[([97], 15015), ([1088, 156], 45045), ([-224, -4784, 1573], 45045),
+               ([-10656, 14144, -4576, -858], 45045), ([64, 624, -4576, 6864, -3003], 15015),
+               ([100, 208, 572, 3432, -12012, 30030], 45045)],
+              [([1], 9009), ([-2944, 468], 135135), ([5792, 1040, -1287], 135135),
+               ([5952, -11648, 9152, -2574], 135135), ([-64, -624, 4576, -6864, 3003], 135135)],
+              [([8], 10725), ([1856, -936], 225225), ([-8448, 4992, -1144], 225225),
+               ([-1440, 4160, -4576, 1716], 225225)],
+              [([-136], 63063), ([1024, -208], 105105), ([3584, -3328, 1144], 315315)],
+              [([-128], 135135), ([-2560, 832], 405405)],
+              [([128], 99099)]]
+
+
+class GeodesicArea:
+    """ Class keeps the constants of the areas derived from the ellipsoid of the geodesic and computes areas
+    between geodesics and the equator. Instances for the registered ellipsoids are created once and cached,
+    use get_geodesic_area to obtain them.
+    Attributes:
+    -----------
+    geodesic : Geodesic
+        Geodesic of the ellipsoid.
+    c2 : float
+        Authalic radius squared; square meters.
+    area : float
+        Surface area of the ellipsoid; square meters.
+    """
+
+    def __init__(self, geodesic):
+        self.geodesic = geodesic
+        a, f = geodesic.a, geodesic.f
+        n = f / (2 - f)
+        e = math.sqrt(f * (2 - f))
+        self.c2 = (a * a + (a * geodesic.one_minus_f) ** 2 * (math.atanh(e) / e if e else 1)) / 2
+        self.area = 4 * math.pi * self.c2
+        self._c4_coeffs = [[_polyval(coeffs, n) / denominator for coeffs, denominator in c4_coeffs]
+                           for c4_coeffs in _C4_COEFFS]
+
+    def __repr__(self):
+        return 'GeodesicArea({!r})'.format(self.geodesic)
+
+    def _c4(self, eps):
+        """ Returns coefficients C4[0..5] of the series of the area between geodesic and the equator. """
+        coeffs = []
+        mult = 1
+        for c4_coeffs in self._c4_coeffs:
+            coeffs.append(mult * _polyval(c4_coeffs, eps))
+            mult = mult * eps
+        return coeffs
+
+    def inverse_area_batch(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Computes lengths of the geodesics between points and areas between the geodesics and the equator,
+        bounded by the meridians of the points, arguments are broadcast against each other.
+        Area is the sum of the spherical excess term on the authalic sphere and the series in the third flattening
+        by Charles F. F. Karney, it is positive for the geodesics heading east north of the equator.
+        Sum of the areas of the edges of a polygon gives its area, see airspace.polygon_area_perimeter_batch.
+        Longitude difference on the auxiliary sphere of Vincenty solution is corrected with the series, the azimuths,
+        the arc lengths and the difference of the azimuths all follow from the corrected one.
+        Error of the area of an edge is below 0.1 square meter for the edges up to 5000 km, it grows with
+        the rounding errors to 1 square meter for 15000 km and to several square meters for nearly antipodal points.
+        For more information refer to: https://doi.org/10.1007/s00190-012-0578-z
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :return distance, area: ndarray, ndarray distances in meters and areas in square meters,
+                                NaN where Vincenty solution does not converge
+        """
+        geodesic = self.geodesic
+        distance, omega12 = geodesic._inverse_batch(lon_initial, lat_initial, lon_end, lat_end)[::3]
+
+        # Reduced latitudes
+        phi1 = np.radians(lat_initial)
+        phi2 = np.radians(lat_end)
+        beta1 = np.arctan2(geodesic.one_minus_f * np.sin(phi1), np.cos(phi1))
+        beta2 = np.arctan2(geodesic.one_minus_f * np.sin(phi2), np.cos(phi2))
+        sin_beta1, cos_beta1 = np.sin(beta1), np.cos(beta1)
+        sin_beta2, cos_beta2 = np.sin(beta2), np.cos(beta2)
+        sin_beta12 = np.sin(beta2 - beta1)
+
+        # Longitude difference on the auxiliary sphere of Vincenty solution is truncated in the flattening, it is
+        # corrected until it gives the longitude difference of the points by the series of C. F. F. Karney,
+        # derivative of the longitude difference with respect to it differs from 1 by the order of the flattening
+        d_lon = np.fmod(np.asarray(lon_end, dtype=np.float64) - np.asarray(lon_initial, dtype=np.float64), 360)
+        d_lon = np.where(d_lon > 180, d_lon - 360, np.where(d_lon < -180, d_lon + 360, d_lon))
+        lamb12 = np.radians(d_lon)
+        converged = False
+        for i in range(AREA_OMEGA_MAX_ITERATIONS + 1):
+            # Forward azimuths at the initial and at the end point, the azimuth at the equator crossing and the arc
+            # lengths from it follow from the longitude difference on the auxiliary sphere, sin(beta2 - beta1)
+            # keeps the precision of short geodesics
+            sin_omega12, cos_omega12 = np.sin(omega12), np.cos(omega12)
+            versine_omega12 = 2 * np.sin(omega12 / 2) ** 2
+            alfa1 = np.arctan2(cos_beta2 * sin_omega12, sin_beta12 + sin_beta1 * cos_beta2 * versine_omega12)
+            alfa2 = np.arctan2(cos_beta1 * sin_omega12, sin_beta12 - cos_beta1 * sin_beta2 * versine_omega12)
+            sin_alfa1, cos_alfa1 = np.sin(alfa1), np.cos(alfa1)
+            sin_alfa2, cos_alfa2 = np.sin(alfa2), np.cos(alfa2)
+            sin_alfa0 = sin_alfa1 * cos_beta1
+            cos_alfa0 = np.hypot(cos_alfa1, sin_alfa1 * sin_beta1)
+            sigma1 = np.arctan2(sin_beta1, cos_alfa1 * cos_beta1)
+            sigma2 = np.arctan2(sin_beta2, cos_alfa2 * cos_beta2)
+            sin_sigma1, cos_sigma1 = np.sin(sigma1), np.cos(sigma1)
+            sin_sigma2, cos_sigma2 = np.sin(sigma2), np.cos(sigma2)
+            k2 = cos_alfa0 * cos_alfa0 * geodesic._ep2
+            eps = k2 / (2 * (1 + np.sqrt(1 + k2)) + k2)
+            if converged or i == AREA_OMEGA_MAX_ITERATIONS:
+                break
+            sigma12 = np.remainder(sigma2 - sigma1 + math.pi, 2 * math.pi) - math.pi
+            c3 = geodesic._c3(eps)
+            a3c = -geodesic.f * sin_alfa0 * _polyval(geodesic._a3_coeffs, eps)
+            correction = omega12 + a3c * (sigma12 + _sin_series(sin_sigma2, cos_sigma2, c3) -
+                                          _sin_series(sin_sigma1, cos_sigma1, c3)) - lamb12
+            omega12 = omega12 - correction
+            converged = not np.any(np.fabs(correction) > AREA_OMEGA_TOLERANCE)
+
+        c4 = self._c4(eps)
+        a4 = geodesic.a * geodesic.a * cos_alfa0 * sin_alfa0 * geodesic.f * (2 - geodesic.f)
+
+        # Difference of the azimuths of short geodesics loses its precision, it is computed from the longitude
+        # difference and the reduced latitudes, except for nearly antipodal points
+        use_omega = (cos_omega12 > -0.7071) & (sin_beta2 - sin_beta1 < 1.75)
+        alfa12 = np.where(use_omega,
+                          2 * np.arctan2(sin_omega12 * (sin_beta1 * (1 + cos_beta2) + sin_beta2 * (1 + cos_beta1)),
+                                         (1 + cos_omega12) * (sin_beta1 * sin_beta2 +
+                                                              (1 + cos_beta1) * (1 + cos_beta2))),
+                          np.arctan2(sin_alfa2 * cos_alfa1 - cos_alfa2 * sin_alfa1,
+                                     cos_alfa2 * cos_alfa1 + sin_alfa2 * sin_alfa1))
+        area = a4 * (_cos_series(sin_sigma2, cos_sigma2, c4) - _cos_series(sin_sigma1, cos_sigma1, c4)) + \
+            self.c2 * alfa12
+        area = np.where(distance == 0, 0.0, area)
+        return distance, area
+
+
+# GeodesicArea instances of the registered ellipsoids, created on first use
+_geodesic_areas = {}
+
+
+def get_geodesic_area(ellipsoid_name):
+    """ Returns cached GeodesicArea instance for the registered ellipsoid, it is recreated if the ellipsoid
+    is registered again.
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return: GeodesicArea
+    """
+    geodesic = get_geodesic(ellipsoid_name)
+    geodesic_area = _geodesic_areas.get(ellipsoid_name)
+    if geodesic_area is None or geodesic_area.geodesic is not geodesic:
+        geodesic_area = _geodesic_areas[ellipsoid_name] = GeodesicArea(geodesic)
+    return geodesic_area
@@ -0,0 +1,113 @@
+"""
+bounding_box.py
+bounding_box module provides functionality to compute latitude/longitude bounding boxes of geodesic circles
+and to test points against such boxes, e.g. to prefilter database rows before exact distance checks.
+"""
+import numpy as np
+
+from .const import *
+from .distance import convert_dist_batch_to_m
+from .ellipsoid_calc import get_geodesic
+
+# Tolerance and maximum number of iterations of the search for the azimuth of the easternmost point; degrees
+BBOX_AZIMUTH_TOLERANCE = 1e-11
+BBOX_MAX_ITERATIONS = 100
+
+# Boxes are extended by this margin so that rounding errors never leave points of the circle outside; degrees
+BBOX_MARGIN = 1e-9
+
+
+def _wrap(lon):
+    """ Normalizes longitudes to <-180, 180). """
+    return (lon + 180) % 360 - 180
+
+
+def geodesic_circle_bbox(lon_center, lat_center, radius, ellipsoid_name, uom=UOM_M):
+    """ Computes tight bounding boxes of geodesic circles, arguments are broadcast against each other.
+    Northernmost and southernmost points lie on the meridian of the center. If the circle contains a pole
+    the box extends to that pole and covers all longitudes. Otherwise the easternmost point is where the geodesic
+    from the center reaches the circle heading east (geodesic circle is perpendicular to the geodesics from its
+    center), the azimuth of that geodesic is found by regula falsi, the westernmost point is symmetric.
+    Boxes crossing the antimeridian have lon_west greater than lon_east.
+    :param lon_center: float or array_like, longitudes of the centers in decimal degrees format
+    :param lat_center: float or array_like, latitudes of the centers in decimal degrees format
+    :param radius: float or array_like, radii of the circles
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param uom: str or array_like, unit of measure of the radii, e.g. UOM_NM
+    :return lon_west, lat_south, lon_east, lat_north: ndarray, ndarray, ndarray, ndarray
+            bounds of the boxes in decimal degrees format, shape is the broadcast shape of the arguments
+    """
+    geodesic = get_geodesic(ellipsoid_name)
+    radius = convert_dist_batch_to_m(radius, uom)
+    lon_center, lat_center, radius = np.broadcast_arrays(np.asarray(lon_center, dtype=np.float64),
+                                                         np.asarray(lat_center, dtype=np.float64), radius)
+    shape = lon_center.shape
+    lon_center, lat_center, radius = lon_center.ravel(), lat_center.ravel(), radius.ravel()
+
+    # Latitude bounds along the meridian, unless the circle contains the pole
+    north_pole = radius >= geodesic.inverse_batch(lon_center, lat_center, lon_center, 90.0)[0]
+    south_pole = radius >= geodesic.inverse_batch(lon_center, lat_center, lon_center, -90.0)[0]
+    lat_north = np.where(north_pole, 90.0,
+                         np.minimum(90.0, geodesic.direct_batch(lon_center, lat_center, 0.0, radius)[1] + BBOX_MARGIN))
+    lat_south = np.where(south_pole, -90.0,
+                         np.maximum(-90.0, geodesic.direct_batch(lon_center, lat_center, 180.0, radius)[1] -
+                                    BBOX_MARGIN))
+
+    lon_west = np.full(lon_center.shape, -180.0)
+    lon_east = np.full(lon_center.shape, 180.0)
+
+    # Azimuth of the geodesic to the easternmost point: forward azimuth at the end point equals 90
+    idx = np.flatnonzero(~(north_pole | south_pole))
+    lon_c, lat_c, r = lon_center[idx], lat_center[idx], radius[idx]
+    lo, f_lo = np.zeros(idx.size), np.full(idx.size, -90.0)
+    hi, f_hi = np.full(idx.size, 180.0), np.full(idx.size, 90.0)
+    azimuth = np.full(idx.size, 90.0)
+    active = np.arange(idx.size)
+    side = np.zeros(idx.size, dtype=np.int8)
+    for _ in range(BBOX_MAX_ITERATIONS):
+        if not active.size:
+            break
+        a = (lo[active] * f_hi[active] - hi[active] * f_lo[active]) / (f_hi[active] - f_lo[active])
+        azimuth[active] = a
+        azimuth_reverse = geodesic.direct_with_azimuth_batch(lon_c[active], lat_c[active], a, r[active])[2]
+        f = _wrap(azimuth_reverse + 180 - 90)
+
+        # Illinois modification: halve function value of the end point retained twice in a row
+        upper = f > 0
+        lower = ~upper
+        au, al = active[upper], active[lower]
+        hi[au], f_hi[au] = a[upper], f[upper]
+        f_lo[au] = np.where(side[au] == 1, f_lo[au] / 2, f_lo[au])
+        lo[al], f_lo[al] = a[lower], f[lower]
+        f_hi[al] = np.where(side[al] == -1, f_hi[al] / 2, f_hi[al])
+        side[au], side[al] = 1, -1
+
+        active = active[(np.fabs(f) > BBOX_AZIMUTH_TOLERANCE) & (hi[active] - lo[active] > BBOX_AZIMUTH_TOLERANCE)]
+
+    lon_end = geodesic.direct_batch(lon_c, lat_c, azimuth, r)[0]
+    d_lon = np.fabs(_wrap(lon_end - lon_c)) + BBOX_MARGIN
+    lon_west[idx] = np.where(d_lon < 180, _wrap(lon_c - d_lon), -180.0)
+    lon_east[idx] = np.where(d_lon < 180, _wrap(lon_c + d_lon), 180.0)
+
+    return lon_west.reshape(shape), lat_south.reshape(shape), lon_east.reshape(shape), lat_north.reshape(shape)
+
+
+def in_bbox(lon, lat, lon_west, lat_south, lon_east, lat_north):
+    """ Checks if points are within bounding boxes, arguments are broadcast against each other.
+    Boxes with lon_west greater than lon_east cross the antimeridian.
+    :param lon: float or array_like, longitudes of the points in decimal degrees format
+    :param lat: float or array_like, latitudes of the points in decimal degrees format
+    :param lon_west: float or array_like, western bounds of the boxes in decimal degrees format
+    :param lat_south: float or array_like, southern bounds of the boxes in decimal degrees format
+    :param lon_east: float or array_like, eastern bounds of the boxes in decimal degrees format
+    :param lat_north: float or array_like, northern bounds of the boxes in decimal degrees format
+    :return: ndarray, bool, True for the points within boxes
+    """
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    lon_west = np.asarray(lon_west, dtype=np.float64)
+    lon_east = np.asarray(lon_east, dtype=np.float64)
+    inside_lon = np.where(lon_west <= lon_east,
+                          (lon >= lon_west) & (lon <= lon_east),
+                          (lon >= lon_west) | (lon <= lon_east))
+    return inside_lon & (lat >= lat_south) & (lat <= lat_north)
@@ -13,6 +13,13 @@ UOM_SM = 'SM'
 
 UOM_LIST = [UOM_M, UOM_KM, UOM_NM, UOM_FT, UOM_SM]
 
+# Number of meters in one unit of measure
+UOM_TO_M = {UOM_M: 1.0,
+            UOM_KM: 1000.0,
+            UOM_NM: 1852.0,
+            UOM_FT: 0.3048,
+            UOM_SM: 1609.344}
+
 # ------------------- Angle types ------------------- #
 
 # Angle types
@@ -0,0 +1,182 @@
+"""
+datum.py
+datum module provides functionality to transform coordinates between datums of the registered ellipsoids,
+e.g. legacy WGS72 data into WGS84, with Helmert (7 parameters) and Molodensky transformations.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from .ecef import ecef_to_geodetic, geodetic_to_ecef
+from .ellipsoid_calc import ellipsoids
+
+# Transformation methods
+DATUM_HELMERT = 'DATUM_HELMERT'  # Through ECEF coordinates, rigorous
+DATUM_MOLODENSKY = 'DATUM_MOLODENSKY'  # Directly on geodetic coordinates, first order
+
+# Parameters of Helmert transformation, position vector convention:
+# translations in meters, rotations in arc seconds, scale difference in ppm
+helmert_parameters = namedtuple('HelmertParameters', ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'ds'])
+
+
+class DatumTransformation:
+    """ Class keeps parameters of the transformation from source to target datum together with the values
+    precomputed from them.
+    Attributes:
+    -----------
+    source : str
+        Short name of the ellipsoid of the source datum, e.g. WGS72.
+    target : str
+        Short name of the ellipsoid of the target datum, e.g. WGS84.
+    parameters : helmert_parameters
+        Parameters of the transformation.
+    matrix : ndarray
+        3 x 3 matrix of Helmert transformation (scale and rotation): xyz_target = translation + matrix @ xyz_source.
+    translation : ndarray
+        Translation vector of Helmert transformation; meters.
+    """
+
+    def __init__(self, source, target, parameters, matrix=None, translation=None):
+        self.source = source
+        self.target = target
+        self.parameters = parameters
+        if matrix is None:
+            tx, ty, tz, rx, ry, rz, ds = parameters
+            rx, ry, rz = (math.radians(r / 3600) for r in (rx, ry, rz))
+            matrix = (1 + ds * 1e-6) * np.array([[1, -rz, ry],
+                                                 [rz, 1, -rx],
+                                                 [-ry, rx, 1]])
+            translation = np.array([tx, ty, tz], dtype=np.float64)
+        self.matrix = matrix
+        self.translation = translation
+
+    def inverse(self):
+        """ Returns transformation from target to source datum, matrix and translation are inverted exactly.
+        :return: DatumTransformation
+        """
+        matrix = np.linalg.inv(self.matrix)
+        parameters = helmert_parameters(*(-p for p in self.parameters))
+        return DatumTransformation(self.target, self.source, parameters, matrix, -matrix @ self.translation)
+
+    def _shift(self, x, y, z):
+        """ Returns ECEF shift of the points: translation + (matrix - identity) @ xyz. """
+        m = self.matrix
+        dx = self.translation[0] + (m[0, 0] - 1) * x + m[0, 1] * y + m[0, 2] * z
+        dy = self.translation[1] + m[1, 0] * x + (m[1, 1] - 1) * y + m[1, 2] * z
+        dz = self.translation[2] + m[2, 0] * x + m[2, 1] * y + (m[2, 2] - 1) * z
+        return dx, dy, dz
+
+    def helmert(self, lon, lat, height=0.0):
+        """ Transforms coordinates through ECEF coordinates, arguments are broadcast against each other.
+        :param lon: float or array_like, longitudes in decimal degrees format
+        :param lat: float or array_like, latitudes in decimal degrees format
+        :param height: float or array_like, ellipsoidal heights; meters
+        :return lon, lat, height: ndarray, ndarray, ndarray transformed coordinates
+        """
+        x, y, z = geodetic_to_ecef(lon, lat, self.source, height)
+        dx, dy, dz = self._shift(x, y, z)
+        return ecef_to_geodetic(x + dx, y + dy, z + dz, self.target)
+
+    def molodensky(self, lon, lat, height=0.0):
+        """ Transforms coordinates with standard Molodensky formulae, arguments are broadcast against each other.
+        The shift of each point includes the rotation and scale terms of the parameters, so the transformation
+        agrees with Helmert method to first order (centimeters for WGS72 -> WGS84), while it needs no conversion
+        from ECEF coordinates.
+        :param lon: float or array_like, longitudes in decimal degrees format
+        :param lat: float or array_like, latitudes in decimal degrees format
+        :param height: float or array_like, ellipsoidal heights; meters
+        :return lon, lat, height: ndarray, ndarray, ndarray transformed coordinates
+        """
+        a, b, f = ellipsoids[self.source]
+        a_target, _, f_target = ellipsoids[self.target]
+        da, df = a_target - a, f_target - f
+        e_sq = 1 - (b * b) / (a * a)
+
+        height = np.asarray(height, dtype=np.float64)
+        phi = np.radians(lat)
+        lamb = np.radians(lon)
+        sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+        sin_lamb, cos_lamb = np.sin(lamb), np.cos(lamb)
+
+        w = np.sqrt(1 - e_sq * sin_phi * sin_phi)
+        n = a / w  # Radius of curvature in the prime vertical
+        m = a * (1 - e_sq) / (w * w * w)  # Radius of curvature in the meridian
+
+        x = (n + height) * cos_phi * cos_lamb
+        y = (n + height) * cos_phi * sin_lamb
+        z = (n * (1 - e_sq) + height) * sin_phi
+        dx, dy, dz = self._shift(x, y, z)
+
+        d_phi = (-dx * sin_phi * cos_lamb - dy * sin_phi * sin_lamb + dz * cos_phi +
+                 da * n * e_sq * sin_phi * cos_phi / a +
+                 df * (m * a / b + n * b / a) * sin_phi * cos_phi) / (m + height)
+        d_lamb = (-dx * sin_lamb + dy * cos_lamb) / ((n + height) * cos_phi)
+        d_height = (dx * cos_phi * cos_lamb + dy * cos_phi * sin_lamb + dz * sin_phi -
+                    da * a / n + df * b / a * n * sin_phi * sin_phi)
+
+        lon = np.degrees(lamb + d_lamb)
+        return (lon + 180) % 360 - 180, np.degrees(phi + d_phi), height + d_height
+
+    def transform(self, lon, lat, height=0.0, method=DATUM_HELMERT):
+        """ Transforms coordinates with selected method.
+        :param lon: float or array_like, longitudes in decimal degrees format
+        :param lat: float or array_like, latitudes in decimal degrees format
+        :param height: float or array_like, ellipsoidal heights; meters
+        :param method: str, DATUM_HELMERT or DATUM_MOLODENSKY
+        :return lon, lat, height: ndarray, ndarray, ndarray transformed coordinates
+        """
+        if method == DATUM_HELMERT:
+            return self.helmert(lon, lat, height)
+        if method == DATUM_MOLODENSKY:
+            return self.molodensky(lon, lat, height)
+        raise ValueError('Datum error. Method {} is not valid.'.format(method))
+
+
+# Transformations between the registered ellipsoids, key: (source, target)
+datum_transformations = {}
+
+
+def register_datum_transformation(source, target, parameters):
+    """ Registers transformation from source to target datum and the inverse one.
+    :param source: str, short name of the ellipsoid of the source datum, e.g. WGS72
+    :param target: str, short name of the ellipsoid of the target datum, e.g. WGS84
+    :param parameters: helmert_parameters, parameters of the transformation
+    """
+    for name in (source, target):
+        if name not in ellipsoids:
+            raise ValueError('Datum error. Ellipsoid {} is not registered.'.format(name))
+    transformation = DatumTransformation(source, target, parameters)
+    datum_transformations[(source, target)] = transformation
+    datum_transformations[(target, source)] = transformation.inverse()
+
+
+# WGS72 -> WGS84, EPSG:1237
+register_datum_transformation('WGS72', 'WGS84', helmert_parameters(0.0, 0.0, 4.5, 0.0, 0.0, 0.554, 0.2263))
+
+
+def transform_datum(lon, lat, source, target, height=0.0, method=DATUM_HELMERT):
+    """ Transforms coordinates from source to target datum, arguments are broadcast against each other.
+    :param lon: float or array_like, longitudes in decimal degrees format
+    :param lat: float or array_like, latitudes in decimal degrees format
+    :param source: str, short name of the ellipsoid of the source datum, e.g. WGS72
+    :param target: str, short name of the ellipsoid of the target datum, e.g. WGS84
+    :param height: float or array_like, ellipsoidal heights; meters
+    :param method: str, DATUM_HELMERT or DATUM_MOLODENSKY
+    :return lon, lat, height: ndarray, ndarray, ndarray transformed coordinates
+    """
+    return datum_transformations[(source, target)].transform(lon, lat, height, method)
+
+
+def transform_datum_chunks(chunks, source, target, method=DATUM_HELMERT):
+    """ Transforms stream of coordinate chunks, e.g. read block by block from a large file, so memory use
+    depends on the chunk size only.
+    :param chunks: iterable of tuples (lon, lat) or (lon, lat, height) of arrays
+    :param source: str, short name of the ellipsoid of the source datum, e.g. WGS72
+    :param target: str, short name of the ellipsoid of the target datum, e.g. WGS84
+    :param method: str, DATUM_HELMERT or DATUM_MOLODENSKY
+    :return: generator of (lon, lat, height) tuples of transformed arrays
+    """
+    transformation = datum_transformations[(source, target)]
+    for chunk in chunks:
+        yield transformation.transform(*chunk, method=method)
@@ -0,0 +1,150 @@
+"""
+densify.py
+densify module provides functionality to densify polylines along geodesics, so that straight segments between
+the vertices, in longitude/latitude or in a target projection, stay within a tolerance of the true geodesic edges.
+"""
+import math
+
+import numpy as np
+
+from .const import *
+from .distance import convert_dist_batch_to_m
+from .ellipsoid_calc import get_geodesic
+
+# Maximum number of bisections of an edge, limits densification of edges passing through the poles
+DENSIFY_MAX_DEPTH = 30
+
+# Number of intervals of the grid the deviation is interpolated on between the tested points
+DENSIFY_GRID_SIZE = 32
+
+# Segments are split if the interpolated deviation exceeds this fraction of the tolerance, the interpolation
+# underestimates the maximum deviation by up to ~1.5%
+DENSIFY_SAFETY_FACTOR = 0.95
+
+
+def _wrap(lon):
+    """ Normalizes longitudes to <-180, 180). """
+    return (lon + 180) % 360 - 180
+
+
+def _deviation(geodesic, projection, lon0, lat0, lon1, lat1, lon, lat):
+    """ Returns signed distances of the points from the straight lines through start and end points.
+    Without projection the lines are straight in longitude/latitude and distances are measured
+    with the radii of curvature at the points.
+    """
+    if projection is not None:
+        x0, y0 = projection(lon0, lat0)
+        x1, y1 = projection(lon1, lat1)
+        x, y = projection(lon, lat)
+        x1, y1, x, y = x1 - x0, y1 - y0, x - x0, y - y0
+    else:
+        phi = np.radians(lat)
+        sin_phi = np.sin(phi)
+        e_sq = geodesic.f * (2 - geodesic.f)
+        w = np.sqrt(1 - e_sq * sin_phi * sin_phi)
+        scale_lon = math.radians(geodesic.a) / w * np.cos(phi)
+        scale_lat = math.radians(geodesic.a) * (1 - e_sq) / (w * w * w)
+        x1, y1 = _wrap(lon1 - lon0) * scale_lon, (lat1 - lat0) * scale_lat
+        x, y = _wrap(lon - lon0) * scale_lon, (lat - lat0) * scale_lat
+
+    length = np.hypot(x1, y1)
+    return np.where(length > 0, (x * y1 - y * x1) / np.where(length > 0, length, 1), np.hypot(x, y))
+
+
+def _interpolation_matrix():
+    """ Returns matrix which maps deviations at 1/4, 1/2 and 3/4 of the segment to the deviations
+    at DENSIFY_GRID_SIZE + 1 points of the segment, interpolated with t * (1 - t) * quadratic polynomial in t.
+    """
+    nodes = np.array([0.25, 0.5, 0.75])
+    t = np.linspace(0, 1, DENSIFY_GRID_SIZE + 1)[:, np.newaxis]
+    lagrange = np.ones((t.size, 3))
+    for j in range(3):
+        for k in range(3):
+            if k != j:
+                lagrange[:, j] *= ((t - nodes[k]) / (nodes[j] - nodes[k]))[:, 0]
+    return t * (1 - t) * lagrange / (nodes * (1 - nodes))
+
+
+def densify_batch(lon, lat, offsets, tolerance, ellipsoid_name, uom=UOM_M, projection=None):
+    """ Inserts vertices into the edges of polylines, so that the straight segments between vertices deviate from
+    the geodesic edges by no more than tolerance. Spacing adapts to the curvature of each edge in the target plane:
+    deviations of the geodesic points at 1/4, 1/2 and 3/4 of each segment from the straight segment are interpolated
+    along the segment, so that also S-shaped deviations are caught, and segments which deviate by more than
+    DENSIFY_SAFETY_FACTOR * tolerance are bisected. All segments of all polylines are processed together, one round
+    of vectorized direct solutions per level of bisection.
+    Edges which inverse solution does not converge (nearly antipodal vertices) or with NaN coordinates
+    raise ValueError.
+    :param lon: array_like, longitudes of the vertices of all polylines in decimal degrees format, vertices
+                of polyline i are lon[offsets[i]:offsets[i + 1]]
+    :param lat: array_like, latitudes of the vertices of all polylines in decimal degrees format
+    :param offsets: array_like, int, K + 1 offsets of the vertices of K polylines, first is 0, last is len(lon)
+    :param tolerance: float, maximum deviation of the straight segments from the geodesic
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param uom: str, unit of measure of the tolerance, e.g. UOM_NM
+    :param projection: callable, maps arrays of longitudes and latitudes to arrays of x, y coordinates in meters
+                       of the target projection, None if the segments are straight in longitude/latitude.
+                       Projection must be continuous along the polylines, e.g. edges must not cross the antimeridian
+                       if it is the edge of the projection.
+    :return lon, lat, offsets: ndarray, ndarray, ndarray vertices of the densified polylines, original vertices
+                               are kept, and K + 1 offsets of their vertices
+    """
+    tolerance = float(convert_dist_batch_to_m(tolerance, uom))
+    if tolerance <= 0:
+        raise ValueError('Densification error. Tolerance must be greater than 0.')
+    lon = np.asarray(lon, dtype=np.float64).ravel()
+    lat = np.asarray(lat, dtype=np.float64).ravel()
+    offsets = np.asarray(offsets, dtype=np.int64).ravel()
+    if offsets[0] != 0 or offsets[-1] != len(lon) or np.any(np.diff(offsets) < 0):
+        raise ValueError('Densification error. Offsets of the vertices are not valid.')
+    geodesic = get_geodesic(ellipsoid_name)
+    polyline = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+    # Edge i joins vertices i and i + 1 of the same polyline
+    edge = np.flatnonzero(polyline[:-1] == polyline[1:])
+    length, azimuth = geodesic.inverse_batch(lon[edge], lat[edge], lon[edge + 1], lat[edge + 1])[:2]
+    unsolved = np.flatnonzero(np.isnan(length))
+    if unsolved.size:
+        raise ValueError('Densification error. Geodesic edges starting at vertices {} can not be solved, '
+                         'e.g. nearly antipodal vertices.'.format(edge[unsolved].tolist()))
+
+    # Pending segments: edge, distances of the ends along the edge, ends and the midpoint
+    seg_edge = np.arange(edge.size)
+    s0, s1 = np.zeros(edge.size), length
+    lon0, lat0, lon1, lat1 = lon[edge], lat[edge], lon[edge + 1], lat[edge + 1]
+    lon_mid, lat_mid = geodesic.direct_batch(lon0, lat0, azimuth, length / 2)
+
+    interpolation = _interpolation_matrix()
+    new_edge, new_s, new_lon, new_lat = [], [], [], []
+    for _ in range(DENSIFY_MAX_DEPTH):
+        if not seg_edge.size:
+            break
+        s_mid = (s0 + s1) / 2
+        quarter = np.concatenate([(s0 + s_mid) / 2, (s_mid + s1) / 2])
+        lon_q, lat_q = geodesic.direct_batch(np.tile(lon[edge[seg_edge]], 2), np.tile(lat[edge[seg_edge]], 2),
+                                             np.tile(azimuth[seg_edge], 2), quarter)
+        deviation = _deviation(geodesic, projection, np.tile(lon0, 3), np.tile(lat0, 3), np.tile(lon1, 3),
+                               np.tile(lat1, 3), np.concatenate([lon_q, lon_mid]), np.concatenate([lat_q, lat_mid]))
+        deviation = np.max(np.fabs(interpolation @ deviation.reshape(3, -1)), axis=0)
+        split = np.flatnonzero(deviation > DENSIFY_SAFETY_FACTOR * tolerance)
+
+        # Midpoints of the split segments become vertices, quarter points become midpoints of the halves
+        new_edge.append(seg_edge[split])
+        new_s.append(s_mid[split])
+        new_lon.append(lon_mid[split])
+        new_lat.append(lat_mid[split])
+        n = seg_edge.size
+        seg_edge = np.tile(seg_edge[split], 2)
+        s0, s1 = np.concatenate([s0[split], s_mid[split]]), np.concatenate([s_mid[split], s1[split]])
+        lon0, lon1 = np.concatenate([lon0[split], lon_mid[split]]), np.concatenate([lon_mid[split], lon1[split]])
+        lat0, lat1 = np.concatenate([lat0[split], lat_mid[split]]), np.concatenate([lat_mid[split], lat1[split]])
+        lon_mid = np.concatenate([lon_q[split], lon_q[n + split]])
+        lat_mid = np.concatenate([lat_q[split], lat_q[n + split]])
+
+    # Original vertices sort first within their edges, new vertices by the distance along the edge
+    vertex = np.concatenate([np.arange(len(lon))] + [edge[e] for e in new_edge])
+    s = np.concatenate([np.full(len(lon), -1.0)] + new_s)
+    order = np.lexsort((s, vertex))
+    lon_out = np.concatenate([lon] + new_lon)[order]
+    lat_out = np.concatenate([lat] + new_lat)[order]
+    counts = np.bincount(polyline[vertex], minlength=len(offsets) - 1)
+    return lon_out, lat_out, np.concatenate([[0], np.cumsum(counts)])
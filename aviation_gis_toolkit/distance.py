@@ -2,6 +2,8 @@
 distance.py
 Distance module provides functionality to distance validation and conversion
 """
+import numpy as np
+
 from .const import *
 
 
@@ -121,32 +123,13 @@ class Distance:
     def convert_dist_to_m(self):
         """ Converts source distance value from source UOM to meters. """
         if self.is_valid:
-            # Convert to meters
-            if self.src_uom == UOM_M:
-                return self.src_fdist
-            elif self.src_uom == UOM_KM:
-                return self.src_fdist * 1000
-            elif self.src_uom == UOM_NM:
-                return self.src_fdist * 1852
-            elif self.src_uom == UOM_FT:
-                return self.src_fdist * 0.3048
-            elif self.src_uom == UOM_SM:
-                return self.src_fdist * 1609.344
+            return self.src_fdist * UOM_TO_M[self.src_uom]
 
     @staticmethod
     def convert_m_to_given_uom(dist_m, to_uom):
         """ Converts distance from meters to given UOM. """
         if to_uom in UOM_LIST:
-            if to_uom == UOM_M:
-                return dist_m
-            elif to_uom == UOM_KM:
-                return dist_m / 1000
-            elif to_uom == UOM_NM:
-                return dist_m / 1852
-            elif to_uom == UOM_FT:
-                return dist_m / 0.3048
-            elif to_uom == UOM_SM:
-                return dist_m / 1609.344
+            return dist_m / UOM_TO_M[to_uom]
 
     def convert_dist_to_uom(self, to_uom):
         """ Convert distance between various units. """
@@ -157,3 +140,27 @@ class Distance:
                 else:
                     d_m = self.convert_dist_to_m()  # Convert to meters
                     return self.convert_m_to_given_uom(d_m, to_uom)  # Convert from meters
+
+
+def convert_dist_batch_to_m(distances, uom):
+    """ Converts array of distances to meters.
+    :param distances: float or array_like, distances
+    :param uom: str or array_like, unit of measure of all distances or units of measure of each distance,
+                broadcast against distances, e.g. UOM_NM
+    :return: ndarray, distances; meters
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    if np.any(distances < 0):
+        raise ValueError('Distance error. Distance not be less than 0.')
+
+    if isinstance(uom, str):
+        if uom not in UOM_TO_M:
+            raise ValueError('Distance error. UOM {} is not valid.'.format(uom))
+        return distances * UOM_TO_M[uom]
+
+    uoms, index = np.unique(np.asarray(uom), return_inverse=True)
+    for u in uoms:
+        if u not in UOM_TO_M:
+            raise ValueError('Distance error. UOM {} is not valid.'.format(u))
+    factors = np.array([UOM_TO_M[u] for u in uoms])[index].reshape(np.shape(uom))
+    return distances * factors
@@ -0,0 +1,197 @@
+"""
+ecef.py
+ecef module provides conversion between geodetic coordinates and ECEF (Earth-centered, Earth-fixed) cartesian
+coordinates and fast proximity screening of points based on chord distance.
+"""
+import numpy as np
+
+from .ellipsoid_calc import ellipsoids, vincenty_inverse_solution_batch
+
+# Margins of the chord prefilter: relative one covers rounding errors and the difference between the semi-minor
+# axis and the flattening of the ellipsoid definitions, absolute one covers error of the Vincenty solution
+# (~1e-5 m for very short lines); meters
+CHORD_PREFILTER_TOLERANCE = 1e-9
+CHORD_PREFILTER_MARGIN = 1e-3
+
+
+def geodetic_to_ecef(lon, lat, ellipsoid_name, height=0.0):
+    """ Converts geodetic coordinates to ECEF coordinates, arguments are broadcast against each other.
+    :param lon: float or array_like, longitudes in decimal degrees format
+    :param lat: float or array_like, latitudes in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param height: float or array_like, ellipsoidal heights; meters
+    :return x, y, z: ndarray, ndarray, ndarray ECEF coordinates; meters
+    """
+    a, b, _ = ellipsoids[ellipsoid_name]
+    e_sq = 1 - (b * b) / (a * a)
+
+    lon = np.radians(lon)
+    lat = np.radians(lat)
+    sin_lat = np.sin(lat)
+    cos_lat = np.cos(lat)
+    # Radius of curvature in the prime vertical
+    n = a / np.sqrt(1 - e_sq * sin_lat * sin_lat)
+
+    x = (n + height) * cos_lat * np.cos(lon)
+    y = (n + height) * cos_lat * np.sin(lon)
+    z = (n * (1 - e_sq) + height) * sin_lat
+    return x, y, z
+
+
+def ecef_to_geodetic(x, y, z, ellipsoid_name):
+    """ Converts ECEF coordinates to geodetic coordinates, arguments are broadcast against each other.
+    Uses closed form solution by Heikkinen, not valid close to the center of the Earth.
+    :param x: float or array_like, x coordinates; meters
+    :param y: float or array_like, y coordinates; meters
+    :param z: float or array_like, z coordinates; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon, lat, height: ndarray, ndarray, ndarray longitudes and latitudes in decimal degrees format,
+                              ellipsoidal heights in meters
+    """
+    a, b, _ = ellipsoids[ellipsoid_name]
+    a_sq, b_sq = a * a, b * b
+    e_sq = 1 - b_sq / a_sq
+    ep_sq = a_sq / b_sq - 1
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+    p_sq = x * x + y * y
+    p = np.sqrt(p_sq)
+    z_sq = z * z
+
+    f = 54 * b_sq * z_sq
+    g = p_sq + (1 - e_sq) * z_sq - e_sq * (a_sq - b_sq)
+    c = e_sq * e_sq * f * p_sq / (g * g * g)
+    s = np.cbrt(1 + c + np.sqrt(c * c + 2 * c))
+    k = s + 1 + 1 / s
+    pp = f / (3 * k * k * g * g)
+    q = np.sqrt(1 + 2 * e_sq * e_sq * pp)
+    r0 = -pp * e_sq * p / (1 + q) + np.sqrt(np.maximum(
+        0, a_sq / 2 * (1 + 1 / q) - pp * (1 - e_sq) * z_sq / (q * (1 + q)) - pp * p_sq / 2))
+    t = p - e_sq * r0
+    u = np.sqrt(t * t + z_sq)
+    v = np.sqrt(t * t + (1 - e_sq) * z_sq)
+    z0 = b_sq * z / (a * v)
+
+    height = u * (1 - b_sq / (a * v))
+    lat = np.arctan2(z + ep_sq * z0, p)
+    lon = np.arctan2(y, x)
+    return np.degrees(lon), np.degrees(lat), height
+
+
+def chord_distance_batch(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name):
+    """ Computes straight line (chord) distances between points on the ellipsoid, arguments are broadcast against
+    each other. Chord distance is never greater than the geodesic distance.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+    :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return: ndarray, chord distances; meters
+    """
+    x1, y1, z1 = geodetic_to_ecef(lon_initial, lat_initial, ellipsoid_name)
+    x2, y2, z2 = geodetic_to_ecef(lon_end, lat_end, ellipsoid_name)
+    return np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2)
+
+
+def chord_radius(radius):
+    """ Returns chord distance threshold of the prefilter for geodesic radius.
+    :param radius: float or array_like, geodesic radius; meters
+    :return: float or ndarray, chord distance threshold; meters
+    """
+    return np.asarray(radius, dtype=np.float64) * (1 + CHORD_PREFILTER_TOLERANCE) + CHORD_PREFILTER_MARGIN
+
+
+def chord_prefilter(lon_initial, lat_initial, lon_end, lat_end, radius, ellipsoid_name):
+    """ Screens pairs of points by chord distance, arguments are broadcast against each other.
+    Pairs that are rejected (False) are certainly farther than geodesic radius, pairs that pass (True)
+    need exact geodesic distance to be confirmed.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+    :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+    :param radius: float or array_like, geodesic radius; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return: ndarray, bool, True for the pairs that may be within radius
+    """
+    x1, y1, z1 = geodetic_to_ecef(lon_initial, lat_initial, ellipsoid_name)
+    x2, y2, z2 = geodetic_to_ecef(lon_end, lat_end, ellipsoid_name)
+    chord_sq = (x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2
+    return chord_sq <= chord_radius(radius) ** 2
+
+
+def within_geodesic_radius(lon_initial, lat_initial, lon_end, lat_end, radius, ellipsoid_name):
+    """ Checks which pairs of points are within geodesic radius, arguments are broadcast against each other.
+    Vincenty inverse solution is computed only for the pairs passing chord prefilter.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+    :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+    :param radius: float or array_like, geodesic radius; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return: ndarray, bool, True for the pairs within radius
+    """
+    lon_initial, lat_initial, lon_end, lat_end, radius = np.broadcast_arrays(
+        *[np.asarray(arg, dtype=np.float64) for arg in (lon_initial, lat_initial, lon_end, lat_end, radius)])
+    result = chord_prefilter(lon_initial, lat_initial, lon_end, lat_end, radius, ellipsoid_name)
+    idx = np.nonzero(result)
+    distance = vincenty_inverse_solution_batch(lon_initial[idx], lat_initial[idx], lon_end[idx], lat_end[idx],
+                                               ellipsoid_name)[0]
+    result[idx] = distance <= radius[idx]
+    return result
+
+
+class EcefPoints:
+    """ Class keeps ECEF coordinates and unit vectors of a set of points on the ellipsoid, so they are computed
+    once and reused by proximity screening of many query points.
+    Attributes:
+    -----------
+    ellipsoid_name : str
+        Ellipsoid short name, e.g.: WGS84.
+    lon : ndarray
+        Longitudes of the points in decimal degrees format.
+    lat : ndarray
+        Latitudes of the points in decimal degrees format.
+    xyz : ndarray
+        N x 3 ECEF coordinates of the points; meters.
+    unit : ndarray
+        N x 3 unit vectors pointing from the center of the ellipsoid to the points.
+    """
+
+    def __init__(self, lon, lat, ellipsoid_name):
+        self.ellipsoid_name = ellipsoid_name
+        self.lon = np.asarray(lon, dtype=np.float64).ravel()
+        self.lat = np.asarray(lat, dtype=np.float64).ravel()
+        self.xyz = np.stack(geodetic_to_ecef(self.lon, self.lat, ellipsoid_name), axis=-1)
+        self.unit = self.xyz / np.linalg.norm(self.xyz, axis=-1, keepdims=True)
+
+    def __len__(self):
+        return len(self.lon)
+
+    def candidates(self, lon, lat, radius):
+        """ Returns indices of the points which may be within geodesic radius from the query point.
+        Points that are rejected are certainly farther than radius, points returned can be slightly farther.
+        :param lon: float, longitude of the query point in decimal degrees format
+        :param lat: float, latitude of the query point in decimal degrees format
+        :param radius: float, geodesic radius; meters
+        :return: ndarray, indices of the candidate points
+        """
+        query = np.array(geodetic_to_ecef(lon, lat, self.ellipsoid_name))
+        diff = self.xyz - query
+        chord_sq = np.einsum('ij,ij->i', diff, diff)
+        return np.flatnonzero(chord_sq <= chord_radius(radius) ** 2)
+
+    def within_radius(self, lon, lat, radius):
+        """ Returns indices of the points within geodesic radius from the query point and distances to them.
+        Exact geodesic distances are computed only for the candidates passing chord prefilter.
+        :param lon: float, longitude of the query point in decimal degrees format
+        :param lat: float, latitude of the query point in decimal degrees format
+        :param radius: float, geodesic radius; meters
+        :return indices, distances: ndarray, ndarray indices of the points and geodesic distances to them; meters
+        """
+        indices = self.candidates(lon, lat, radius)
+        distances = vincenty_inverse_solution_batch(lon, lat, self.lon[indices], self.lat[indices],
+                                                    self.ellipsoid_name)[0]
+        inside = distances <= radius
+        return indices[inside], distances[inside]
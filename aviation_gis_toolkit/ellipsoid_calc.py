@@ -5,19 +5,1533 @@ coordinate point based on the coordinate initial point and distance and bearing,
 distance between to points.
 """
 import math
-from collections import namedtuple
+import threading
+from collections import namedtuple, Counter, OrderedDict
+
+import numpy as np
 
 ellipsoid = namedtuple('Ellipsoid', ['A', 'B', 'F'])
 
 ellipsoids = {'WGS84': ellipsoid(A=6378137.0, B=6356752.3141, F=1 / 298.25722210088),
               'WGS72': ellipsoid(A=6378135.0, B=6356750.52, F=1 / 298.26000000000)}
 
+# Version of the algorithms, increase it when results of any solution change, it invalidates persistent caches
+ALGORITHM_VERSION = 1
+
+# Default maximum number of iterations of the Vincenty loops. Direct solution falls back to the series solution
+# when the cap is hit, inverse solution does not converge for nearly antipodal points and returns no result
+VINCENTY_MAX_ITERATIONS = 200
+
+# Geodetic problem types, used by convergence telemetry and error bounds of methods
+PROBLEM_DIRECT = 'PROBLEM_DIRECT'
+PROBLEM_INVERSE = 'PROBLEM_INVERSE'
+
+# Methods (accuracy tiers) of the direct solution and distance computation
+METHOD_SPHERICAL = 'METHOD_SPHERICAL'  # Sphere of the mean radius
+METHOD_ANDOYER_LAMBERT = 'METHOD_ANDOYER_LAMBERT'  # First order in flattening
+METHOD_VINCENTY = 'METHOD_VINCENTY'  # Iterative solution by Thaddeus Vincenty
+METHOD_SERIES = 'METHOD_SERIES'  # Non-iterative series solution, direct problem only
+
+method_error_bound = namedtuple('MethodErrorBound', ['relative', 'absolute', 'max_distance'])
+
+# Declared error bounds of the methods for the Earth ellipsoids, relative to the Vincenty solution:
+# error <= relative * distance + absolute, valid for distances up to max_distance; meters.
+# Error of the direct solution is the distance between the computed end point and the Vincenty one.
+METHOD_ERROR_BOUNDS = {PROBLEM_DIRECT: {METHOD_SPHERICAL: method_error_bound(6e-3, 0.0, math.inf),
+                                        METHOD_ANDOYER_LAMBERT: method_error_bound(4e-6, 0.0, math.inf),
+                                        METHOD_VINCENTY: method_error_bound(0.0, 1e-3, math.inf),
+                                        METHOD_SERIES: method_error_bound(0.0, 1e-3, math.inf)},
+                       PROBLEM_INVERSE: {METHOD_SPHERICAL: method_error_bound(6e-3, 0.0, math.inf),
+                                         # Andoyer-Lambert formula degrades towards antipodal points
+                                         METHOD_ANDOYER_LAMBERT: method_error_bound(2e-6, 0.0, 10000000.0),
+                                         METHOD_VINCENTY: method_error_bound(0.0, 1e-3, math.inf)}}
+
+# Methods used by select_method, from the fastest to the slowest
+METHODS_BY_SPEED = [METHOD_SPHERICAL, METHOD_ANDOYER_LAMBERT, METHOD_VINCENTY]
+
+# Default memory budget of the temporary arrays used while computing pairwise matrices; bytes
+MATRIX_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Default size and key quantization of the direct solution cache
+DIRECT_CACHE_SIZE = 65536
+DIRECT_CACHE_ANGLE_QUANTUM = 1e-10  # decimal degrees, ~0.01 mm on the ground
+DIRECT_CACHE_DISTANCE_QUANTUM = 1e-5  # meters
+
+
+# Tiny number used to avoid division by zero at the poles
+_TINY = math.sqrt(2.2250738585072014e-308)
+
+
+def _polyval(coeffs, x):
+    """ Evaluates polynomial with coefficients given from the highest power, works for floats and arrays. """
+    y = 0
+    for coeff in coeffs:
+        y = y * x + coeff
+    return y
+
+
+def _sin_series(sin_x, cos_x, coeffs):
+    """ Evaluates sum of coeffs[k - 1] * sin(2 * k * x), k = 1..len(coeffs), using Clenshaw summation.
+    :param sin_x: float or ndarray, sine of x
+    :param cos_x: float or ndarray, cosine of x
+    :param coeffs: list of floats or ndarrays, coefficients of the series
+    :return: float or ndarray, sum of the series
+    """
+    ar = 2 * (cos_x - sin_x) * (cos_x + sin_x)  # 2 * cos(2 * x)
+    y0, y1 = 0, 0
+    for coeff in reversed(coeffs):
+        y0, y1 = ar * y0 - y1 + coeff, y0
+    return 2 * sin_x * cos_x * y0
+
+
+def _a1m1(eps):
+    """ Returns A1 - 1, A1 is the scale factor between distance and spherical arc length (6th order series). """
+    eps2 = eps * eps
+    t = eps2 * (eps2 * (eps2 + 4) + 64) / 256
+    return (t + eps) / (1 - eps)
+
+
+def _c1(eps):
+    """ Returns coefficients C1[1..6] of the series of the distance in terms of spherical arc length. """
+    eps2 = eps * eps
+    return [eps * (eps2 * (6 - eps2) - 16) / 32,
+            eps2 * (eps2 * (64 - 9 * eps2) - 128) / 2048,
+            eps * eps2 * (9 * eps2 - 16) / 768,
+            eps2 * eps2 * (3 * eps2 - 5) / 512,
+            -7 * eps * eps2 * eps2 / 1280,
+            -7 * eps2 * eps2 * eps2 / 2048]
+
+
+def _c1p(eps):
+    """ Returns coefficients C1'[1..6] of the reverted series of the spherical arc length in terms of distance. """
+    eps2 = eps * eps
+    return [eps * (eps2 * (205 * eps2 - 432) + 768) / 1536,
+            eps2 * (eps2 * (4005 * eps2 - 4736) + 3840) / 12288,
+            eps * eps2 * (116 - 225 * eps2) / 384,
+            eps2 * eps2 * (2695 - 7173 * eps2) / 7680,
+            3467 * eps * eps2 * eps2 / 7680,
+            38081 * eps2 * eps2 * eps2 / 61440]
+
+
+worst_case = namedtuple('WorstCase', ['iterations', 'converged', 'problem', 'inputs'])
+
+
+class VincentyTelemetry:
+    """ Class collects convergence statistics of the Vincenty iterations. Telemetry is opt-in, assign instance
+    to Geodesic.telemetry attribute to enable it, e.g.: get_geodesic('WGS84').telemetry = VincentyTelemetry()
+    Attributes:
+    -----------
+    histograms : dict
+        Keeps collections.Counter number of iterations -> number of solutions for each problem type,
+        e.g. histograms[PROBLEM_DIRECT][4] is the number of direct solutions that took 4 iterations.
+    calls : collections.Counter
+        Number of solutions per problem type.
+    non_converged : collections.Counter
+        Number of solutions per problem type that hit the iteration cap.
+    worst_cases : list
+        Up to worst_cases_size worst_case tuples (iterations, converged, problem, inputs) with the highest number
+        of iterations, sorted descending. Inputs are the arguments of the scalar solution.
+    """
+
+    def __init__(self, worst_cases_size=10):
+        self.worst_cases_size = worst_cases_size
+        self.histograms = None
+        self.calls = None
+        self.non_converged = None
+        self.worst_cases = None
+        self.reset()
+
+    def reset(self):
+        """ Clears collected statistics. """
+        self.histograms = {PROBLEM_DIRECT: Counter(), PROBLEM_INVERSE: Counter()}
+        self.calls = Counter()
+        self.non_converged = Counter()
+        self.worst_cases = []
+
+    def _add_worst_cases(self, cases):
+        """ Merges cases into the list of worst cases. """
+        if len(self.worst_cases) == self.worst_cases_size and \
+                all(case.iterations <= self.worst_cases[-1].iterations for case in cases):
+            return
+        self.worst_cases = sorted(self.worst_cases + cases, key=lambda case: case.iterations,
+                                  reverse=True)[:self.worst_cases_size]
+
+    def record(self, problem, iterations, converged, inputs):
+        """ Records statistics of single solution.
+        :param problem: str, problem type, e.g. PROBLEM_DIRECT
+        :param iterations: int, number of iterations
+        :param converged: bool, False if the iteration cap was hit
+        :param inputs: tuple, arguments of the solution
+        """
+        self.histograms[problem][iterations] += 1
+        self.calls[problem] += 1
+        if not converged:
+            self.non_converged[problem] += 1
+        self._add_worst_cases([worst_case(iterations, converged, problem, inputs)])
+
+    def record_batch(self, problem, iterations, converged, inputs):
+        """ Records statistics of vectorized solution.
+        :param problem: str, problem type, e.g. PROBLEM_DIRECT
+        :param iterations: ndarray, number of iterations of each element
+        :param converged: ndarray, bool, False for elements that hit the iteration cap
+        :param inputs: tuple of ndarrays, arguments of the solution, one element per solution
+        """
+        histogram = self.histograms[problem]
+        for n, count in enumerate(np.bincount(iterations)):
+            if count:
+                histogram[n] += int(count)
+        self.calls[problem] += int(iterations.size)
+        self.non_converged[problem] += int(np.count_nonzero(~converged))
+
+        k = min(self.worst_cases_size, iterations.size)
+        if k:
+            top = np.argpartition(iterations, iterations.size - k)[iterations.size - k:]
+            self._add_worst_cases([worst_case(int(iterations[i]), bool(converged[i]), problem,
+                                              tuple(float(arg[i]) for arg in inputs)) for i in top])
+
+
+cache_info = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class DirectSolutionCache:
+    """ Class keeps bounded LRU cache of the direct solutions. Cache is opt-in, see enable_direct_solution_cache.
+    Keys are the ellipsoid name and the arguments of the solution quantized to angle_quantum and
+    distance_quantum, so arguments that differ only by floating point noise share one entry.
+    The cached result is the result for the arguments of the first query of the entry.
+    Cache is thread-safe.
+    Attributes:
+    -----------
+    maxsize : int
+        Maximum number of entries, the least recently used entry is evicted when the cache is full.
+    angle_quantum : float
+        Quantization step of longitudes, latitudes and azimuths; decimal degrees.
+    distance_quantum : float
+        Quantization step of distances; meters.
+    """
+
+    def __init__(self, maxsize=DIRECT_CACHE_SIZE, angle_quantum=DIRECT_CACHE_ANGLE_QUANTUM,
+                 distance_quantum=DIRECT_CACHE_DISTANCE_QUANTUM):
+        if maxsize < 1 or angle_quantum <= 0 or distance_quantum <= 0:
+            raise ValueError('Cache error. Invalid parameters: maxsize={}, angle_quantum={}, '
+                             'distance_quantum={}.'.format(maxsize, angle_quantum, distance_quantum))
+        self.maxsize = maxsize
+        self.angle_quantum = angle_quantum
+        self.distance_quantum = distance_quantum
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def key(self, lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name):
+        """ Returns key of the cache entry for the arguments of the direct solution. """
+        q = self.angle_quantum
+        return (ellipsoid_name, round(lon_initial / q), round(lat_initial / q), round(azimuth_initial / q),
+                round(distance / self.distance_quantum))
+
+    def get(self, key):
+        """ Returns cached result for the key and marks the entry as the most recently used.
+        :param key: tuple, see key method
+        :return: tuple, cached result, None if the key is not in the cache
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        """ Stores result in the cache, evicts the least recently used entry if the cache is full.
+        :param key: tuple, see key method
+        :param result: tuple, result of the direct solution
+        """
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """ Removes all entries and resets statistics. """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self):
+        """ Returns statistics of the cache.
+        :return: cache_info, (hits, misses, evictions, maxsize, currsize)
+        """
+        with self._lock:
+            return cache_info(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
+
+
+class Geodesic:
+    """ Class keeps parameters of the ellipsoid together with the constants derived from them and solves
+    geodetic problems on that ellipsoid. Instances for the registered ellipsoids are created once and cached,
+    use get_geodesic to obtain them.
+    Attributes:
+    -----------
+    a : float
+        Semi-major axis; meters.
+    b : float
+        Semi-minor axis; meters.
+    f : float
+        Flattening.
+    one_minus_f : float
+        1 - f, ratio of the reduced latitude tangent to the latitude tangent.
+    a_sq_minus_b_sq: float
+        a * a - b * b, numerator of the second eccentricity squared.
+    b_sq: float
+        b * b, denominator of the second eccentricity squared.
+    mean_radius: float
+        (2 * a + b) / 3, radius of the sphere used by spherical methods; meters.
+    max_iterations: int
+        Maximum number of iterations of the Vincenty loops.
+    telemetry: VincentyTelemetry
+        Collects convergence statistics if set, None by default.
+    """
+
+    def __init__(self, a, b, f, max_iterations=VINCENTY_MAX_ITERATIONS):
+        self.a = a
+        self.b = b
+        self.f = f
+        self.max_iterations = max_iterations
+        self.telemetry = None
+        self.one_minus_f = 1 - f
+        self.a_sq_minus_b_sq = a * a - b * b
+        self.b_sq = b * b
+        self.mean_radius = (2 * a + b) / 3
+
+        # Coefficients of the series used by direct_series method, they depend on third flattening only
+        n = f / (2 - f)
+        self._n = n
+        self._ep2 = self.a_sq_minus_b_sq / self.b_sq
+        # A3 - polynomial in eps, coefficients from eps^5 to eps^0
+        self._a3_coeffs = [-3 / 128,
+                           (-2 * n - 3) / 64,
+                           ((-n - 3) * n - 1) / 16,
+                           ((3 * n - 1) * n - 2) / 8,
+                           (n - 1) / 2,
+                           1]
+        # C3[l] = eps^l * polynomial in eps, coefficients from the highest power
+        self._c3_coeffs = [[3 / 128, (2 * n + 5) / 128, ((3 - n) * n + 3) / 64, (1 - n * n) / 8, (1 - n) / 4],
+                           [5 / 256, (n + 3) / 128, ((-3 * n - 2) * n + 3) / 64, ((n - 3) * n + 2) / 32],
+                           [7 / 512, (9 - 10 * n) / 384, ((5 * n - 9) * n + 5) / 192],
+                           [7 / 512, (7 - 14 * n) / 512],
+                           [21 / 2560]]
+
+    def __repr__(self):
+        return 'Geodesic(a={}, b={}, f={})'.format(self.a, self.b, self.f)
+
+    def direct(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Computes the latitude and longitude of the second point based on latitude, longitude,
+        of the first point and distance and azimuth from first point to second point.
+        Uses the algorithm by Thaddeus Vincenty for direct geodetic problem.
+        For more information refer to: http://www.ngs.noaa.gov/PUBS_LIB/inverse.pdf
+        If the iteration does not converge within max_iterations, result of direct_series method is returned.
+        :param lon_initial: float, longitude of the initial  point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+        :param distance: float, distance from first point to second point; meters
+        :return lon_end, lat_end: float, float longitude and longitude of the end point in decimal degrees format
+        """
+        return self.direct_with_azimuth(lon_initial, lat_initial, azimuth_initial, distance)[:2]
+
+    def direct_with_azimuth(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Direct method which also returns the azimuth from the end point to the initial point.
+        The azimuth comes from the terms of the solution, so it is cheaper than solving the inverse problem.
+        Forward azimuth of the geodesic at the end point, e.g. to continue the next leg of the route along
+        the same geodesic, is (azimuth_reverse + 180) % 360.
+        :param lon_initial: float, longitude of the initial  point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+        :param distance: float, distance from first point to second point; meters
+        :return lon_end, lat_end, azimuth_reverse: float, float, float longitude and longitude of the end point and
+                azimuth from the end point to the initial point in decimal degrees format, azimuth is in <0, 360)
+        """
+        b, f = self.b, self.f
+
+        # Convert latitude, longitude, azimuth of the initial point to radians
+        lon1 = math.radians(lon_initial)
+        lat1 = math.radians(lat_initial)
+        alfa1 = math.radians(azimuth_initial)
+
+        sin_alfa1 = math.sin(alfa1)
+        cos_alfa1 = math.cos(alfa1)
+
+        # U1 - reduced latitude
+        tan_u1 = self.one_minus_f * math.tan(lat1)
+        cos_u1 = 1 / math.sqrt(1 + tan_u1 * tan_u1)
+        sin_u1 = tan_u1 * cos_u1
+
+        # sigma1 - angular distance on the sphere from the equator to initial point
+        sigma1 = math.atan2(tan_u1, cos_alfa1)
+
+        # sin_alfa - azimuth of the geodesic at the equator
+        sin_alfa = cos_u1 * sin_alfa1
+        cos_sq_alfa = 1 - sin_alfa * sin_alfa
+        u_sq = cos_sq_alfa * self.a_sq_minus_b_sq / self.b_sq
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+
+        sigma0 = distance / (b * A)
+        sigma = sigma0
+        sigmap = 1
+        sin_sigma, cos_sigma, cos2sigma_m = None, None, None
+        iterations = 0
+
+        while math.fabs(sigma - sigmap) > 1e-12:
+            if iterations == self.max_iterations:
+                if self.telemetry is not None:
+                    self.telemetry.record(PROBLEM_DIRECT, iterations, False,
+                                          (lon_initial, lat_initial, azimuth_initial, distance))
+                return self.direct_series_with_azimuth(lon_initial, lat_initial, azimuth_initial, distance)
+            iterations += 1
+            cos2sigma_m = math.cos(2 * sigma1 + sigma)
+            sin_sigma = math.sin(sigma)
+            cos_sigma = math.cos(sigma)
+            d_sigma = B * sin_sigma * (cos2sigma_m + B / 4 * (
+                        cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m) - B / 6 * cos2sigma_m * (
+                            -3 + 4 * sin_sigma * sin_sigma) * (-3 + 4 * cos2sigma_m * cos2sigma_m)))
+            sigmap = sigma
+            sigma = sigma0 + d_sigma
+
+        if self.telemetry is not None:
+            self.telemetry.record(PROBLEM_DIRECT, iterations, True,
+                                  (lon_initial, lat_initial, azimuth_initial, distance))
+
+        var_aux = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alfa1  # Auxiliary variable
+
+        # Latitude of the end point in radians
+        lat2 = math.atan2(sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alfa1,
+                          self.one_minus_f * math.sqrt(sin_alfa * sin_alfa + var_aux * var_aux))
+
+        lamb = math.atan2(sin_sigma * sin_alfa1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alfa1)
+        C = f / 16 * cos_sq_alfa * (4 + f * (4 - 3 * cos_sq_alfa))
+        L = lamb - (1 - C) * f * sin_alfa * (
+                    sigma + C * sin_sigma * (cos2sigma_m + C * cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m)))
+        # Longitude of the end point in radians
+        lon2 = (lon1 + L + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        # Azimuth of the geodesic at the end point
+        alfa2 = math.atan2(sin_alfa, -var_aux)
+
+        # Convert to decimal degrees
+        lon_end = math.degrees(lon2)
+        lat_end = math.degrees(lat2)
+        azimuth_reverse = (math.degrees(alfa2) + 180) % 360
+
+        return lon_end, lat_end, azimuth_reverse
+
+    def direct_batch(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Vectorized version of direct method, see direct_with_azimuth_batch.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                                  format, shape is the broadcast shape of the arguments
+        """
+        return self.direct_with_azimuth_batch(lon_initial, lat_initial, azimuth_initial, distance)[:2]
+
+    def direct_with_azimuth_batch(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Vectorized version of direct_with_azimuth method.
+        Computes the latitudes and longitudes of the end points for arrays of initial points, azimuths and
+        distances. Arguments are broadcast against each other, so any of them can be a scalar. The sigma iteration
+        runs element-wise: each element is iterated until it converges and then is left untouched, so every element
+        goes through exactly the same sequence of operations as in the scalar method.
+        Note: NumPy tan and arctan2 may differ from math module counterparts in the last unit in the last place,
+        so for some inputs results can differ from direct method by ~1e-13 degree.
+        Elements that do not converge within max_iterations are computed by direct_series_with_azimuth_batch method.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :return lon_end, lat_end, azimuth_reverse: ndarray, ndarray, ndarray longitudes and latitudes of the end
+                points and azimuths from the end points to the initial points in decimal degrees format,
+                shape is the broadcast shape of the arguments
+        """
+        b, f = self.b, self.f
+
+        lon_initial = np.asarray(lon_initial, dtype=np.float64)
+        lat_initial = np.asarray(lat_initial, dtype=np.float64)
+        azimuth_initial = np.asarray(azimuth_initial, dtype=np.float64)
+        distance = np.asarray(distance, dtype=np.float64)
+        shape = np.broadcast_shapes(lon_initial.shape, lat_initial.shape, azimuth_initial.shape, distance.shape)
+
+        def flat(arr):
+            return np.broadcast_to(arr, shape).ravel()
+
+        # Terms of the initial point and of the azimuth are computed before broadcasting,
+        # e.g. for range rings they are computed once per center and once per azimuth
+        alfa1 = np.radians(azimuth_initial)
+        sin_alfa1 = flat(np.sin(alfa1))
+        cos_alfa1 = flat(np.cos(alfa1))
+
+        # U1 - reduced latitude
+        tan_u1 = self.one_minus_f * np.tan(np.radians(lat_initial))
+        cos_u1 = 1 / np.sqrt(1 + tan_u1 * tan_u1)
+        sin_u1 = flat(tan_u1 * cos_u1)
+        cos_u1 = flat(cos_u1)
+        tan_u1 = flat(tan_u1)
+
+        lon_initial, lat_initial = flat(lon_initial), flat(lat_initial)
+        azimuth_initial, distance = flat(azimuth_initial), flat(distance)
+        lon1 = np.radians(lon_initial)
+
+        # sigma1 - angular distance on the sphere from the equator to initial point
+        sigma1 = np.arctan2(tan_u1, cos_alfa1)
+
+        # sin_alfa - azimuth of the geodesic at the equator
+        sin_alfa = cos_u1 * sin_alfa1
+        cos_sq_alfa = 1 - sin_alfa * sin_alfa
+        u_sq = cos_sq_alfa * self.a_sq_minus_b_sq / self.b_sq
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+
+        sigma0 = distance / (b * A)
+        sigma = sigma0.copy()
+        sin_sigma = np.empty_like(sigma)
+        cos_sigma = np.empty_like(sigma)
+        cos2sigma_m = np.empty_like(sigma)
+
+        iterations = np.zeros(sigma.size, dtype=np.int64)
+
+        # Indices of the elements that have not converged yet, every element is iterated at least once
+        idx = np.arange(sigma.size)
+        for _ in range(self.max_iterations):
+            iterations[idx] += 1
+            sigma_i = sigma[idx]
+            B_i = B[idx]
+            cos2sigma_m_i = np.cos(2 * sigma1[idx] + sigma_i)
+            sin_sigma_i = np.sin(sigma_i)
+            cos_sigma_i = np.cos(sigma_i)
+            d_sigma = B_i * sin_sigma_i * (cos2sigma_m_i + B_i / 4 * (
+                        cos_sigma_i * (-1 + 2 * cos2sigma_m_i * cos2sigma_m_i) - B_i / 6 * cos2sigma_m_i * (
+                            -3 + 4 * sin_sigma_i * sin_sigma_i) * (-3 + 4 * cos2sigma_m_i * cos2sigma_m_i)))
+            sigma_new = sigma0[idx] + d_sigma
+
+            cos2sigma_m[idx] = cos2sigma_m_i
+            sin_sigma[idx] = sin_sigma_i
+            cos_sigma[idx] = cos_sigma_i
+            sigma[idx] = sigma_new
+            idx = idx[np.fabs(sigma_new - sigma_i) > 1e-12]
+            if not idx.size:
+                break
+
+        if self.telemetry is not None:
+            converged = np.ones(sigma.size, dtype=bool)
+            converged[idx] = False
+            self.telemetry.record_batch(PROBLEM_DIRECT, iterations, converged,
+                                        (lon_initial, lat_initial, azimuth_initial, distance))
+
+        var_aux = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alfa1  # Auxiliary variable
+
+        # Latitude of the end point in radians
+        lat2 = np.arctan2(sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alfa1,
+                          self.one_minus_f * np.sqrt(sin_alfa * sin_alfa + var_aux * var_aux))
+
+        lamb = np.arctan2(sin_sigma * sin_alfa1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alfa1)
+        C = f / 16 * cos_sq_alfa * (4 + f * (4 - 3 * cos_sq_alfa))
+        L = lamb - (1 - C) * f * sin_alfa * (
+                    sigma + C * sin_sigma * (cos2sigma_m + C * cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m)))
+        # Longitude of the end point in radians
+        lon2 = (lon1 + L + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        # Azimuth of the geodesic at the end point
+        alfa2 = np.arctan2(sin_alfa, -var_aux)
+
+        # Convert to decimal degrees
+        lon_end = np.degrees(lon2)
+        lat_end = np.degrees(lat2)
+        azimuth_reverse = (np.degrees(alfa2) + 180) % 360
+
+        if idx.size:
+            # Fallback for the elements that hit the iteration cap
+            lon_end[idx], lat_end[idx], azimuth_reverse[idx] = self.direct_series_with_azimuth_batch(
+                lon_initial[idx], lat_initial[idx], azimuth_initial[idx], distance[idx])
+
+        return lon_end.reshape(shape), lat_end.reshape(shape), azimuth_reverse.reshape(shape)
+
+    def inverse(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Computes the distance between two points and the azimuths of the geodesic between them.
+        Uses the algorithm by Thaddeus Vincenty for inverse geodetic problem.
+        For more information refer to: http://www.ngs.noaa.gov/PUBS_LIB/inverse.pdf
+        :param lon_initial: float, longitude of the initial point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param lon_end: float, longitude of the end point in decimal degrees format
+        :param lat_end: float, latitude of the end point in decimal degrees format
+        :return distance, azimuth_initial, azimuth_reverse: float, float, float
+                distance between points in meters, azimuth from the initial point to the end point and azimuth
+                from the end point to the initial point in decimal degrees format <0, 360).
+                Azimuths of coincident points are 0.
+                If the solution does not converge within max_iterations (nearly antipodal points) returns None.
+        """
+        b, f = self.b, self.f
+
+        # Difference in longitude, normalized to <-pi, pi)
+        L = (math.radians(lon_end - lon_initial) + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        # U1, U2 - reduced latitudes
+        tan_u1 = self.one_minus_f * math.tan(math.radians(lat_initial))
+        cos_u1 = 1 / math.sqrt(1 + tan_u1 * tan_u1)
+        sin_u1 = tan_u1 * cos_u1
+        tan_u2 = self.one_minus_f * math.tan(math.radians(lat_end))
+        cos_u2 = 1 / math.sqrt(1 + tan_u2 * tan_u2)
+        sin_u2 = tan_u2 * cos_u2
+
+        lamb = L
+        lambp = None
+        iterations = 0
+        sin_lamb, cos_lamb, sin_sigma, cos_sigma, sigma, cos_sq_alfa, cos2sigma_m = (None, ) * 7
+
+        while lambp is None or math.fabs(lamb - lambp) > 1e-12:
+            if iterations == self.max_iterations:
+                if self.telemetry is not None:
+                    self.telemetry.record(PROBLEM_INVERSE, iterations, False,
+                                          (lon_initial, lat_initial, lon_end, lat_end))
+                return None
+            iterations += 1
+            sin_lamb = math.sin(lamb)
+            cos_lamb = math.cos(lamb)
+            sin_sigma = math.sqrt((cos_u2 * sin_lamb) ** 2 + (cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lamb) ** 2)
+            if sin_sigma == 0:
+                lamb = lambp = 0  # Coincident points
+                break
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lamb
+            sigma = math.atan2(sin_sigma, cos_sigma)
+            sin_alfa = cos_u1 * cos_u2 * sin_lamb / sin_sigma
+            cos_sq_alfa = 1 - sin_alfa * sin_alfa
+            # Equatorial line: cos_sq_alfa = 0
+            cos2sigma_m = cos_sigma - 2 * sin_u1 * sin_u2 / cos_sq_alfa if cos_sq_alfa != 0 else 0.0
+            C = f / 16 * cos_sq_alfa * (4 + f * (4 - 3 * cos_sq_alfa))
+            lambp = lamb
+            lamb = L + (1 - C) * f * sin_alfa * (
+                    sigma + C * sin_sigma * (cos2sigma_m + C * cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m)))
+
+        if self.telemetry is not None:
+            self.telemetry.record(PROBLEM_INVERSE, iterations, True, (lon_initial, lat_initial, lon_end, lat_end))
+
+        if sin_sigma == 0:
+            return 0.0, 0.0, 0.0  # Coincident points
+
+        u_sq = cos_sq_alfa * self.a_sq_minus_b_sq / self.b_sq
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        d_sigma = B * sin_sigma * (cos2sigma_m + B / 4 * (
+                cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m) - B / 6 * cos2sigma_m * (
+                    -3 + 4 * sin_sigma * sin_sigma) * (-3 + 4 * cos2sigma_m * cos2sigma_m)))
+
+        distance = b * A * (sigma - d_sigma)
+
+        # Forward azimuths at the initial and at the end point
+        alfa1 = math.atan2(cos_u2 * sin_lamb, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lamb)
+        alfa2 = math.atan2(cos_u1 * sin_lamb, -sin_u1 * cos_u2 + cos_u1 * sin_u2 * cos_lamb)
+
+        azimuth_initial = math.degrees(alfa1) % 360
+        azimuth_reverse = (math.degrees(alfa2) + 180) % 360
+
+        return distance, azimuth_initial, azimuth_reverse
+
+    def inverse_batch(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Vectorized version of inverse method.
+        Arguments are broadcast against each other, so any of them can be a scalar.
+        The lambda iteration runs element-wise until each element converges.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :return distance, azimuth_initial, azimuth_reverse: ndarray, ndarray, ndarray
+                distances in meters, azimuths from the initial points to the end points and azimuths
+                from the end points to the initial points in decimal degrees format <0, 360).
+                Elements for which the solution does not converge within max_iterations (nearly antipodal points)
+                are NaN.
+        """
+        return self._inverse_batch(lon_initial, lat_initial, lon_end, lat_end)[:3]
+
+    def _inverse_batch(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Computes inverse_batch solutions and, as the fourth array, converged longitude differences
+        on the auxiliary sphere in radians, see area.GeodesicArea.inverse_area_batch.
+        """
+        b, f = self.b, self.f
+
+        lon_initial, lat_initial, lon_end, lat_end = np.broadcast_arrays(
+            np.asarray(lon_initial, dtype=np.float64),
+            np.asarray(lat_initial, dtype=np.float64),
+            np.asarray(lon_end, dtype=np.float64),
+            np.asarray(lat_end, dtype=np.float64))
+        shape = lon_initial.shape
+
+        lon_initial, lat_initial, lon_end, lat_end = lon_initial.ravel(), lat_initial.ravel(), lon_end.ravel(), \
+            lat_end.ravel()
+
+        # Difference in longitude, normalized to <-pi, pi)
+        L = (np.radians(lon_end - lon_initial) + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        # U1, U2 - reduced latitudes
+        tan_u1 = self.one_minus_f * np.tan(np.radians(lat_initial))
+        cos_u1 = 1 / np.sqrt(1 + tan_u1 * tan_u1)
+        sin_u1 = tan_u1 * cos_u1
+        tan_u2 = self.one_minus_f * np.tan(np.radians(lat_end))
+        cos_u2 = 1 / np.sqrt(1 + tan_u2 * tan_u2)
+        sin_u2 = tan_u2 * cos_u2
+
+        lamb = L.copy()
+        sin_lamb = np.empty_like(L)
+        cos_lamb = np.empty_like(L)
+        sin_sigma = np.empty_like(L)
+        cos_sigma = np.empty_like(L)
+        sigma = np.empty_like(L)
+        cos_sq_alfa = np.empty_like(L)
+        cos2sigma_m = np.empty_like(L)
+        converged = np.ones(L.shape, dtype=bool)
+        iterations = np.zeros(L.size, dtype=np.int64)
+
+        # Indices of the elements that have not converged yet
+        idx = np.arange(L.size)
+        for _ in range(self.max_iterations):
+            iterations[idx] += 1
+            lamb_i = lamb[idx]
+            cu1, su1, cu2, su2 = cos_u1[idx], sin_u1[idx], cos_u2[idx], sin_u2[idx]
+            sin_lamb_i = np.sin(lamb_i)
+            cos_lamb_i = np.cos(lamb_i)
+            sin_sigma_i = np.sqrt((cu2 * sin_lamb_i) ** 2 + (cu1 * su2 - su1 * cu2 * cos_lamb_i) ** 2)
+            cos_sigma_i = su1 * su2 + cu1 * cu2 * cos_lamb_i
+            sigma_i = np.arctan2(sin_sigma_i, cos_sigma_i)
+            # Coincident points: sin_sigma = 0
+            coincident = sin_sigma_i == 0
+            sin_alfa = np.divide(cu1 * cu2 * sin_lamb_i, sin_sigma_i,
+                                 out=np.zeros_like(sin_sigma_i), where=~coincident)
+            cos_sq_alfa_i = 1 - sin_alfa * sin_alfa
+            # Equatorial line: cos_sq_alfa = 0
+            equatorial = cos_sq_alfa_i == 0
+            cos2sigma_m_i = cos_sigma_i - np.divide(2 * su1 * su2, cos_sq_alfa_i,
+                                                    out=np.zeros_like(cos_sq_alfa_i), where=~equatorial)
+            cos2sigma_m_i[equatorial] = 0.0
+            C = f / 16 * cos_sq_alfa_i * (4 + f * (4 - 3 * cos_sq_alfa_i))
+            lamb_new = L[idx] + (1 - C) * f * sin_alfa * (
+                    sigma_i + C * sin_sigma_i * (cos2sigma_m_i + C * cos_sigma_i * (
+                        -1 + 2 * cos2sigma_m_i * cos2sigma_m_i)))
+
+            sin_lamb[idx] = sin_lamb_i
+            cos_lamb[idx] = cos_lamb_i
+            sin_sigma[idx] = sin_sigma_i
+            cos_sigma[idx] = cos_sigma_i
+            sigma[idx] = sigma_i
+            cos_sq_alfa[idx] = cos_sq_alfa_i
+            cos2sigma_m[idx] = cos2sigma_m_i
+            lamb[idx] = lamb_new
+            idx = idx[(np.fabs(lamb_new - lamb_i) > 1e-12) & ~coincident]
+            if not idx.size:
+                break
+        else:
+            converged[idx] = False
+
+        if self.telemetry is not None:
+            self.telemetry.record_batch(PROBLEM_INVERSE, iterations, converged,
+                                        (lon_initial, lat_initial, lon_end, lat_end))
+
+        u_sq = cos_sq_alfa * self.a_sq_minus_b_sq / self.b_sq
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        d_sigma = B * sin_sigma * (cos2sigma_m + B / 4 * (
+                cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m) - B / 6 * cos2sigma_m * (
+                    -3 + 4 * sin_sigma * sin_sigma) * (-3 + 4 * cos2sigma_m * cos2sigma_m)))
+
+        distance = b * A * (sigma - d_sigma)
+
+        # Forward azimuths at the initial and at the end point
+        alfa1 = np.arctan2(cos_u2 * sin_lamb, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lamb)
+        alfa2 = np.arctan2(cos_u1 * sin_lamb, -sin_u1 * cos_u2 + cos_u1 * sin_u2 * cos_lamb)
+
+        azimuth_initial = np.degrees(alfa1) % 360
+        azimuth_reverse = (np.degrees(alfa2) + 180) % 360
+
+        coincident = sin_sigma == 0
+        distance[coincident] = 0.0
+        azimuth_initial[coincident] = 0.0
+        azimuth_reverse[coincident] = 0.0
+
+        distance[~converged] = np.nan
+        azimuth_initial[~converged] = np.nan
+        azimuth_reverse[~converged] = np.nan
+        lamb[~converged] = np.nan
+
+        return distance.reshape(shape), azimuth_initial.reshape(shape), azimuth_reverse.reshape(shape), \
+            lamb.reshape(shape)
+
+    def inverse_matrix(self, lon_initial, lat_initial, lon_end, lat_end, chunk_bytes=MATRIX_CHUNK_BYTES):
+        """ Computes N x M pairwise matrices of distances and azimuths between N initial points and M end points.
+        Rows are processed in chunks so that the temporary arrays of inverse_batch stay within chunk_bytes,
+        only the result matrices are allocated in full.
+        :param lon_initial: array_like, N longitudes of the initial points in decimal degrees format
+        :param lat_initial: array_like, N latitudes of the initial points in decimal degrees format
+        :param lon_end: array_like, M longitudes of the end points in decimal degrees format
+        :param lat_end: array_like, M latitudes of the end points in decimal degrees format
+        :param chunk_bytes: int, memory budget of temporary arrays; bytes
+        :return distance, azimuth_initial, azimuth_reverse: ndarray, ndarray, ndarray
+                N x M matrices, element [i, j] refers to the geodesic from initial point i to end point j,
+                see inverse_batch
+        """
+        lon_initial = np.asarray(lon_initial, dtype=np.float64).ravel()
+        lat_initial = np.asarray(lat_initial, dtype=np.float64).ravel()
+        lon_end = np.asarray(lon_end, dtype=np.float64).ravel()
+        lat_end = np.asarray(lat_end, dtype=np.float64).ravel()
+        n, m = lon_initial.size, lon_end.size
+
+        distance = np.empty((n, m))
+        azimuth_initial = np.empty((n, m))
+        azimuth_reverse = np.empty((n, m))
+
+        # Approximate number of float64 temporaries per pair allocated by inverse_batch
+        pair_bytes = 40 * 8
+        rows = max(1, int(chunk_bytes // max(1, m * pair_bytes)))
+        for start in range(0, n, rows):
+            stop = min(start + rows, n)
+            distance[start:stop], azimuth_initial[start:stop], azimuth_reverse[start:stop] = \
+                self.inverse_batch(lon_initial[start:stop, np.newaxis], lat_initial[start:stop, np.newaxis],
+                                   lon_end[np.newaxis, :], lat_end[np.newaxis, :])
+
+        return distance, azimuth_initial, azimuth_reverse
+
+    def _c3(self, eps):
+        """ Returns coefficients C3[1..5] of the series of the longitude difference. """
+        coeffs = []
+        mult = 1
+        for c3_coeffs in self._c3_coeffs:
+            mult = mult * eps
+            coeffs.append(mult * _polyval(c3_coeffs, eps))
+        return coeffs
+
+    def direct_series(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Computes the latitude and longitude of the second point based on latitude, longitude,
+        of the first point and distance and azimuth from first point to second point.
+        Unlike direct method the solution is not iterative: it evaluates 6th order series expansions in the
+        third flattening by Charles F. F. Karney, so it does the same amount of work for every point.
+        Results agree with direct method to a fraction of millimeter.
+        For more information refer to: https://doi.org/10.1007/s00190-012-0578-z
+        :param lon_initial: float, longitude of the initial  point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+        :param distance: float, distance from first point to second point; meters
+        :return lon_end, lat_end: float, float longitude and longitude of the end point in decimal degrees format
+        """
+        return self.direct_series_with_azimuth(lon_initial, lat_initial, azimuth_initial, distance)[:2]
+
+    def direct_series_with_azimuth(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Direct_series method which also returns the azimuth from the end point to the initial point,
+        see direct_with_azimuth.
+        :param lon_initial: float, longitude of the initial  point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+        :param distance: float, distance from first point to second point; meters
+        :return lon_end, lat_end, azimuth_reverse: float, float, float longitude and longitude of the end point and
+                azimuth from the end point to the initial point in decimal degrees format, azimuth is in <0, 360)
+        """
+        f = self.f
+
+        lat1 = math.radians(lat_initial)
+        alfa1 = math.radians(azimuth_initial)
+        sin_alfa1 = math.sin(alfa1)
+        cos_alfa1 = math.cos(alfa1)
+
+        # beta1 - reduced latitude
+        sin_beta1 = self.one_minus_f * math.sin(lat1)
+        cos_beta1 = math.cos(lat1)
+        r = math.hypot(sin_beta1, cos_beta1)
+        sin_beta1 /= r
+        cos_beta1 = max(_TINY, cos_beta1 / r)
+
+        # alfa0 - azimuth of the geodesic at the equator
+        sin_alfa0 = sin_alfa1 * cos_beta1
+        cos_alfa0 = math.hypot(cos_alfa1, sin_alfa1 * sin_beta1)
+
+        # sigma1 - arc length on the auxiliary sphere from the equator to initial point,
+        # omega1 - longitude on the auxiliary sphere
+        sin_sigma1 = sin_beta1
+        sin_omega1 = sin_alfa0 * sin_beta1
+        cos_sigma1 = cos_omega1 = cos_beta1 * cos_alfa1 if sin_beta1 != 0 or cos_alfa1 != 0 else 1.0
+        r = math.hypot(sin_sigma1, cos_sigma1)
+        sin_sigma1 /= r
+        cos_sigma1 /= r
+
+        k2 = cos_alfa0 * cos_alfa0 * self._ep2
+        eps = k2 / (2 * (1 + math.sqrt(1 + k2)) + k2)
+        a1m1 = _a1m1(eps)
+        c1 = _c1(eps)
+        b11 = _sin_series(sin_sigma1, cos_sigma1, c1)
+        sin_b11, cos_b11 = math.sin(b11), math.cos(b11)
+        sin_tau1 = sin_sigma1 * cos_b11 + cos_sigma1 * sin_b11
+        cos_tau1 = cos_sigma1 * cos_b11 - sin_sigma1 * sin_b11
+
+        # tau12 - distance scaled to the auxiliary sphere, reverted to the arc length sigma12
+        tau12 = distance / (self.b * (1 + a1m1))
+        sin_tau12, cos_tau12 = math.sin(tau12), math.cos(tau12)
+        b12 = -_sin_series(sin_tau1 * cos_tau12 + cos_tau1 * sin_tau12,
+                           cos_tau1 * cos_tau12 - sin_tau1 * sin_tau12, _c1p(eps))
+        sigma12 = tau12 - (b12 - b11)
+        sin_sigma12, cos_sigma12 = math.sin(sigma12), math.cos(sigma12)
+
+        if math.fabs(f) > 0.01:
+            # Reverted series is not accurate enough for strongly flattened ellipsoids, one Newton step fixes it
+            sin_sigma2 = sin_sigma1 * cos_sigma12 + cos_sigma1 * sin_sigma12
+            cos_sigma2 = cos_sigma1 * cos_sigma12 - sin_sigma1 * sin_sigma12
+            b12 = _sin_series(sin_sigma2, cos_sigma2, c1)
+            serr = (1 + a1m1) * (sigma12 + (b12 - b11)) - distance / self.b
+            sigma12 = sigma12 - serr / math.sqrt(1 + k2 * sin_sigma2 * sin_sigma2)
+            sin_sigma12, cos_sigma12 = math.sin(sigma12), math.cos(sigma12)
+
+        sin_sigma2 = sin_sigma1 * cos_sigma12 + cos_sigma1 * sin_sigma12
+        cos_sigma2 = cos_sigma1 * cos_sigma12 - sin_sigma1 * sin_sigma12
+
+        # beta2 - reduced latitude of the end point
+        sin_beta2 = cos_alfa0 * sin_sigma2
+        cos_beta2 = math.hypot(sin_alfa0, cos_alfa0 * cos_sigma2)
+        if cos_beta2 == 0:
+            cos_beta2 = cos_sigma2 = _TINY
+
+        sin_omega2 = sin_alfa0 * sin_sigma2
+        cos_omega2 = cos_sigma2
+        omega12 = math.atan2(sin_omega2 * cos_omega1 - cos_omega2 * sin_omega1,
+                             cos_omega2 * cos_omega1 + sin_omega2 * sin_omega1)
+
+        c3 = self._c3(eps)
+        a3c = -f * sin_alfa0 * _polyval(self._a3_coeffs, eps)
+        b31 = _sin_series(sin_sigma1, cos_sigma1, c3)
+        lamb12 = omega12 + a3c * (sigma12 + (_sin_series(sin_sigma2, cos_sigma2, c3) - b31))
+
+        # Longitude and latitude of the end point in radians
+        lon2 = (math.radians(lon_initial) + lamb12 + 3 * math.pi) % (2 * math.pi) - math.pi
+        lat2 = math.atan2(sin_beta2, self.one_minus_f * cos_beta2)
+
+        # Azimuth of the geodesic at the end point
+        alfa2 = math.atan2(sin_alfa0, cos_alfa0 * cos_sigma2)
+
+        return math.degrees(lon2), math.degrees(lat2), (math.degrees(alfa2) + 180) % 360
+
+    def direct_series_batch(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Vectorized version of direct_series method.
+        Arguments are broadcast against each other, so any of them can be a scalar.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                                  format, shape is the broadcast shape of the arguments
+        """
+        return self.direct_series_with_azimuth_batch(lon_initial, lat_initial, azimuth_initial, distance)[:2]
+
+    def direct_series_with_azimuth_batch(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Vectorized version of direct_series_with_azimuth method.
+        Arguments are broadcast against each other, so any of them can be a scalar.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :return lon_end, lat_end, azimuth_reverse: ndarray, ndarray, ndarray longitudes and latitudes of the end
+                points and azimuths from the end points to the initial points in decimal degrees format,
+                shape is the broadcast shape of the arguments
+        """
+        f = self.f
+
+        # Distances are broadcast against all arguments and carry the broadcast shape to the end points, terms
+        # of the initial points are computed in their own shape, e.g. once for many distances along one geodesic
+        lon_initial = np.asarray(lon_initial, dtype=np.float64)
+        distance = np.asarray(distance, dtype=np.float64) + np.zeros(np.broadcast(lon_initial, lat_initial,
+                                                                                  azimuth_initial).shape)
+
+        lat1 = np.radians(lat_initial)
+        alfa1 = np.radians(azimuth_initial)
+        sin_alfa1 = np.sin(alfa1)
+        cos_alfa1 = np.cos(alfa1)
+
+        # beta1 - reduced latitude
+        sin_beta1 = self.one_minus_f * np.sin(lat1)
+        cos_beta1 = np.cos(lat1)
+        r = np.hypot(sin_beta1, cos_beta1)
+        sin_beta1 = sin_beta1 / r
+        cos_beta1 = np.maximum(_TINY, cos_beta1 / r)
+
+        # alfa0 - azimuth of the geodesic at the equator
+        sin_alfa0 = sin_alfa1 * cos_beta1
+        cos_alfa0 = np.hypot(cos_alfa1, sin_alfa1 * sin_beta1)
+
+        # sigma1 - arc length on the auxiliary sphere from the equator to initial point,
+        # omega1 - longitude on the auxiliary sphere
+        sin_sigma1 = sin_beta1
+        sin_omega1 = sin_alfa0 * sin_beta1
+        cos_sigma1 = cos_omega1 = np.where((sin_beta1 != 0) | (cos_alfa1 != 0), cos_beta1 * cos_alfa1, 1.0)
+        r = np.hypot(sin_sigma1, cos_sigma1)
+        sin_sigma1 = sin_sigma1 / r
+        cos_sigma1 = cos_sigma1 / r
+
+        k2 = cos_alfa0 * cos_alfa0 * self._ep2
+        eps = k2 / (2 * (1 + np.sqrt(1 + k2)) + k2)
+        a1m1 = _a1m1(eps)
+        c1 = _c1(eps)
+        b11 = _sin_series(sin_sigma1, cos_sigma1, c1)
+        sin_b11, cos_b11 = np.sin(b11), np.cos(b11)
+        sin_tau1 = sin_sigma1 * cos_b11 + cos_sigma1 * sin_b11
+        cos_tau1 = cos_sigma1 * cos_b11 - sin_sigma1 * sin_b11
+
+        # tau12 - distance scaled to the auxiliary sphere, reverted to the arc length sigma12
+        tau12 = distance / (self.b * (1 + a1m1))
+        sin_tau12, cos_tau12 = np.sin(tau12), np.cos(tau12)
+        b12 = -_sin_series(sin_tau1 * cos_tau12 + cos_tau1 * sin_tau12,
+                           cos_tau1 * cos_tau12 - sin_tau1 * sin_tau12, _c1p(eps))
+        sigma12 = tau12 - (b12 - b11)
+        sin_sigma12, cos_sigma12 = np.sin(sigma12), np.cos(sigma12)
+
+        if math.fabs(f) > 0.01:
+            # Reverted series is not accurate enough for strongly flattened ellipsoids, one Newton step fixes it
+            sin_sigma2 = sin_sigma1 * cos_sigma12 + cos_sigma1 * sin_sigma12
+            cos_sigma2 = cos_sigma1 * cos_sigma12 - sin_sigma1 * sin_sigma12
+            b12 = _sin_series(sin_sigma2, cos_sigma2, c1)
+            serr = (1 + a1m1) * (sigma12 + (b12 - b11)) - distance / self.b
+            sigma12 = sigma12 - serr / np.sqrt(1 + k2 * sin_sigma2 * sin_sigma2)
+            sin_sigma12, cos_sigma12 = np.sin(sigma12), np.cos(sigma12)
+
+        sin_sigma2 = sin_sigma1 * cos_sigma12 + cos_sigma1 * sin_sigma12
+        cos_sigma2 = cos_sigma1 * cos_sigma12 - sin_sigma1 * sin_sigma12
+
+        # beta2 - reduced latitude of the end point
+        sin_beta2 = cos_alfa0 * sin_sigma2
+        cos_beta2 = np.hypot(sin_alfa0, cos_alfa0 * cos_sigma2)
+        pole = cos_beta2 == 0
+        cos_beta2 = np.where(pole, _TINY, cos_beta2)
+        cos_sigma2 = np.where(pole, _TINY, cos_sigma2)
+
+        sin_omega2 = sin_alfa0 * sin_sigma2
+        cos_omega2 = cos_sigma2
+        omega12 = np.arctan2(sin_omega2 * cos_omega1 - cos_omega2 * sin_omega1,
+                             cos_omega2 * cos_omega1 + sin_omega2 * sin_omega1)
+
+        c3 = self._c3(eps)
+        a3c = -f * sin_alfa0 * _polyval(self._a3_coeffs, eps)
+        b31 = _sin_series(sin_sigma1, cos_sigma1, c3)
+        lamb12 = omega12 + a3c * (sigma12 + (_sin_series(sin_sigma2, cos_sigma2, c3) - b31))
+
+        # Longitude and latitude of the end point in radians
+        lon2 = (np.radians(lon_initial) + lamb12 + 3 * math.pi) % (2 * math.pi) - math.pi
+        lat2 = np.arctan2(sin_beta2, self.one_minus_f * cos_beta2)
+
+        # Azimuth of the geodesic at the end point
+        alfa2 = np.arctan2(sin_alfa0, cos_alfa0 * cos_sigma2)
+
+        return np.degrees(lon2), np.degrees(lat2), (np.degrees(alfa2) + 180) % 360
+
+    def direct_spherical(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Computes the end point of the great circle arc on the sphere of the mean radius,
+        see METHOD_ERROR_BOUNDS for the error against ellipsoidal solution.
+        :param lon_initial: float, longitude of the initial  point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+        :param distance: float, distance from first point to second point; meters
+        :return lon_end, lat_end: float, float longitude and longitude of the end point in decimal degrees format
+        """
+        lat1 = math.radians(lat_initial)
+        alfa1 = math.radians(azimuth_initial)
+        delta = distance / self.mean_radius  # Angular distance
+
+        sin_lat1, cos_lat1 = math.sin(lat1), math.cos(lat1)
+        sin_delta, cos_delta = math.sin(delta), math.cos(delta)
+        sin_lat2 = sin_lat1 * cos_delta + cos_lat1 * sin_delta * math.cos(alfa1)
+        lat2 = math.asin(max(-1.0, min(1.0, sin_lat2)))
+        lon2 = math.radians(lon_initial) + math.atan2(math.sin(alfa1) * sin_delta * cos_lat1,
+                                                      cos_delta - sin_lat1 * sin_lat2)
+        lon2 = (lon2 + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        return math.degrees(lon2), math.degrees(lat2)
+
+    def direct_spherical_batch(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Vectorized version of direct_spherical method, arguments are broadcast against each other.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                                  format
+        """
+        lat1 = np.radians(lat_initial)
+        alfa1 = np.radians(azimuth_initial)
+        delta = np.asarray(distance, dtype=np.float64) / self.mean_radius  # Angular distance
+
+        sin_lat1, cos_lat1 = np.sin(lat1), np.cos(lat1)
+        sin_delta, cos_delta = np.sin(delta), np.cos(delta)
+        sin_lat2 = np.clip(sin_lat1 * cos_delta + cos_lat1 * sin_delta * np.cos(alfa1), -1.0, 1.0)
+        lat2 = np.arcsin(sin_lat2)
+        lon2 = np.radians(lon_initial) + np.arctan2(np.sin(alfa1) * sin_delta * cos_lat1,
+                                                    cos_delta - sin_lat1 * sin_lat2)
+        lon2 = (lon2 + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        return np.degrees(lon2), np.degrees(lat2)
+
+    def direct_andoyer_lambert(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Computes the end point of the geodesic with terms of the first order in flattening only - the direct
+        counterpart of Andoyer-Lambert distance. It is the series solution (see direct_series) truncated to the
+        first order terms, non-iterative and cheaper, see METHOD_ERROR_BOUNDS for its error.
+        :param lon_initial: float, longitude of the initial  point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+        :param distance: float, distance from first point to second point; meters
+        :return lon_end, lat_end: float, float longitude and longitude of the end point in decimal degrees format
+        """
+        f, n = self.f, self._n
+
+        lat1 = math.radians(lat_initial)
+        alfa1 = math.radians(azimuth_initial)
+        sin_alfa1 = math.sin(alfa1)
+        cos_alfa1 = math.cos(alfa1)
+
+        # beta1 - reduced latitude
+        sin_beta1 = self.one_minus_f * math.sin(lat1)
+        cos_beta1 = math.cos(lat1)
+        r = math.hypot(sin_beta1, cos_beta1)
+        sin_beta1 /= r
+        cos_beta1 = max(_TINY, cos_beta1 / r)
+
+        # alfa0 - azimuth of the geodesic at the equator
+        sin_alfa0 = sin_alfa1 * cos_beta1
+        cos_alfa0 = math.hypot(cos_alfa1, sin_alfa1 * sin_beta1)
+
+        # sigma1 - arc length on the auxiliary sphere from the equator to initial point,
+        # omega1 - longitude on the auxiliary sphere
+        sin_omega1 = sin_alfa0 * sin_beta1
+        cos_omega1 = cos_beta1 * cos_alfa1
+        sigma1 = math.atan2(sin_beta1, cos_omega1)
+
+        k2 = cos_alfa0 * cos_alfa0 * self._ep2
+        eps = k2 / (2 * (1 + math.sqrt(1 + k2)) + k2)
+
+        # tau - distance scaled to the auxiliary sphere, sigma = tau + eps / 2 * sin(2 * tau) + O(eps^2)
+        sin_2sigma1 = math.sin(2 * sigma1)
+        tau1 = sigma1 - eps / 2 * sin_2sigma1
+        tau12 = distance / (self.b * (1 + _a1m1(eps)))
+        sigma12 = tau12 + eps / 2 * (math.sin(2 * (tau1 + tau12)) - math.sin(2 * tau1))
+        sigma2 = sigma1 + sigma12
+        sin_sigma2, cos_sigma2 = math.sin(sigma2), math.cos(sigma2)
+
+        # beta2 - reduced latitude of the end point
+        sin_beta2 = cos_alfa0 * sin_sigma2
+        cos_beta2 = math.hypot(sin_alfa0, cos_alfa0 * cos_sigma2)
+
+        sin_omega2 = sin_alfa0 * sin_sigma2
+        cos_omega2 = cos_sigma2
+        omega12 = math.atan2(sin_omega2 * cos_omega1 - cos_omega2 * sin_omega1,
+                             cos_omega2 * cos_omega1 + sin_omega2 * sin_omega1)
+        lamb12 = omega12 - f * sin_alfa0 * ((1 - (1 - n) / 2 * eps) * sigma12 +
+                                            (1 - n) / 4 * eps * (2 * sin_sigma2 * cos_sigma2 - sin_2sigma1))
+
+        # Longitude and latitude of the end point in radians
+        lon2 = (math.radians(lon_initial) + lamb12 + 3 * math.pi) % (2 * math.pi) - math.pi
+        lat2 = math.atan2(sin_beta2, self.one_minus_f * cos_beta2)
+
+        return math.degrees(lon2), math.degrees(lat2)
+
+    def direct_andoyer_lambert_batch(self, lon_initial, lat_initial, azimuth_initial, distance):
+        """ Vectorized version of direct_andoyer_lambert method, arguments are broadcast against each other.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                                  format
+        """
+        f, n = self.f, self._n
+
+        lat1 = np.radians(lat_initial)
+        alfa1 = np.radians(azimuth_initial)
+        sin_alfa1 = np.sin(alfa1)
+        cos_alfa1 = np.cos(alfa1)
+
+        # beta1 - reduced latitude
+        sin_beta1 = self.one_minus_f * np.sin(lat1)
+        cos_beta1 = np.cos(lat1)
+        r = np.hypot(sin_beta1, cos_beta1)
+        sin_beta1 = sin_beta1 / r
+        cos_beta1 = np.maximum(_TINY, cos_beta1 / r)
+
+        # alfa0 - azimuth of the geodesic at the equator
+        sin_alfa0 = sin_alfa1 * cos_beta1
+        cos_alfa0 = np.hypot(cos_alfa1, sin_alfa1 * sin_beta1)
+
+        # sigma1 - arc length on the auxiliary sphere from the equator to initial point,
+        # omega1 - longitude on the auxiliary sphere
+        sin_omega1 = sin_alfa0 * sin_beta1
+        cos_omega1 = cos_beta1 * cos_alfa1
+        sigma1 = np.arctan2(sin_beta1, cos_omega1)
+
+        k2 = cos_alfa0 * cos_alfa0 * self._ep2
+        eps = k2 / (2 * (1 + np.sqrt(1 + k2)) + k2)
+
+        # tau - distance scaled to the auxiliary sphere, sigma = tau + eps / 2 * sin(2 * tau) + O(eps^2)
+        sin_2sigma1 = np.sin(2 * sigma1)
+        tau1 = sigma1 - eps / 2 * sin_2sigma1
+        tau12 = np.asarray(distance, dtype=np.float64) / (self.b * (1 + _a1m1(eps)))
+        sigma12 = tau12 + eps / 2 * (np.sin(2 * (tau1 + tau12)) - np.sin(2 * tau1))
+        sigma2 = sigma1 + sigma12
+        sin_sigma2, cos_sigma2 = np.sin(sigma2), np.cos(sigma2)
+
+        # beta2 - reduced latitude of the end point
+        sin_beta2 = cos_alfa0 * sin_sigma2
+        cos_beta2 = np.hypot(sin_alfa0, cos_alfa0 * cos_sigma2)
+
+        sin_omega2 = sin_alfa0 * sin_sigma2
+        cos_omega2 = cos_sigma2
+        omega12 = np.arctan2(sin_omega2 * cos_omega1 - cos_omega2 * sin_omega1,
+                             cos_omega2 * cos_omega1 + sin_omega2 * sin_omega1)
+        lamb12 = omega12 - f * sin_alfa0 * ((1 - (1 - n) / 2 * eps) * sigma12 +
+                                            (1 - n) / 4 * eps * (2 * sin_sigma2 * cos_sigma2 - sin_2sigma1))
+
+        # Longitude and latitude of the end point in radians
+        lon2 = (np.radians(lon_initial) + lamb12 + 3 * math.pi) % (2 * math.pi) - math.pi
+        lat2 = np.arctan2(sin_beta2, self.one_minus_f * cos_beta2)
+
+        return np.degrees(lon2), np.degrees(lat2)
+
+    def distance_spherical(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Computes great circle distance on the sphere of the mean radius using haversine formula,
+        see METHOD_ERROR_BOUNDS for the error against ellipsoidal distance.
+        :param lon_initial: float, longitude of the initial point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param lon_end: float, longitude of the end point in decimal degrees format
+        :param lat_end: float, latitude of the end point in decimal degrees format
+        :return: float, distance; meters
+        """
+        lat1 = math.radians(lat_initial)
+        lat2 = math.radians(lat_end)
+        hav = math.sin((lat2 - lat1) / 2) ** 2 + \
+            math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(lon_end - lon_initial) / 2) ** 2
+        return 2 * self.mean_radius * math.asin(math.sqrt(min(1.0, hav)))
+
+    def distance_spherical_batch(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Vectorized version of distance_spherical method, arguments are broadcast against each other.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :return: ndarray, distances; meters
+        """
+        lat1 = np.radians(lat_initial)
+        lat2 = np.radians(lat_end)
+        hav = np.sin((lat2 - lat1) / 2) ** 2 + \
+            np.cos(lat1) * np.cos(lat2) * np.sin(np.radians(np.subtract(lon_end, lon_initial)) / 2) ** 2
+        return 2 * self.mean_radius * np.arcsin(np.sqrt(np.minimum(1.0, hav)))
+
+    def distance_andoyer_lambert(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Computes distance using Andoyer-Lambert formula: spherical distance between reduced latitudes
+        corrected by the first order term in flattening, see METHOD_ERROR_BOUNDS for its error.
+        :param lon_initial: float, longitude of the initial point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param lon_end: float, longitude of the end point in decimal degrees format
+        :param lat_end: float, latitude of the end point in decimal degrees format
+        :return: float, distance; meters
+        """
+        # Reduced latitudes
+        beta1 = math.atan(self.one_minus_f * math.tan(math.radians(lat_initial)))
+        beta2 = math.atan(self.one_minus_f * math.tan(math.radians(lat_end)))
+        hav = math.sin((beta2 - beta1) / 2) ** 2 + \
+            math.cos(beta1) * math.cos(beta2) * math.sin(math.radians(lon_end - lon_initial) / 2) ** 2
+        sigma = 2 * math.asin(math.sqrt(min(1.0, hav)))
+        if sigma == 0:
+            return 0.0
+
+        p = (beta1 + beta2) / 2
+        q = (beta2 - beta1) / 2
+        x = (sigma - math.sin(sigma)) * (math.sin(p) * math.cos(q) / math.cos(sigma / 2)) ** 2
+        y = (sigma + math.sin(sigma)) * (math.cos(p) * math.sin(q) / math.sin(sigma / 2)) ** 2
+        return self.a * (sigma - self.f / 2 * (x + y))
+
+    def distance_andoyer_lambert_batch(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Vectorized version of distance_andoyer_lambert method, arguments are broadcast against each other.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :return: ndarray, distances; meters
+        """
+        # Reduced latitudes
+        beta1 = np.arctan(self.one_minus_f * np.tan(np.radians(lat_initial)))
+        beta2 = np.arctan(self.one_minus_f * np.tan(np.radians(lat_end)))
+        hav = np.sin((beta2 - beta1) / 2) ** 2 + \
+            np.cos(beta1) * np.cos(beta2) * np.sin(np.radians(np.subtract(lon_end, lon_initial)) / 2) ** 2
+        sigma = 2 * np.arcsin(np.sqrt(np.minimum(1.0, hav)))
+
+        p = (beta1 + beta2) / 2
+        q = (beta2 - beta1) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = (sigma - np.sin(sigma)) * (np.sin(p) * np.cos(q) / np.cos(sigma / 2)) ** 2
+            y = (sigma + np.sin(sigma)) * (np.cos(p) * np.sin(q) / np.sin(sigma / 2)) ** 2
+        return np.where(sigma == 0, 0.0, self.a * (sigma - self.f / 2 * (x + y)))
+
+    def line(self, lon_initial, lat_initial, azimuth_initial):
+        """ Creates geodesic line starting at the initial point with the initial azimuth.
+        :param lon_initial: float, longitude of the initial point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth_initial: float, azimuth of the geodesic at the initial point in decimal degrees format
+        :return: GeodesicLine
+        """
+        return GeodesicLine(self, lon_initial, lat_initial, azimuth_initial)
+
+
+class GeodesicLine:
+    """ Class keeps the terms of the Vincenty direct solution that depend only on the initial point and
+    the initial azimuth, so that many points along one geodesic can be computed without deriving them again.
+    Scalar position method warm-starts the sigma iteration from the sigma of the previously computed point,
+    which reduces number of iterations when points are computed in sequence, e.g. during densification.
+    Attributes:
+    -----------
+    geodesic : Geodesic
+        Geodesic of the ellipsoid the line is on.
+    lon_initial, lat_initial, azimuth_initial : float
+        Initial point and azimuth at the initial point in decimal degrees format.
+    """
+
+    def __init__(self, geodesic, lon_initial, lat_initial, azimuth_initial):
+        self.geodesic = geodesic
+        self.lon_initial = lon_initial
+        self.lat_initial = lat_initial
+        self.azimuth_initial = azimuth_initial
+
+        f = geodesic.f
+        self._lon1 = math.radians(lon_initial)
+        alfa1 = math.radians(azimuth_initial)
+        self._sin_alfa1 = math.sin(alfa1)
+        self._cos_alfa1 = math.cos(alfa1)
+
+        # U1 - reduced latitude
+        tan_u1 = geodesic.one_minus_f * math.tan(math.radians(lat_initial))
+        self._cos_u1 = 1 / math.sqrt(1 + tan_u1 * tan_u1)
+        self._sin_u1 = tan_u1 * self._cos_u1
+
+        # sigma1 - angular distance on the sphere from the equator to initial point
+        self._sigma1 = math.atan2(tan_u1, self._cos_alfa1)
+
+        # sin_alfa - azimuth of the geodesic at the equator
+        self._sin_alfa = self._cos_u1 * self._sin_alfa1
+        cos_sq_alfa = 1 - self._sin_alfa * self._sin_alfa
+        u_sq = cos_sq_alfa * geodesic.a_sq_minus_b_sq / geodesic.b_sq
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        self._B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        self._C = f / 16 * cos_sq_alfa * (4 + f * (4 - 3 * cos_sq_alfa))
+        self._b_A = geodesic.b * A
+
+        # Distance and sigma of the last point computed by position method
+        self._last_distance = 0.0
+        self._last_sigma = 0.0
+
+    def _sigma_terms(self, sigma):
+        """ Returns cos(2 * sigma_m), sin(sigma), cos(sigma) and correction of sigma for given sigma. """
+        B = self._B
+        cos2sigma_m = math.cos(2 * self._sigma1 + sigma)
+        sin_sigma = math.sin(sigma)
+        cos_sigma = math.cos(sigma)
+        d_sigma = B * sin_sigma * (cos2sigma_m + B / 4 * (
+                    cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m) - B / 6 * cos2sigma_m * (
+                        -3 + 4 * sin_sigma * sin_sigma) * (-3 + 4 * cos2sigma_m * cos2sigma_m)))
+        return cos2sigma_m, sin_sigma, cos_sigma, d_sigma
+
+    def position(self, distance):
+        """ Computes the point at the given distance from the initial point along the line.
+        As in Geodesic.direct, series solution is returned if the iteration hits geodesic.max_iterations.
+        :param distance: float, distance from the initial point; meters
+        :return lon_end, lat_end: float, float longitude and latitude of the point in decimal degrees format
+        """
+        geodesic = self.geodesic
+        sigma0 = distance / self._b_A
+        # Warm start: shift the sigma of the previous point by the spherical arc between points
+        sigma = self._last_sigma + (distance - self._last_distance) / self._b_A
+        iterations = 0
+        while True:
+            if iterations == geodesic.max_iterations:
+                inputs = (self.lon_initial, self.lat_initial, self.azimuth_initial, distance)
+                if geodesic.telemetry is not None:
+                    geodesic.telemetry.record(PROBLEM_DIRECT, iterations, False, inputs)
+                return geodesic.direct_series(*inputs)
+            iterations += 1
+            cos2sigma_m, sin_sigma, cos_sigma, d_sigma = self._sigma_terms(sigma)
+            sigmap = sigma
+            sigma = sigma0 + d_sigma
+            if math.fabs(sigma - sigmap) <= 1e-12:
+                break
+
+        if geodesic.telemetry is not None:
+            geodesic.telemetry.record(PROBLEM_DIRECT, iterations, True,
+                                      (self.lon_initial, self.lat_initial, self.azimuth_initial, distance))
+
+        self._last_distance = distance
+        self._last_sigma = sigma
+
+        f = self.geodesic.f
+        sin_u1, cos_u1 = self._sin_u1, self._cos_u1
+        sin_alfa, sin_alfa1, cos_alfa1, C = self._sin_alfa, self._sin_alfa1, self._cos_alfa1, self._C
+
+        var_aux = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alfa1  # Auxiliary variable
+
+        # Latitude of the end point in radians
+        lat2 = math.atan2(sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alfa1,
+                          self.geodesic.one_minus_f * math.sqrt(sin_alfa * sin_alfa + var_aux * var_aux))
+
+        lamb = math.atan2(sin_sigma * sin_alfa1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alfa1)
+        L = lamb - (1 - C) * f * sin_alfa * (
+                    sigma + C * sin_sigma * (cos2sigma_m + C * cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m)))
+        # Longitude of the end point in radians
+        lon2 = (self._lon1 + L + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        return math.degrees(lon2), math.degrees(lat2)
+
+    def positions(self, distances):
+        """ Vectorized version of position method, computes points at the array of distances.
+        All elements are iterated simultaneously, so the iteration starts from the spherical approximation
+        for every element. Elements that hit geodesic.max_iterations are computed by series solution.
+        :param distances: float or array_like, distances from the initial point; meters
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the points in decimal degrees
+                                  format, shape of the distances
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        shape = distances.shape
+        f, B, C = self.geodesic.f, self._B, self._C
+        sin_u1, cos_u1 = self._sin_u1, self._cos_u1
+        sin_alfa, sin_alfa1, cos_alfa1 = self._sin_alfa, self._sin_alfa1, self._cos_alfa1
+
+        sigma0 = distances.ravel() / self._b_A
+        sigma = sigma0.copy()
+        sin_sigma = np.empty_like(sigma)
+        cos_sigma = np.empty_like(sigma)
+        cos2sigma_m = np.empty_like(sigma)
+        iterations = np.zeros(sigma.size, dtype=np.int64)
+
+        # Indices of the elements that have not converged yet, every element is iterated at least once
+        idx = np.arange(sigma.size)
+        for _ in range(self.geodesic.max_iterations):
+            iterations[idx] += 1
+            sigma_i = sigma[idx]
+            cos2sigma_m_i = np.cos(2 * self._sigma1 + sigma_i)
+            sin_sigma_i = np.sin(sigma_i)
+            cos_sigma_i = np.cos(sigma_i)
+            d_sigma = B * sin_sigma_i * (cos2sigma_m_i + B / 4 * (
+                        cos_sigma_i * (-1 + 2 * cos2sigma_m_i * cos2sigma_m_i) - B / 6 * cos2sigma_m_i * (
+                            -3 + 4 * sin_sigma_i * sin_sigma_i) * (-3 + 4 * cos2sigma_m_i * cos2sigma_m_i)))
+            sigma_new = sigma0[idx] + d_sigma
+
+            cos2sigma_m[idx] = cos2sigma_m_i
+            sin_sigma[idx] = sin_sigma_i
+            cos_sigma[idx] = cos_sigma_i
+            sigma[idx] = sigma_new
+            idx = idx[np.fabs(sigma_new - sigma_i) > 1e-12]
+            if not idx.size:
+                break
+
+        if self.geodesic.telemetry is not None:
+            converged = np.ones(sigma.size, dtype=bool)
+            converged[idx] = False
+            self.geodesic.telemetry.record_batch(PROBLEM_DIRECT, iterations, converged,
+                                                 (np.full(sigma.size, self.lon_initial),
+                                                  np.full(sigma.size, self.lat_initial),
+                                                  np.full(sigma.size, self.azimuth_initial), distances.ravel()))
+
+        var_aux = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alfa1  # Auxiliary variable
+
+        # Latitude of the end point in radians
+        lat2 = np.arctan2(sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alfa1,
+                          self.geodesic.one_minus_f * np.sqrt(sin_alfa * sin_alfa + var_aux * var_aux))
+
+        lamb = np.arctan2(sin_sigma * sin_alfa1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alfa1)
+        L = lamb - (1 - C) * f * sin_alfa * (
+                    sigma + C * sin_sigma * (cos2sigma_m + C * cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m)))
+        # Longitude of the end point in radians
+        lon2 = (self._lon1 + L + 3 * math.pi) % (2 * math.pi) - math.pi
+
+        lon_end = np.degrees(lon2)
+        lat_end = np.degrees(lat2)
+
+        if idx.size:
+            # Fallback for the elements that hit the iteration cap
+            lon_end[idx], lat_end[idx] = self.geodesic.direct_series_batch(self.lon_initial, self.lat_initial,
+                                                                           self.azimuth_initial,
+                                                                           distances.ravel()[idx])
+
+        return lon_end.reshape(shape), lat_end.reshape(shape)
+
+
+# Geodesic instances of the registered ellipsoids, created on first use
+_geodesics = {}
+
+# Cache of the direct solutions, None if caching is disabled
+_direct_cache = None
+
+
+def register_ellipsoid(ellipsoid_name, a, b, f):
+    """ Registers custom ellipsoid, afterwards it can be used by its name as any of the predefined ellipsoids.
+    Registering ellipsoid under existing name replaces the ellipsoid parameters.
+    :param ellipsoid_name: str, ellipsoid short name
+    :param a: float, semi-major axis; meters
+    :param b: float, semi-minor axis; meters
+    :param f: float, flattening
+    """
+    if not (a > 0 and 0 < b <= a and 0 <= f < 1):
+        raise ValueError('Ellipsoid error. Invalid parameters of ellipsoid {}: a={}, b={}, f={}.'.format(
+            ellipsoid_name, a, b, f))
+    ellipsoids[ellipsoid_name] = ellipsoid(A=a, B=b, F=f)
+    _geodesics.pop(ellipsoid_name, None)
+    if _direct_cache is not None:
+        _direct_cache.clear()
+
+
+def get_geodesic(ellipsoid_name):
+    """ Returns cached Geodesic instance for the registered ellipsoid.
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return: Geodesic
+    """
+    try:
+        return _geodesics[ellipsoid_name]
+    except KeyError:
+        a, b, f = ellipsoids[ellipsoid_name]
+        geodesic = _geodesics[ellipsoid_name] = Geodesic(a, b, f)
+        return geodesic
+
+
+def enable_direct_solution_cache(maxsize=DIRECT_CACHE_SIZE, angle_quantum=DIRECT_CACHE_ANGLE_QUANTUM,
+                                 distance_quantum=DIRECT_CACHE_DISTANCE_QUANTUM):
+    """ Enables caching of vincenty_direct_solution results, replaces the existing cache.
+    :param maxsize: int, maximum number of cached solutions
+    :param angle_quantum: float, quantization step of longitudes, latitudes and azimuths in cache keys;
+                          decimal degrees
+    :param distance_quantum: float, quantization step of distances in cache keys; meters
+    :return: DirectSolutionCache
+    """
+    global _direct_cache
+    _direct_cache = DirectSolutionCache(maxsize, angle_quantum, distance_quantum)
+    return _direct_cache
+
+
+def disable_direct_solution_cache():
+    """ Disables caching of vincenty_direct_solution results and drops the cache. """
+    global _direct_cache
+    _direct_cache = None
+
+
+def get_direct_solution_cache():
+    """ Returns cache of vincenty_direct_solution results.
+    :return: DirectSolutionCache, None if caching is disabled
+    """
+    return _direct_cache
+
 
 def vincenty_direct_solution(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name):
     """ Computes the latitude and longitude of the second point based on latitude, longitude,
     of the first point and distance and azimuth from first point to second point.
-    Uses the algorithm by Thaddeus Vincenty for direct geodetic problem.
-    For more information refer to: http://www.ngs.noaa.gov/PUBS_LIB/inverse.pdf
+    Uses the algorithm by Thaddeus Vincenty for direct geodetic problem, see Geodesic.direct.
     :param lon_initial: float, longitude of the initial  point in decimal degrees format
     :param lat_initial: float, latitude of the initial point in decimal degrees format
     :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
@@ -25,61 +1539,231 @@ def vincenty_direct_solution(lon_initial, lat_initial, azimuth_initial, distance
     :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
     :return lon_end, lat_end: float, float longitude and longitude of the end point in decimal degrees format
     """
-    # Unpack parameters of ellipsoid
-    a, b, f = ellipsoids[ellipsoid_name]
+    cache = _direct_cache
+    if cache is None:
+        return get_geodesic(ellipsoid_name).direct(lon_initial, lat_initial, azimuth_initial, distance)
 
-    # Convert latitude, longitude, azimuth of the initial point to radians
-    lon1 = math.radians(lon_initial)
-    lat1 = math.radians(lat_initial)
-    alfa1 = math.radians(azimuth_initial)
+    key = cache.key(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name)
+    result = cache.get(key)
+    if result is None:
+        result = get_geodesic(ellipsoid_name).direct(lon_initial, lat_initial, azimuth_initial, distance)
+        cache.put(key, result)
+    return result
 
-    sin_alfa1 = math.sin(alfa1)
-    cos_alfa1 = math.cos(alfa1)
 
-    # U1 - reduced latitude
-    tan_u1 = (1 - f) * math.tan(lat1)
-    cos_u1 = 1 / math.sqrt(1 + tan_u1 * tan_u1)
-    sin_u1 = tan_u1 * cos_u1
+def vincenty_direct_solution_batch(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name):
+    """ Vectorized version of vincenty_direct_solution, see Geodesic.direct_batch.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                            in decimal degrees format
+    :param distance: float or array_like, distances from the initial points to the end points; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                              format, shape is the broadcast shape of the arguments
+    """
+    return get_geodesic(ellipsoid_name).direct_batch(lon_initial, lat_initial, azimuth_initial, distance)
 
-    # sigma1 - angular distance on the sphere from the equator to initial point
-    sigma1 = math.atan2(tan_u1, math.cos(alfa1))
 
-    # sin_alfa - azimuth of the geodesic at the equator
-    sin_alfa = cos_u1 * sin_alfa1
-    cos_sq_alfa = 1 - sin_alfa * sin_alfa
-    u_sq = cos_sq_alfa * (a * a - b * b) / (b * b)
-    A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
-    B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+def vincenty_direct_solution_with_azimuth(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name):
+    """ Computes the end point and the azimuth from the end point to the initial point,
+    see Geodesic.direct_with_azimuth.
+    :param lon_initial: float, longitude of the initial  point in decimal degrees format
+    :param lat_initial: float, latitude of the initial point in decimal degrees format
+    :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+    :param distance: float, distance from first point to second point; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon_end, lat_end, azimuth_reverse: float, float, float longitude and longitude of the end point and
+            azimuth from the end point to the initial point in decimal degrees format
+    """
+    return get_geodesic(ellipsoid_name).direct_with_azimuth(lon_initial, lat_initial, azimuth_initial, distance)
 
-    sigma = distance / (b * A)
-    sigmap = 1
-    sin_sigma, cos_sigma, cos2sigma_m = None, None, None
 
-    while math.fabs(sigma - sigmap) > 1e-12:
-        cos2sigma_m = math.cos(2 * sigma1 + sigma)
-        sin_sigma = math.sin(sigma)
-        cos_sigma = math.cos(sigma)
-        d_sigma = B * sin_sigma * (cos2sigma_m + B / 4 * (
-                    cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m) - B / 6 * cos2sigma_m * (
-                        -3 + 4 * sin_sigma * sin_sigma) * (-3 + 4 * cos2sigma_m * cos2sigma_m)))
-        sigmap = sigma
-        sigma = distance / (b * A) + d_sigma
+def vincenty_direct_solution_with_azimuth_batch(lon_initial, lat_initial, azimuth_initial, distance,
+                                                ellipsoid_name):
+    """ Vectorized version of vincenty_direct_solution_with_azimuth, see Geodesic.direct_with_azimuth_batch.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                            in decimal degrees format
+    :param distance: float or array_like, distances from the initial points to the end points; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon_end, lat_end, azimuth_reverse: ndarray, ndarray, ndarray longitudes and latitudes of the end
+            points and azimuths from the end points to the initial points in decimal degrees format
+    """
+    return get_geodesic(ellipsoid_name).direct_with_azimuth_batch(lon_initial, lat_initial, azimuth_initial,
+                                                                  distance)
+
+
+def vincenty_inverse_solution(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name):
+    """ Computes the distance between two points and the azimuths of the geodesic between them.
+    Uses the algorithm by Thaddeus Vincenty for inverse geodetic problem, see Geodesic.inverse.
+    :param lon_initial: float, longitude of the initial point in decimal degrees format
+    :param lat_initial: float, latitude of the initial point in decimal degrees format
+    :param lon_end: float, longitude of the end point in decimal degrees format
+    :param lat_end: float, latitude of the end point in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return distance, azimuth_initial, azimuth_reverse: float, float, float
+            distance between points in meters, azimuth from the initial point to the end point and azimuth
+            from the end point to the initial point in decimal degrees format <0, 360).
+            If the solution does not converge (nearly antipodal points) returns None.
+    """
+    return get_geodesic(ellipsoid_name).inverse(lon_initial, lat_initial, lon_end, lat_end)
+
+
+def vincenty_inverse_solution_batch(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name):
+    """ Vectorized version of vincenty_inverse_solution, see Geodesic.inverse_batch.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+    :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return distance, azimuth_initial, azimuth_reverse: ndarray, ndarray, ndarray
+            distances in meters, azimuths from the initial points to the end points and azimuths
+            from the end points to the initial points in decimal degrees format <0, 360).
+            Elements for which the solution does not converge (nearly antipodal points) are NaN.
+    """
+    return get_geodesic(ellipsoid_name).inverse_batch(lon_initial, lat_initial, lon_end, lat_end)
+
+
+def vincenty_inverse_solution_matrix(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name,
+                                     chunk_bytes=MATRIX_CHUNK_BYTES):
+    """ Computes N x M pairwise matrices of distances and azimuths between N initial points and M end points,
+    see Geodesic.inverse_matrix.
+    :param lon_initial: array_like, N longitudes of the initial points in decimal degrees format
+    :param lat_initial: array_like, N latitudes of the initial points in decimal degrees format
+    :param lon_end: array_like, M longitudes of the end points in decimal degrees format
+    :param lat_end: array_like, M latitudes of the end points in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param chunk_bytes: int, memory budget of temporary arrays; bytes
+    :return distance, azimuth_initial, azimuth_reverse: ndarray, ndarray, ndarray
+            N x M matrices, element [i, j] refers to the geodesic from initial point i to end point j
+    """
+    return get_geodesic(ellipsoid_name).inverse_matrix(lon_initial, lat_initial, lon_end, lat_end, chunk_bytes)
+
+
+def series_direct_solution(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name):
+    """ Computes the latitude and longitude of the second point based on latitude, longitude,
+    of the first point and distance and azimuth from first point to second point.
+    Non-iterative solution with fixed amount of work per point, see Geodesic.direct_series.
+    :param lon_initial: float, longitude of the initial  point in decimal degrees format
+    :param lat_initial: float, latitude of the initial point in decimal degrees format
+    :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+    :param distance: float, distance from first point to second point; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon_end, lat_end: float, float longitude and longitude of the end point in decimal degrees format
+    """
+    return get_geodesic(ellipsoid_name).direct_series(lon_initial, lat_initial, azimuth_initial, distance)
+
+
+def series_direct_solution_batch(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name):
+    """ Vectorized version of series_direct_solution, see Geodesic.direct_series_batch.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                            in decimal degrees format
+    :param distance: float or array_like, distances from the initial points to the end points; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                              format, shape is the broadcast shape of the arguments
+    """
+    return get_geodesic(ellipsoid_name).direct_series_batch(lon_initial, lat_initial, azimuth_initial, distance)
+
+
+# Geodesic methods that solve direct problem and compute distance with given accuracy tier: (scalar, batch)
+_DIRECT_METHODS = {METHOD_SPHERICAL: (Geodesic.direct_spherical, Geodesic.direct_spherical_batch),
+                   METHOD_ANDOYER_LAMBERT: (Geodesic.direct_andoyer_lambert, Geodesic.direct_andoyer_lambert_batch),
+                   METHOD_VINCENTY: (Geodesic.direct, Geodesic.direct_batch),
+                   METHOD_SERIES: (Geodesic.direct_series, Geodesic.direct_series_batch)}
+
+_DISTANCE_METHODS = {METHOD_SPHERICAL: (Geodesic.distance_spherical, Geodesic.distance_spherical_batch),
+                     METHOD_ANDOYER_LAMBERT: (Geodesic.distance_andoyer_lambert,
+                                              Geodesic.distance_andoyer_lambert_batch),
+                     METHOD_VINCENTY: (lambda geodesic, *args: (geodesic.inverse(*args) or (None, ))[0],
+                                       lambda geodesic, *args: geodesic.inverse_batch(*args)[0])}
 
-    var_aux = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alfa1  # Auxiliary variable
 
-    # Latitude of the end point in radians
-    lat2 = math.atan2(sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alfa1,
-                      (1 - f) * math.sqrt(sin_alfa * sin_alfa + var_aux * var_aux))
+def get_method_error_bound(problem, method, distance):
+    """ Returns declared error bound of the method for given distance.
+    :param problem: str, problem type: PROBLEM_DIRECT or PROBLEM_INVERSE (distance computation)
+    :param method: str, method, e.g. METHOD_SPHERICAL
+    :param distance: float, distance; meters
+    :return: float, error bound in meters, infinity if the method is not valid for the distance
+    """
+    bound = METHOD_ERROR_BOUNDS[problem][method]
+    if distance > bound.max_distance:
+        return math.inf
+    return bound.relative * distance + bound.absolute
+
 
-    lamb = math.atan2(sin_sigma * sin_alfa1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alfa1)
-    C = f / 16 * cos_sq_alfa * (4 + f * (4 - 3 * cos_sq_alfa))
-    L = lamb - (1 - C) * f * sin_alfa * (
-                sigma + C * sin_sigma * (cos2sigma_m + C * cos_sigma * (-1 + 2 * cos2sigma_m * cos2sigma_m)))
-    # Longitude of the end point in radians
-    lon2 = (lon1 + L + 3 * math.pi) % (2 * math.pi) - math.pi
+def select_method(problem, tolerance, distance):
+    """ Selects the fastest method which error does not exceed tolerance.
+    :param problem: str, problem type: PROBLEM_DIRECT or PROBLEM_INVERSE (distance computation)
+    :param tolerance: float, maximum acceptable error; meters
+    :param distance: float or array_like, distance or distances to compute; meters,
+                     the longest one decides about the method
+    :return: str, method, e.g. METHOD_SPHERICAL. If no method meets tolerance returns METHOD_VINCENTY.
+    """
+    distance = float(np.max(distance))
+    for method in METHODS_BY_SPEED:
+        if get_method_error_bound(problem, method, distance) <= tolerance:
+            return method
+    return METHOD_VINCENTY
 
-    # Convert to decimal degrees
-    lon_end = math.degrees(lon2)
-    lat_end = math.degrees(lat2)
 
-    return lon_end, lat_end
+def direct_solution(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name, method=METHOD_VINCENTY):
+    """ Computes the latitude and longitude of the second point based on latitude, longitude,
+    of the first point and distance and azimuth from first point to second point with selected method.
+    :param lon_initial: float, longitude of the initial  point in decimal degrees format
+    :param lat_initial: float, latitude of the initial point in decimal degrees format
+    :param azimuth_initial, azimuth from the initial point to the end point in decimal degrees format
+    :param distance: float, distance from first point to second point; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method, e.g. METHOD_SPHERICAL, see also select_method
+    :return lon_end, lat_end: float, float longitude and longitude of the end point in decimal degrees format
+    """
+    return _DIRECT_METHODS[method][0](get_geodesic(ellipsoid_name), lon_initial, lat_initial, azimuth_initial,
+                                      distance)
+
+
+def direct_solution_batch(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name,
+                          method=METHOD_VINCENTY):
+    """ Vectorized version of direct_solution, arguments are broadcast against each other.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                            in decimal degrees format
+    :param distance: float or array_like, distances from the initial points to the end points; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method, e.g. METHOD_SPHERICAL, see also select_method
+    :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                              format
+    """
+    return _DIRECT_METHODS[method][1](get_geodesic(ellipsoid_name), lon_initial, lat_initial, azimuth_initial,
+                                      distance)
+
+
+def geodesic_distance(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name, method=METHOD_VINCENTY):
+    """ Computes distance between two points with selected method.
+    :param lon_initial: float, longitude of the initial point in decimal degrees format
+    :param lat_initial: float, latitude of the initial point in decimal degrees format
+    :param lon_end: float, longitude of the end point in decimal degrees format
+    :param lat_end: float, latitude of the end point in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method, e.g. METHOD_SPHERICAL, see also select_method
+    :return: float, distance; meters. None if Vincenty solution does not converge.
+    """
+    return _DISTANCE_METHODS[method][0](get_geodesic(ellipsoid_name), lon_initial, lat_initial, lon_end, lat_end)
+
+
+def geodesic_distance_batch(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name, method=METHOD_VINCENTY):
+    """ Vectorized version of geodesic_distance, arguments are broadcast against each other.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+    :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method, e.g. METHOD_SPHERICAL, see also select_method
+    :return: ndarray, distances; meters. NaN where Vincenty solution does not converge.
+    """
+    return _DISTANCE_METHODS[method][1](get_geodesic(ellipsoid_name), lon_initial, lat_initial, lon_end, lat_end)
@@ -0,0 +1,120 @@
+"""
+holding.py
+holding module provides functionality to generate nominal racetrack and holding pattern templates
+for many fixes at once, e.g. to review holding procedures.
+"""
+import math
+
+import numpy as np
+
+from .const import *
+from .distance import Distance, convert_dist_batch_to_m
+from .ellipsoid_calc import get_geodesic
+
+# Parameters of the nominal holding pattern: bank angle in degrees, maximum rate of turn in degrees per second,
+# outbound time in minutes
+HOLDING_BANK_ANGLE = 25.0
+HOLDING_MAX_RATE_OF_TURN = 3.0
+HOLDING_OUTBOUND_TIME = 1.0
+
+
+def _convert_to_m(distance, uom):
+    """ Converts Distance object, array_like of Distance objects or array_like of distances in uom to meters. """
+    items = np.asarray(distance, dtype=object)
+    if items.size and isinstance(items.flat[0], Distance):
+        for item in items.flat:
+            if not item.is_valid:
+                raise ValueError(item.err_msg)
+        return np.array([item.convert_dist_to_m() for item in items.flat]).reshape(items.shape)
+    return convert_dist_batch_to_m(distance, uom)
+
+
+def racetrack_batch(lon_fix, lat_fix, inbound_course, leg_length, turn_radius, ellipsoid_name, uom=UOM_M,
+                    right_turns=True, arc_vertex_count=18):
+    """ Generates closed outlines of racetracks: inbound leg ending at the fix, 180 degrees turn, outbound leg
+    and 180 degrees turn back to the start of the inbound leg. All arguments except ellipsoid_name, uom
+    and arc_vertex_count are broadcast against each other, so one call can produce templates for many fixes,
+    several courses or leg lengths at one fix or both.
+    Start of the inbound leg, centers of both turns and vertices of both arcs are computed in three vectorized
+    direct solutions for all templates, the outbound leg joins the ends of the arcs.
+    :param lon_fix: float or array_like, longitudes of the fixes in decimal degrees format
+    :param lat_fix: float or array_like, latitudes of the fixes in decimal degrees format
+    :param inbound_course: float or array_like, courses (azimuths) of the inbound legs at the fixes
+                           in decimal degrees format
+    :param leg_length: Distance, array_like of Distance or float or array_like, lengths of the inbound legs
+    :param turn_radius: Distance, array_like of Distance or float or array_like, radii of the turns
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param uom: str or array_like, unit of measure of the lengths and radii given as numbers, e.g. UOM_NM
+    :param right_turns: bool or array_like, True for right turns (standard pattern), False for left turns
+    :param arc_vertex_count: int, number of segments of each turn
+    :return lon, lat: ndarray, ndarray longitudes and latitudes of the vertices in decimal degrees format,
+                      first and last vertex is the fix, vertex arc_vertex_count is the start of the outbound leg
+                      and vertex 2 * arc_vertex_count + 1 is the start of the inbound leg,
+                      shape is the broadcast shape of the arguments + (2 * arc_vertex_count + 3, )
+    """
+    geodesic = get_geodesic(ellipsoid_name)
+    lon_fix, lat_fix, inbound_course, leg_length, turn_radius, right_turns = np.broadcast_arrays(
+        np.asarray(lon_fix, dtype=np.float64), np.asarray(lat_fix, dtype=np.float64),
+        np.asarray(inbound_course, dtype=np.float64), _convert_to_m(leg_length, uom),
+        _convert_to_m(turn_radius, uom), np.asarray(right_turns, dtype=bool))
+    side = np.where(right_turns, 1.0, -1.0)
+
+    # Start of the inbound leg and the inbound course there
+    lon_start, lat_start, course_start = geodesic.direct_with_azimuth_batch(lon_fix, lat_fix, inbound_course + 180,
+                                                                            leg_length)
+
+    # Centers of the outbound and inbound turns, abeam the fix and the start of the inbound leg,
+    # and azimuths from the centers to these points
+    lon_center, lat_center, azimuth_center = geodesic.direct_with_azimuth_batch(
+        np.stack([lon_fix, lon_start]), np.stack([lat_fix, lat_start]),
+        np.stack([inbound_course, course_start]) + side * 90, turn_radius)
+
+    # Outbound turn starts at the fix, inbound turn ends at the start of the inbound leg
+    azimuth_start = np.stack([azimuth_center[0], azimuth_center[1] - side * 180])
+    steps = np.linspace(0, 180, arc_vertex_count + 1)
+    azimuths = (azimuth_start[..., np.newaxis] + side[..., np.newaxis] * steps) % 360
+    lon_arc, lat_arc = geodesic.direct_batch(lon_center[..., np.newaxis], lat_center[..., np.newaxis], azimuths,
+                                             turn_radius[..., np.newaxis])
+
+    lon = np.concatenate([lon_fix[..., np.newaxis], lon_arc[0][..., 1:], lon_arc[1][..., :-1],
+                          lon_start[..., np.newaxis], lon_fix[..., np.newaxis]], axis=-1)
+    lat = np.concatenate([lat_fix[..., np.newaxis], lat_arc[0][..., 1:], lat_arc[1][..., :-1],
+                          lat_start[..., np.newaxis], lat_fix[..., np.newaxis]], axis=-1)
+    return lon, lat
+
+
+def holding_turn_radius(true_airspeed, bank_angle=HOLDING_BANK_ANGLE):
+    """ Computes radii of the turns of the holding patterns, rate of turn follows from the bank angle,
+    but does not exceed HOLDING_MAX_RATE_OF_TURN (ICAO PANS-OPS formulae).
+    :param true_airspeed: float or array_like, true airspeeds; knots
+    :param bank_angle: float or array_like, bank angles in decimal degrees format
+    :return: ndarray, radii of the turns; nautical miles
+    """
+    true_airspeed = np.asarray(true_airspeed, dtype=np.float64)
+    rate_of_turn = np.minimum(3431 * np.tan(np.radians(bank_angle)) / (math.pi * true_airspeed),
+                              HOLDING_MAX_RATE_OF_TURN)
+    return true_airspeed / (20 * math.pi * rate_of_turn)
+
+
+def holding_pattern_batch(lon_fix, lat_fix, inbound_course, true_airspeed, ellipsoid_name,
+                          outbound_time=HOLDING_OUTBOUND_TIME, bank_angle=HOLDING_BANK_ANGLE, right_turns=True,
+                          arc_vertex_count=18):
+    """ Generates nominal holding patterns (no wind) at the holding fixes, see racetrack_batch. Turn radius follows
+    from the true airspeed and the bank angle, see holding_turn_radius, length of the legs from the true airspeed
+    and the outbound time. Arguments except ellipsoid_name and arc_vertex_count are broadcast against each other.
+    :param lon_fix: float or array_like, longitudes of the holding fixes in decimal degrees format
+    :param lat_fix: float or array_like, latitudes of the holding fixes in decimal degrees format
+    :param inbound_course: float or array_like, inbound courses (azimuths) in decimal degrees format
+    :param true_airspeed: float or array_like, true airspeeds; knots
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param outbound_time: float or array_like, outbound times; minutes
+    :param bank_angle: float or array_like, bank angles in decimal degrees format
+    :param right_turns: bool or array_like, True for right turns (standard pattern), False for left turns
+    :param arc_vertex_count: int, number of segments of each turn
+    :return lon, lat: ndarray, ndarray longitudes and latitudes of the vertices in decimal degrees format,
+                      shape is the broadcast shape of the arguments + (2 * arc_vertex_count + 3, )
+    """
+    true_airspeed = np.asarray(true_airspeed, dtype=np.float64)
+    leg_length = true_airspeed * np.asarray(outbound_time, dtype=np.float64) / 60
+    return racetrack_batch(lon_fix, lat_fix, inbound_course, leg_length, holding_turn_radius(true_airspeed, bank_angle),
+                           ellipsoid_name, UOM_NM, right_turns, arc_vertex_count)
@@ -0,0 +1,264 @@
+"""
+intersection.py
+intersection module provides functionality to compute intersections of radials - geodesics from the stations
+with given azimuths, and of radials and arcs - geodesic circles around the stations, on the ellipsoid.
+"""
+import math
+
+import numpy as np
+
+from .ellipsoid_calc import get_geodesic
+
+# Tolerance of the correction of the distances along the radials and maximum number of iterations
+# of the intersection solvers; meters
+INTERSECTION_TOLERANCE = 1e-4
+INTERSECTION_MAX_ITERATIONS = 20
+
+
+def _radial_vectors(lon, lat, azimuth):
+    """ Returns unit vectors of the points and of the directions of the radials on the sphere, shape (3, N). """
+    lamb, phi, alfa = np.radians(lon), np.radians(lat), np.radians(azimuth)
+    sin_lamb, cos_lamb, sin_phi, cos_phi = np.sin(lamb), np.cos(lamb), np.sin(phi), np.cos(phi)
+    point = np.array([cos_phi * cos_lamb, cos_phi * sin_lamb, sin_phi])
+    north = np.array([-sin_phi * cos_lamb, -sin_phi * sin_lamb, cos_phi])
+    east = np.array([-sin_lamb, cos_lamb, np.zeros_like(lamb)])
+    return point, np.cos(alfa) * north + np.sin(alfa) * east
+
+
+def intersection_radials_batch(geodesic, lon_1, lat_1, azimuth_1, lon_2, lat_2, azimuth_2):
+    """ Computes intersections of the radials - geodesics from the stations (e.g. VOR) with given azimuths,
+    arguments are broadcast against each other. Intersection on the sphere of the mean radius is the start
+    of Newton iteration on the ellipsoid: distances along both radials are corrected by solving the linear
+    system in the tangent plane at the current point, which converges in 3 - 4 iterations.
+    Azimuths are true azimuths, magnetic variation of the stations has to be applied before.
+    :param geodesic: Geodesic, geodesic of the ellipsoid
+    :param lon_1: float or array_like, longitudes of the first stations in decimal degrees format
+    :param lat_1: float or array_like, latitudes of the first stations in decimal degrees format
+    :param azimuth_1: float or array_like, azimuths of the radials from the first stations in decimal degrees format
+    :param lon_2: float or array_like, longitudes of the second stations in decimal degrees format
+    :param lat_2: float or array_like, latitudes of the second stations in decimal degrees format
+    :param azimuth_2: float or array_like, azimuths of the radials from the second stations
+                      in decimal degrees format
+    :return lon, lat, distance_1, distance_2, converged: ndarray, ndarray, ndarray, ndarray, ndarray
+            longitudes and latitudes of the intersections in decimal degrees format, distances from the stations
+            to the intersections in meters and status, False if the radials do not intersect (they diverge
+            or lie on one geodesic) or the iteration did not converge, results of such elements are NaN.
+            Shape is the broadcast shape of the arguments.
+    """
+    args = np.broadcast_arrays(*(np.asarray(arg, dtype=np.float64) for arg in
+                                 (lon_1, lat_1, azimuth_1, lon_2, lat_2, azimuth_2)))
+    shape = args[0].shape
+    lon_1, lat_1, azimuth_1, lon_2, lat_2, azimuth_2 = (arg.ravel() for arg in args)
+
+    # Intersection of the great circles, of the two antipodal ones the one which is less behind any station.
+    # Intersection near a station may lie slightly behind it on the sphere, so the distances are signed
+    # during the iteration and checked only after it converges.
+    point_1, direction_1 = _radial_vectors(lon_1, lat_1, azimuth_1)
+    point_2, direction_2 = _radial_vectors(lon_2, lat_2, azimuth_2)
+    x = np.cross(np.cross(point_1, direction_1, axis=0), np.cross(point_2, direction_2, axis=0), axis=0)
+    norm = np.linalg.norm(x, axis=0)
+    x /= np.where(norm > 0, norm, 1)
+    sigma_1 = np.arctan2(np.sum(direction_1 * x, axis=0), np.sum(point_1 * x, axis=0))
+    sigma_2 = np.arctan2(np.sum(direction_2 * x, axis=0), np.sum(point_2 * x, axis=0))
+    antipode = np.minimum(sigma_1, sigma_2) < np.minimum(sigma_1 - np.copysign(math.pi, sigma_1),
+                                                         sigma_2 - np.copysign(math.pi, sigma_2))
+    sigma_1 = np.where(antipode, sigma_1 - np.copysign(math.pi, sigma_1), sigma_1)
+    sigma_2 = np.where(antipode, sigma_2 - np.copysign(math.pi, sigma_2), sigma_2)
+    distance_1 = sigma_1 * geodesic.mean_radius
+    distance_2 = sigma_2 * geodesic.mean_radius
+
+    lon = np.full(lon_1.size, np.nan)
+    lat = np.full(lon_1.size, np.nan)
+    converged = np.zeros(lon_1.size, dtype=bool)
+    active = np.flatnonzero(norm > 1e-12)
+    for _ in range(INTERSECTION_MAX_ITERATIONS):
+        if not active.size:
+            break
+        lon_a, lat_a, reverse_a = geodesic.direct_with_azimuth_batch(lon_1[active], lat_1[active], azimuth_1[active],
+                                                                 distance_1[active])
+        lon_b, lat_b, reverse_b = geodesic.direct_with_azimuth_batch(lon_2[active], lat_2[active], azimuth_2[active],
+                                                                 distance_2[active])
+        gap, azimuth_gap, _ = geodesic.inverse_batch(lon_a, lat_a, lon_b, lat_b)
+        lon[active], lat[active] = lon_a, lat_a
+
+        # Moving along the radials by d1, d2 closes the gap: d1 * u - d2 * v = gap * w, u, v, w unit vectors
+        # of the azimuths of the radials at the current points and of the gap
+        u = np.radians(reverse_a + 180)
+        v = np.radians(reverse_b + 180)
+        w = np.radians(azimuth_gap)
+        det = np.sin(v - u)
+        step_1 = gap * np.sin(v - w) / det
+        step_2 = gap * np.sin(u - w) / det
+        distance_1[active] += step_1
+        distance_2[active] += step_2
+
+        done = np.hypot(step_1, step_2) <= INTERSECTION_TOLERANCE
+        converged[active[done]] = True
+        active = active[~done & np.isfinite(step_1) & np.isfinite(step_2)]
+
+    # Intersections behind the stations or beyond the antipodes are not intersections of the radials,
+    # intersections at the stations are kept within the tolerance
+    half_meridian = math.pi * geodesic.b
+    converged &= (distance_1 >= -INTERSECTION_TOLERANCE) & (distance_1 < half_meridian) & \
+        (distance_2 >= -INTERSECTION_TOLERANCE) & (distance_2 < half_meridian)
+    lon = np.where(converged, lon, np.nan)
+    lat = np.where(converged, lat, np.nan)
+    distance_1 = np.where(converged, np.maximum(distance_1, 0), np.nan)
+    distance_2 = np.where(converged, np.maximum(distance_2, 0), np.nan)
+    return (lon.reshape(shape), lat.reshape(shape), distance_1.reshape(shape), distance_2.reshape(shape),
+            converged.reshape(shape))
+
+
+def intersection_radial_arc_batch(geodesic, lon_1, lat_1, azimuth_1, lon_2, lat_2, radius, far=False):
+    """ Computes intersections of the radials - geodesics from the stations (e.g. VOR) with given azimuths,
+    and the arcs - geodesic circles around the stations (e.g. DME), arguments are broadcast against each other.
+    Intersection on the sphere of the mean radius is the start of the iteration on the ellipsoid: distance
+    along the radial is corrected by the intersection of the radial and the circle in the tangent plane
+    at the current point, which converges in 3 - 4 iterations and keeps the nearer and the farther
+    intersection apart also for nearly tangent radials.
+    :param geodesic: Geodesic, geodesic of the ellipsoid
+    :param lon_1: float or array_like, longitudes of the radial stations in decimal degrees format
+    :param lat_1: float or array_like, latitudes of the radial stations in decimal degrees format
+    :param azimuth_1: float or array_like, true azimuths of the radials in decimal degrees format
+    :param lon_2: float or array_like, longitudes of the arc centers in decimal degrees format
+    :param lat_2: float or array_like, latitudes of the arc centers in decimal degrees format
+    :param radius: float or array_like, radii of the arcs; meters
+    :param far: bool, False for the intersection nearer to the radial station, True for the farther one
+    :return lon, lat, distance_1, converged: ndarray, ndarray, ndarray, ndarray longitudes and latitudes
+            of the intersections in decimal degrees format, distances from the radial stations
+            to the intersections in meters and status, False if the radial does not reach the arc
+            or the iteration did not converge, results of such elements are NaN.
+            Shape is the broadcast shape of the arguments.
+    """
+    args = np.broadcast_arrays(*(np.asarray(arg, dtype=np.float64) for arg in
+                                 (lon_1, lat_1, azimuth_1, lon_2, lat_2, radius)))
+    shape = args[0].shape
+    lon_1, lat_1, azimuth_1, lon_2, lat_2, radius = (arg.ravel() for arg in args)
+
+    # Point on the radial at arc sigma: point_1 * cos(sigma) + direction_1 * sin(sigma), its distance
+    # from the center: cos(radius) = a * cos(sigma) + b * sin(sigma) = r * cos(sigma - phi)
+    point_1, direction_1 = _radial_vectors(lon_1, lat_1, azimuth_1)
+    point_2 = _radial_vectors(lon_2, lat_2, 0.0)[0]
+    a = np.sum(point_2 * point_1, axis=0)
+    b = np.sum(point_2 * direction_1, axis=0)
+    cos_delta = np.cos(radius / geodesic.mean_radius) / np.hypot(a, b)
+    delta = np.arccos(np.clip(cos_delta, -1, 1))
+    phi = np.arctan2(b, a)
+    sigma_near = (phi - delta + math.pi) % (2 * math.pi) - math.pi
+    sigma_far = (phi + delta + math.pi) % (2 * math.pi) - math.pi
+    if far:
+        sigma = np.where(sigma_far >= 0, sigma_far, sigma_near)
+    else:
+        sigma = np.where(sigma_near >= 0, sigma_near, sigma_far)
+    distance_1 = sigma * geodesic.mean_radius
+
+    lon = np.full(lon_1.size, np.nan)
+    lat = np.full(lon_1.size, np.nan)
+    converged = np.zeros(lon_1.size, dtype=bool)
+    # Radials which miss the arc on the sphere start from the nearest point, they may reach it on the ellipsoid.
+    # Intersections near the station may lie behind it on the sphere, so all elements are iterated with signed
+    # distances and checked after the iteration converges.
+    active = np.arange(lon_1.size)
+    for _ in range(INTERSECTION_MAX_ITERATIONS):
+        if not active.size:
+            break
+        lon_a, lat_a, reverse_a = geodesic.direct_with_azimuth_batch(lon_1[active], lat_1[active], azimuth_1[active],
+                                                                 distance_1[active])
+        distance_2, _, reverse_2 = geodesic.inverse_batch(lon_2[active], lat_2[active], lon_a, lat_a)
+        lon[active], lat[active] = lon_a, lat_a
+
+        # Intersection of the radial and the circle in the tangent plane at the current point: center is
+        # ahead by p and aside by h, intersections are p -+ sqrt(radius^2 - h^2) ahead. The farther one is
+        # taken also if the nearer one is behind the station.
+        angle = np.radians(reverse_2 - reverse_a - 180)
+        p = distance_2 * np.cos(angle)
+        h = distance_2 * np.sin(angle)
+        disc = radius[active] * radius[active] - h * h
+        half_chord = np.sqrt(np.maximum(disc, 0))
+        step = p + half_chord
+        if not far:
+            step = np.where(distance_1[active] + p - half_chord >= 0, p - half_chord, step)
+        distance_1[active] += step
+
+        done = (np.fabs(step) <= INTERSECTION_TOLERANCE) & (disc >= 0)
+        converged[active[done]] = True
+        active = active[~done & np.isfinite(step)]
+
+    converged &= (distance_1 >= -INTERSECTION_TOLERANCE) & (distance_1 < math.pi * geodesic.b)
+    lon = np.where(converged, lon, np.nan)
+    lat = np.where(converged, lat, np.nan)
+    distance_1 = np.where(converged, np.maximum(distance_1, 0), np.nan)
+    return lon.reshape(shape), lat.reshape(shape), distance_1.reshape(shape), converged.reshape(shape)
+
+
+def radial_intersection(lon_1, lat_1, azimuth_1, lon_2, lat_2, azimuth_2, ellipsoid_name):
+    """ Computes intersection of two radials, see intersection_radials_batch.
+    :param lon_1: float, longitude of the first station in decimal degrees format
+    :param lat_1: float, latitude of the first station in decimal degrees format
+    :param azimuth_1: float, true azimuth of the radial from the first station in decimal degrees format
+    :param lon_2: float, longitude of the second station in decimal degrees format
+    :param lat_2: float, latitude of the second station in decimal degrees format
+    :param azimuth_2: float, true azimuth of the radial from the second station in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon, lat: float, float longitude and latitude of the intersection in decimal degrees format.
+            If the radials do not intersect returns None.
+    """
+    lon, lat, _, _, converged = intersection_radials_batch(get_geodesic(ellipsoid_name), lon_1, lat_1, azimuth_1,
+                                                           lon_2, lat_2, azimuth_2)
+    if not converged:
+        return None
+    return float(lon), float(lat)
+
+
+def radial_intersection_batch(lon_1, lat_1, azimuth_1, lon_2, lat_2, azimuth_2, ellipsoid_name):
+    """ Vectorized version of radial_intersection, see intersection_radials_batch.
+    :param lon_1: float or array_like, longitudes of the first stations in decimal degrees format
+    :param lat_1: float or array_like, latitudes of the first stations in decimal degrees format
+    :param azimuth_1: float or array_like, true azimuths of the radials from the first stations
+                      in decimal degrees format
+    :param lon_2: float or array_like, longitudes of the second stations in decimal degrees format
+    :param lat_2: float or array_like, latitudes of the second stations in decimal degrees format
+    :param azimuth_2: float or array_like, true azimuths of the radials from the second stations
+                      in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon, lat, distance_1, distance_2, converged: ndarray, ndarray, ndarray, ndarray, ndarray
+            intersections in decimal degrees format, distances from the stations in meters and status
+    """
+    return intersection_radials_batch(get_geodesic(ellipsoid_name), lon_1, lat_1, azimuth_1, lon_2, lat_2, azimuth_2)
+
+
+def radial_arc_intersection(lon_1, lat_1, azimuth_1, lon_2, lat_2, radius, ellipsoid_name, far=False):
+    """ Computes intersection of the radial and the arc, see intersection_radial_arc_batch.
+    :param lon_1: float, longitude of the radial station in decimal degrees format
+    :param lat_1: float, latitude of the radial station in decimal degrees format
+    :param azimuth_1: float, true azimuth of the radial in decimal degrees format
+    :param lon_2: float, longitude of the arc center in decimal degrees format
+    :param lat_2: float, latitude of the arc center in decimal degrees format
+    :param radius: float, radius of the arc; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param far: bool, False for the intersection nearer to the radial station, True for the farther one
+    :return lon, lat: float, float longitude and latitude of the intersection in decimal degrees format.
+            If the radial does not reach the arc returns None.
+    """
+    lon, lat, _, converged = intersection_radial_arc_batch(get_geodesic(ellipsoid_name), lon_1, lat_1, azimuth_1,
+                                                           lon_2, lat_2, radius, far)
+    if not converged:
+        return None
+    return float(lon), float(lat)
+
+
+def radial_arc_intersection_batch(lon_1, lat_1, azimuth_1, lon_2, lat_2, radius, ellipsoid_name, far=False):
+    """ Vectorized version of radial_arc_intersection, see intersection_radial_arc_batch.
+    :param lon_1: float or array_like, longitudes of the radial stations in decimal degrees format
+    :param lat_1: float or array_like, latitudes of the radial stations in decimal degrees format
+    :param azimuth_1: float or array_like, true azimuths of the radials in decimal degrees format
+    :param lon_2: float or array_like, longitudes of the arc centers in decimal degrees format
+    :param lat_2: float or array_like, latitudes of the arc centers in decimal degrees format
+    :param radius: float or array_like, radii of the arcs; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param far: bool, False for the intersections nearer to the radial stations, True for the farther ones
+    :return lon, lat, distance_1, converged: ndarray, ndarray, ndarray, ndarray intersections in decimal degrees
+            format, distances from the radial stations in meters and status
+    """
+    return intersection_radial_arc_batch(get_geodesic(ellipsoid_name), lon_1, lat_1, azimuth_1, lon_2, lat_2, radius,
+                                         far)
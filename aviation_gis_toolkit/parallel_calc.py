@@ -0,0 +1,206 @@
+"""
+parallel_calc.py
+parallel_calc module provides parallel execution of the ellipsoid_calc batch functions over a process pool.
+Input arrays are split into chunks, workers read the inputs from and write the results straight into
+shared memory buffers, so the arrays are not pickled between processes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .ellipsoid_calc import METHOD_VINCENTY, Geodesic, get_geodesic, _DIRECT_METHODS, _DISTANCE_METHODS
+
+# Default number of elements processed by one worker task
+PARALLEL_CHUNK_SIZE = 1 << 20
+
+# Tasks which can be executed in parallel
+TASK_DIRECT = 'TASK_DIRECT'
+TASK_INVERSE = 'TASK_INVERSE'
+TASK_DISTANCE = 'TASK_DISTANCE'
+
+# Number of output arrays of the tasks
+_TASK_OUTPUTS = {TASK_DIRECT: 2,
+                 TASK_INVERSE: 3,
+                 TASK_DISTANCE: 1}
+
+# Geodesic instances of the worker process, key: (a, b, f, max_iterations)
+_worker_geodesics = {}
+
+
+def _get_worker_geodesic(params):
+    """ Returns Geodesic instance for the ellipsoid parameters, instances are cached in the worker process.
+    :param params: tuple, (a, b, f, max_iterations)
+    :return: Geodesic
+    """
+    try:
+        return _worker_geodesics[params]
+    except KeyError:
+        geodesic = _worker_geodesics[params] = Geodesic(*params)
+        return geodesic
+
+
+def _solve(geodesic, task, method, args):
+    """ Solves the task for input arrays.
+    :param geodesic: Geodesic
+    :param task: str, task, e.g. TASK_DIRECT
+    :param method: str, method of the direct solution or distance computation, e.g. METHOD_VINCENTY
+    :param args: list of ndarrays, input arrays
+    :return: tuple of ndarrays, output arrays
+    """
+    if task == TASK_DIRECT:
+        return _DIRECT_METHODS[method][1](geodesic, *args)
+    if task == TASK_INVERSE:
+        return geodesic.inverse_batch(*args)
+    return _DISTANCE_METHODS[method][1](geodesic, *args),
+
+
+def _attach(name, rows, size):
+    """ Attaches to the shared memory block created by the parent process.
+    :param name: str, name of the shared memory block
+    :param rows: int, number of arrays in the block
+    :param size: int, number of elements of each array
+    :return shm, arrays: SharedMemory, ndarray shared memory block and its rows x size view
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray((rows, size), dtype=np.float64, buffer=shm.buf)
+
+
+def _worker(task, method, params, input_name, output_name, size, start, stop):
+    """ Solves the task for elements start:stop of the shared input arrays and writes the results into
+    the shared output arrays. Executed in the worker process.
+    """
+    input_shm, inputs = _attach(input_name, 4, size)
+    output_shm, outputs = _attach(output_name, _TASK_OUTPUTS[task], size)
+    try:
+        results = _solve(_get_worker_geodesic(params), task, method, inputs[:, start:stop])
+        for output, result in zip(outputs, results):
+            output[start:stop] = result
+    finally:
+        del inputs, outputs
+        input_shm.close()
+        output_shm.close()
+
+
+class ParallelExecutor:
+    """ Class executes batch geodetic computations in parallel over a pool of worker processes.
+    Results are identical to the serial batch functions: every element goes through the same operations,
+    only the elements are distributed among the workers. Telemetry of the Geodesic instances is not collected
+    in the worker processes.
+    The pool is started on first use and kept until close is called, executor can be used as a context manager.
+    Attributes:
+    -----------
+    workers : int
+        Number of worker processes.
+    chunk_size : int
+        Number of elements processed by one worker task.
+    """
+
+    def __init__(self, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError('Parallel executor error. Invalid chunk size: {}.'.format(chunk_size))
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Shuts down the pool of worker processes. """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _execute(self, task, method, ellipsoid_name, args):
+        """ Broadcasts input arrays, copies them into shared memory and solves the task chunk by chunk.
+        :param task: str, task, e.g. TASK_DIRECT
+        :param method: str, method of the direct solution or distance computation, e.g. METHOD_VINCENTY
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :param args: tuple of array_like, four input arrays
+        :return: tuple of ndarrays, output arrays, shape is the broadcast shape of the input arrays
+        """
+        geodesic = get_geodesic(ellipsoid_name)
+        params = (geodesic.a, geodesic.b, geodesic.f, geodesic.max_iterations)
+        args = np.broadcast_arrays(*[np.asarray(arg, dtype=np.float64) for arg in args])
+        shape = args[0].shape
+        size = args[0].size
+        output_count = _TASK_OUTPUTS[task]
+
+        if size <= self.chunk_size:
+            results = _solve(geodesic, task, method, [arg.ravel() for arg in args])
+            return tuple(np.asarray(result, dtype=np.float64).reshape(shape) for result in results)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        input_shm = shared_memory.SharedMemory(create=True, size=4 * size * 8)
+        output_shm = shared_memory.SharedMemory(create=True, size=output_count * size * 8)
+        try:
+            inputs = np.ndarray((4, size), dtype=np.float64, buffer=input_shm.buf)
+            for row, arg in zip(inputs, args):
+                row[:] = arg.ravel()
+            del inputs
+
+            futures = [self._pool.submit(_worker, task, method, params, input_shm.name, output_shm.name, size,
+                                         start, min(start + self.chunk_size, size))
+                       for start in range(0, size, self.chunk_size)]
+            for future in futures:
+                future.result()
+
+            outputs = np.ndarray((output_count, size), dtype=np.float64, buffer=output_shm.buf)
+            results = tuple(output.reshape(shape).copy() for output in outputs)
+            del outputs
+            return results
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+    def direct_batch(self, lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name,
+                     method=METHOD_VINCENTY):
+        """ Parallel version of ellipsoid_calc.direct_solution_batch.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :param method: str, method, e.g. METHOD_SPHERICAL
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                                  format, shape is the broadcast shape of the arguments
+        """
+        return self._execute(TASK_DIRECT, method, ellipsoid_name, (lon_initial, lat_initial, azimuth_initial,
+                                                                    distance))
+
+    def inverse_batch(self, lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name):
+        """ Parallel version of ellipsoid_calc.vincenty_inverse_solution_batch.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :return distance, azimuth_initial, azimuth_reverse: ndarray, ndarray, ndarray
+                distances in meters and azimuths in decimal degrees format, NaN where the solution
+                does not converge
+        """
+        return self._execute(TASK_INVERSE, METHOD_VINCENTY, ellipsoid_name, (lon_initial, lat_initial, lon_end,
+                                                                              lat_end))
+
+    def distance_batch(self, lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name, method=METHOD_VINCENTY):
+        """ Parallel version of ellipsoid_calc.geodesic_distance_batch.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :param method: str, method, e.g. METHOD_SPHERICAL
+        :return: ndarray, distances; meters. NaN where Vincenty solution does not converge.
+        """
+        return self._execute(TASK_DISTANCE, method, ellipsoid_name, (lon_initial, lat_initial, lon_end,
+                                                                      lat_end))[0]
@@ -0,0 +1,73 @@
+"""
+range_ring.py
+range_ring module provides functionality to generate range rings (circles) and arcs on ellipsoid,
+such as boundaries of circular airspaces, sectors and DME arcs.
+"""
+import numpy as np
+
+from .ellipsoid_calc import METHOD_VINCENTY, direct_solution_batch
+
+
+def range_ring_batch(lon_center, lat_center, radius, ellipsoid_name, vertex_count=360, method=METHOD_VINCENTY):
+    """ Generates closed polygons approximating circles (range rings) around centers.
+    Centers and radii are broadcast against each other, so one call can produce rings for many centers,
+    several radii around one center or both. Vertices are placed at equal azimuth steps starting at azimuth 0,
+    the first vertex is repeated at the end to close the polygon.
+    Terms of the direct solution that depend on the center and on the azimuth are computed once and shared.
+    :param lon_center: float or array_like, longitudes of the centers in decimal degrees format
+    :param lat_center: float or array_like, latitudes of the centers in decimal degrees format
+    :param radius: float or array_like, radii of the rings; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param vertex_count: int, number of distinct vertices of each ring
+    :param method: str, method of the direct solution, e.g. METHOD_VINCENTY
+    :return lon, lat: ndarray, ndarray longitudes and latitudes of the vertices in decimal degrees format,
+                      shape is the broadcast shape of the centers and radii + (vertex_count + 1, )
+    """
+    lon_center = np.asarray(lon_center, dtype=np.float64)[..., np.newaxis]
+    lat_center = np.asarray(lat_center, dtype=np.float64)[..., np.newaxis]
+    radius = np.asarray(radius, dtype=np.float64)[..., np.newaxis]
+    azimuths = np.arange(vertex_count) * (360 / vertex_count)
+
+    lon, lat = direct_solution_batch(lon_center, lat_center, azimuths, radius, ellipsoid_name, method)
+    lon = np.concatenate([lon, lon[..., :1]], axis=-1)
+    lat = np.concatenate([lat, lat[..., :1]], axis=-1)
+    return lon, lat
+
+
+def arc_batch(lon_center, lat_center, radius, azimuth_start, azimuth_end, ellipsoid_name, vertex_count=36,
+              clockwise=True, method=METHOD_VINCENTY):
+    """ Generates arcs of circles between two azimuths (bearings) from the centers, e.g. DME arcs or sector
+    boundaries. All arguments except ellipsoid_name, vertex_count, clockwise and method are broadcast against
+    each other. If start and end azimuths are equal the arc is the full circle.
+    :param lon_center: float or array_like, longitudes of the centers in decimal degrees format
+    :param lat_center: float or array_like, latitudes of the centers in decimal degrees format
+    :param radius: float or array_like, radii of the arcs; meters
+    :param azimuth_start: float or array_like, azimuths from the centers to the start points of the arcs
+                          in decimal degrees format
+    :param azimuth_end: float or array_like, azimuths from the centers to the end points of the arcs
+                        in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param vertex_count: int, number of segments of each arc
+    :param clockwise: bool, True if the arcs go from start to end azimuth clockwise (azimuth increases),
+                      False if counterclockwise
+    :param method: str, method of the direct solution, e.g. METHOD_VINCENTY
+    :return lon, lat: ndarray, ndarray longitudes and latitudes of the vertices in decimal degrees format,
+                      first vertex is the start point and last vertex is the end point of the arc,
+                      shape is the broadcast shape of the arguments + (vertex_count + 1, )
+    """
+    azimuth_start = np.asarray(azimuth_start, dtype=np.float64)
+    azimuth_end = np.asarray(azimuth_end, dtype=np.float64)
+
+    if clockwise:
+        sweep = (azimuth_end - azimuth_start) % 360
+    else:
+        sweep = -((azimuth_start - azimuth_end) % 360)
+    sweep = np.where(sweep == 0, 360.0 if clockwise else -360.0, sweep)
+
+    steps = np.linspace(0, 1, vertex_count + 1)
+    azimuths = (azimuth_start[..., np.newaxis] + sweep[..., np.newaxis] * steps) % 360
+
+    lon_center = np.asarray(lon_center, dtype=np.float64)[..., np.newaxis]
+    lat_center = np.asarray(lat_center, dtype=np.float64)[..., np.newaxis]
+    radius = np.asarray(radius, dtype=np.float64)[..., np.newaxis]
+    return direct_solution_batch(lon_center, lat_center, azimuths, radius, ellipsoid_name, method)
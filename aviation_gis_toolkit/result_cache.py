@@ -0,0 +1,215 @@
+"""
+result_cache.py
+result_cache module provides persistent cache of the ellipsoid_calc batch results stored in SQLite database file,
+so results computed in one session are reused in the next ones.
+"""
+import hashlib
+import sqlite3
+
+import numpy as np
+
+from .ellipsoid_calc import (ALGORITHM_VERSION, DIRECT_CACHE_ANGLE_QUANTUM, DIRECT_CACHE_DISTANCE_QUANTUM,
+                             METHOD_VINCENTY, PROBLEM_DIRECT, PROBLEM_INVERSE, cache_info, ellipsoids,
+                             direct_solution_batch, geodesic_distance_batch, vincenty_inverse_solution_batch)
+
+# Default maximum size of the results kept by persistent cache; bytes
+RESULT_CACHE_BYTES = 1024 * 1024 * 1024
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    version INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    result BLOB NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (namespace, digest)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS state (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+'''
+
+
+class PersistentResultCache:
+    """ Class keeps results of the batch geodetic computations in SQLite database file.
+    Entry is the result of one batch call. Key consists of the problem type, method, ellipsoid name and parameters
+    and digest of the arguments quantized to angle_quantum and distance_quantum, so the arguments that differ only
+    by floating point noise share the entry. Every entry also keeps ALGORITHM_VERSION, entries of other
+    versions are deleted when the cache is opened.
+    When the total size of the results exceeds max_bytes the least recently used entries are evicted.
+    Per element lookups in SQLite are slower than vectorized solutions, so the cache works at batch granularity:
+    typically one call per airspace boundary or procedure, unchanged ones are read back as a whole.
+    Instance uses single database connection and it is not meant to be shared between threads.
+    Attributes:
+    -----------
+    path : str
+        Path to the database file.
+    max_bytes : int
+        Maximum total size of the results; bytes.
+    angle_quantum : float
+        Quantization step of longitudes, latitudes and azimuths; decimal degrees.
+    distance_quantum : float
+        Quantization step of distances; meters.
+    """
+
+    def __init__(self, path, max_bytes=RESULT_CACHE_BYTES, angle_quantum=DIRECT_CACHE_ANGLE_QUANTUM,
+                 distance_quantum=DIRECT_CACHE_DISTANCE_QUANTUM):
+        if max_bytes < 1 or angle_quantum <= 0 or distance_quantum <= 0:
+            raise ValueError('Cache error. Invalid parameters: max_bytes={}, angle_quantum={}, '
+                             'distance_quantum={}.'.format(max_bytes, angle_quantum, distance_quantum))
+        self.path = path
+        self.max_bytes = max_bytes
+        self.angle_quantum = angle_quantum
+        self.distance_quantum = distance_quantum
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute('DELETE FROM results WHERE version != ?', (ALGORITHM_VERSION, ))
+        row = self._connection.execute("SELECT value FROM state WHERE name = 'generation'").fetchone()
+        self._generation = row[0] if row else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Closes database connection. """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def clear(self):
+        """ Removes all entries and resets statistics. """
+        with self._connection:
+            self._connection.execute('DELETE FROM results')
+        self._hits = self._misses = self._evictions = 0
+
+    def _total_bytes(self):
+        """ Returns total size of the results; bytes. """
+        return self._connection.execute('SELECT COALESCE(SUM(bytes), 0) FROM results').fetchone()[0]
+
+    def info(self):
+        """ Returns statistics of the cache, hits and misses are counted per batch.
+        :return: cache_info, (hits, misses, evictions, maxsize, currsize), sizes in bytes
+        """
+        return cache_info(self._hits, self._misses, self._evictions, self.max_bytes, self._total_bytes())
+
+    @staticmethod
+    def _namespace(problem, method, ellipsoid_name):
+        """ Returns namespace part of the key: problem, method and ellipsoid. """
+        a, b, f = ellipsoids[ellipsoid_name]
+        return '{}|{}|{}|{!r}|{!r}|{!r}'.format(problem, method, ellipsoid_name, a, b, f)
+
+    def _execute(self, problem, method, ellipsoid_name, args, quanta, compute, width):
+        """ Returns cached results for the arguments, computes and stores them if they are not in the cache.
+        :param problem: str, problem type, e.g. PROBLEM_DIRECT
+        :param method: str, method, e.g. METHOD_VINCENTY
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :param args: tuple of array_like, four arguments of the computation
+        :param quanta: tuple of floats, quantization steps of the arguments
+        :param compute: function, computes tuple of width result arrays from the arguments
+        :param width: int, number of result arrays
+        :return: tuple of ndarrays, results, shape is the broadcast shape of the arguments
+        """
+        args = np.broadcast_arrays(*[np.asarray(arg, dtype=np.float64) for arg in args])
+        shape = args[0].shape
+        digest = hashlib.sha256(repr(shape).encode())
+        for arg, quantum in zip(args, quanta):
+            digest.update(np.ascontiguousarray(np.rint(arg / quantum).astype(np.int64)).data)
+        key = (self._namespace(problem, method, ellipsoid_name), digest.digest())
+
+        self._generation += 1
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO state VALUES ('generation', ?)", (self._generation, ))
+            row = self._connection.execute('SELECT result FROM results WHERE namespace = ? AND digest = ?',
+                                           key).fetchone()
+            if row is not None:
+                self._hits += 1
+                self._connection.execute('UPDATE results SET last_used = ? WHERE namespace = ? AND digest = ?',
+                                         (self._generation, ) + key)
+                results = np.frombuffer(row[0], dtype=np.float64).reshape((width, ) + shape).copy()
+                return tuple(results)
+
+            self._misses += 1
+            results = np.empty((width, ) + shape)
+            for result, computed in zip(results, compute(*args)):
+                result[...] = computed
+            result = results.tobytes()
+            self._connection.execute('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                                     key + (ALGORITHM_VERSION, len(result), result, self._generation))
+            self._evict()
+        return tuple(results)
+
+    def _evict(self):
+        """ Evicts the least recently used entries until total size of the results does not exceed max_bytes. """
+        excess = self._total_bytes() - self.max_bytes
+        rows = self._connection.execute('SELECT rowid, bytes FROM results ORDER BY last_used')
+        evicted = []
+        for rowid, size in rows:
+            if excess <= 0:
+                break
+            evicted.append((rowid, ))
+            excess -= size
+        self._connection.executemany('DELETE FROM results WHERE rowid = ?', evicted)
+        self._evictions += len(evicted)
+
+    def direct_batch(self, lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name,
+                     method=METHOD_VINCENTY):
+        """ Cached version of ellipsoid_calc.direct_solution_batch.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth_initial: float or array_like, azimuths from the initial points to the end points
+                                in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :param method: str, method, e.g. METHOD_SPHERICAL
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                                  format, shape is the broadcast shape of the arguments
+        """
+        q = self.angle_quantum
+        return self._execute(PROBLEM_DIRECT, method, ellipsoid_name,
+                             (lon_initial, lat_initial, azimuth_initial, distance), (q, q, q, self.distance_quantum),
+                             lambda *args: direct_solution_batch(*args, ellipsoid_name, method), 2)
+
+    def inverse_batch(self, lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name):
+        """ Cached version of ellipsoid_calc.vincenty_inverse_solution_batch.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :return distance, azimuth_initial, azimuth_reverse: ndarray, ndarray, ndarray
+                distances in meters and azimuths in decimal degrees format, NaN where the solution
+                does not converge
+        """
+        q = self.angle_quantum
+        return self._execute(PROBLEM_INVERSE, METHOD_VINCENTY, ellipsoid_name,
+                             (lon_initial, lat_initial, lon_end, lat_end), (q, q, q, q),
+                             lambda *args: vincenty_inverse_solution_batch(*args, ellipsoid_name), 3)
+
+    def distance_batch(self, lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name, method=METHOD_VINCENTY):
+        """ Cached version of ellipsoid_calc.geodesic_distance_batch. Vincenty distances share entries
+        with inverse_batch.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+        :param method: str, method, e.g. METHOD_SPHERICAL
+        :return: ndarray, distances; meters. NaN where Vincenty solution does not converge.
+        """
+        if method == METHOD_VINCENTY:
+            return self.inverse_batch(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name)[0]
+        q = self.angle_quantum
+        return self._execute(PROBLEM_INVERSE, method, ellipsoid_name,
+                             (lon_initial, lat_initial, lon_end, lat_end), (q, q, q, q),
+                             lambda *args: (geodesic_distance_batch(*args, ellipsoid_name, method), ), 1)[0]
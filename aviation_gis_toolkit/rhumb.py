@@ -0,0 +1,232 @@
+"""
+rhumb.py
+rhumb module provides functionality to solve direct and inverse problem for rhumb lines (loxodromes) - lines
+of constant azimuth on the ellipsoid, and to compute isometric latitude.
+"""
+import math
+
+import numpy as np
+
+from .ellipsoid_calc import _sin_series, get_geodesic
+
+# Rhumb lines with smaller latitude difference use mean radius of the parallel instead of divided difference
+# of the meridian distance and isometric latitude, which loses precision for nearly east-west lines; radians
+RHUMB_LATITUDE_THRESHOLD = 5e-6
+
+
+class Rhumb:
+    """ Class keeps the constants of the rhumb lines derived from the ellipsoid of the geodesic and solves
+    rhumb line problems on that ellipsoid. Instances for the registered ellipsoids are created once and cached,
+    use get_rhumb to obtain them.
+    Attributes:
+    -----------
+    geodesic : Geodesic
+        Geodesic of the ellipsoid.
+    e : float
+        First eccentricity of the ellipsoid.
+    meridian_scale : float
+        Ratio of the meridian distance to the rectifying latitude; meters.
+    """
+
+    def __init__(self, geodesic):
+        self.geodesic = geodesic
+        a, f = geodesic.a, geodesic.f
+        n = f / (2 - f)
+        n2, n3, n4 = n * n, n ** 3, n ** 4
+        self.e = math.sqrt(f * (2 - f))
+        # Meridian distance M = meridian_scale * rectifying latitude, series of the rectifying latitude in terms
+        # of the latitude and of the latitude in terms of the rectifying latitude
+        self.meridian_scale = a / (1 + n) * (1 + n2 / 4 + n4 / 64)
+        self._rectifying_coeffs = [-3 / 2 * n + 9 / 16 * n3,
+                                   15 / 16 * n2 - 15 / 32 * n4,
+                                   -35 / 48 * n3,
+                                   315 / 512 * n4]
+        self._rectifying_to_geodetic_coeffs = [3 / 2 * n - 27 / 32 * n3,
+                                               21 / 16 * n2 - 55 / 32 * n4,
+                                               151 / 96 * n3,
+                                               1097 / 512 * n4]
+
+    def __repr__(self):
+        return 'Rhumb({!r})'.format(self.geodesic)
+
+    def _rectifying_latitude(self, phi):
+        """ Returns rectifying latitude, meridian distance from the equator divided by meridian_scale. """
+        return phi + _sin_series(np.sin(phi), np.cos(phi), self._rectifying_coeffs)
+
+    def _isometric_latitude(self, phi):
+        """ Returns isometric latitude, the latitude coordinate of Mercator projection of the ellipsoid. """
+        return np.arcsinh(np.tan(phi)) - self.e * np.arctanh(self.e * np.sin(phi))
+
+    def isometric_latitude(self, lat):
+        """ Computes isometric latitude, it grows linearly with longitude along rhumb lines.
+        :param lat: float or array_like, latitudes in decimal degrees format
+        :return: float or ndarray, isometric latitudes
+        """
+        return self._isometric_latitude(np.radians(lat))
+
+    def _parallel_scale(self, phi1, phi2, mu1, mu2):
+        """ Returns ratio of the meridian distance difference to the isometric latitude difference between points
+        of the rhumb line, i.e. the mean radius of the parallels crossed by the line; meters.
+        """
+        phi_mean = (phi1 + phi2) / 2
+        sin_phi = np.sin(phi_mean)
+        radius = self.geodesic.a * np.cos(phi_mean) / np.sqrt(1 - self.e * self.e * sin_phi * sin_phi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = (mu2 - mu1) * self.meridian_scale / (self._isometric_latitude(phi2) -
+                                                         self._isometric_latitude(phi1))
+        return np.where(np.fabs(phi2 - phi1) < RHUMB_LATITUDE_THRESHOLD, radius, ratio)
+
+    def direct(self, lon_initial, lat_initial, azimuth, distance):
+        """ Computes the end point of the rhumb line (loxodrome) - line of constant azimuth, see direct_batch.
+        :param lon_initial: float, longitude of the initial point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param azimuth: float, azimuth of the rhumb line in decimal degrees format
+        :param distance: float, distance from the initial point to the end point; meters
+        :return lon_end, lat_end: float, float longitude and latitude of the end point in decimal degrees format.
+                If the rhumb line passes the pole returns None.
+        """
+        lon_end, lat_end = self.direct_batch(lon_initial, lat_initial, azimuth, distance)
+        if math.isnan(lat_end):
+            return None
+        return float(lon_end), float(lat_end)
+
+    def direct_batch(self, lon_initial, lat_initial, azimuth, distance):
+        """ Computes the end points of rhumb lines (loxodromes) - lines of constant azimuth, arguments are broadcast
+        against each other. Meridian distance of the end point follows from the distance along the line,
+        its latitude from the series of the rectifying latitude. Longitude difference is the distance along
+        the parallels divided by their mean radius.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param azimuth: float or array_like, azimuths of the rhumb lines in decimal degrees format
+        :param distance: float or array_like, distances from the initial points to the end points; meters
+        :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                                  format, shape is the broadcast shape of the arguments. Elements for which the
+                                  rhumb line passes the pole are NaN.
+        """
+        lon1 = np.asarray(lon_initial, dtype=np.float64)
+        phi1 = np.radians(lat_initial)
+        alfa = np.radians(azimuth)
+        distance = np.asarray(distance, dtype=np.float64)
+
+        mu1 = self._rectifying_latitude(phi1)
+        mu2 = mu1 + distance * np.cos(alfa) / self.meridian_scale
+        phi2 = mu2 + _sin_series(np.sin(mu2), np.cos(mu2), self._rectifying_to_geodetic_coeffs)
+        # Newton step on the rectifying latitude removes truncation error of the series
+        sin_phi2 = np.sin(phi2)
+        e_sq = self.e * self.e
+        phi2 -= (self._rectifying_latitude(phi2) - mu2) * self.meridian_scale * \
+            (1 - e_sq * sin_phi2 * sin_phi2) ** 1.5 / (self.geodesic.a * (1 - e_sq))
+        # Rhumb line spirals into the pole, it can not be continued beyond it
+        phi2 = np.where(np.fabs(mu2) > math.pi / 2, np.nan, phi2)
+        lon2 = lon1 + np.degrees(distance * np.sin(alfa) / self._parallel_scale(phi1, phi2, mu1, mu2))
+        return (lon2 + 180) % 360 - 180, np.degrees(phi2)
+
+    def inverse(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Computes the distance and the azimuth of the rhumb line (loxodrome) between two points,
+        see inverse_batch.
+        :param lon_initial: float, longitude of the initial point in decimal degrees format
+        :param lat_initial: float, latitude of the initial point in decimal degrees format
+        :param lon_end: float, longitude of the end point in decimal degrees format
+        :param lat_end: float, latitude of the end point in decimal degrees format
+        :return distance, azimuth, azimuth_reverse: float, float, float distance between points in meters,
+                azimuth of the rhumb line and azimuth from the end point to the initial point in decimal degrees
+                format <0, 360)
+        """
+        distance, azimuth, azimuth_reverse = self.inverse_batch(lon_initial, lat_initial, lon_end, lat_end)
+        return float(distance), float(azimuth), float(azimuth_reverse)
+
+    def inverse_batch(self, lon_initial, lat_initial, lon_end, lat_end):
+        """ Computes the distances and the azimuths of the rhumb lines (loxodromes) between points,
+        arguments are broadcast against each other. Rhumb line is the shorter one, it does not cross
+        the antimeridian unless the longitude difference exceeds 180 degrees.
+        :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+        :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+        :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+        :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+        :return distance, azimuth, azimuth_reverse: ndarray, ndarray, ndarray distances in meters, azimuths of the
+                rhumb lines and azimuths from the end points to the initial points in decimal degrees
+                format <0, 360)
+        """
+        phi1 = np.radians(lat_initial)
+        phi2 = np.radians(lat_end)
+        d_lon = np.radians((np.subtract(lon_end, lon_initial) + 180) % 360 - 180)
+
+        mu1 = self._rectifying_latitude(phi1)
+        mu2 = self._rectifying_latitude(phi2)
+        d_meridian = (mu2 - mu1) * self.meridian_scale
+        d_parallel = d_lon * self._parallel_scale(phi1, phi2, mu1, mu2)
+
+        distance = np.hypot(d_meridian, d_parallel)
+        azimuth = np.degrees(np.arctan2(d_parallel, d_meridian)) % 360
+        return distance, azimuth, (azimuth + 180) % 360
+
+
+# Rhumb instances of the registered ellipsoids, created on first use
+_rhumbs = {}
+
+
+def get_rhumb(ellipsoid_name):
+    """ Returns cached Rhumb instance for the registered ellipsoid, it is recreated if the ellipsoid
+    is registered again.
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return: Rhumb
+    """
+    geodesic = get_geodesic(ellipsoid_name)
+    rhumb = _rhumbs.get(ellipsoid_name)
+    if rhumb is None or rhumb.geodesic is not geodesic:
+        rhumb = _rhumbs[ellipsoid_name] = Rhumb(geodesic)
+    return rhumb
+
+
+def rhumb_direct_solution(lon_initial, lat_initial, azimuth, distance, ellipsoid_name):
+    """ Computes the end point of the rhumb line (loxodrome), see Rhumb.direct.
+    :param lon_initial: float, longitude of the initial point in decimal degrees format
+    :param lat_initial: float, latitude of the initial point in decimal degrees format
+    :param azimuth: float, azimuth of the rhumb line in decimal degrees format
+    :param distance: float, distance from the initial point to the end point; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon_end, lat_end: float, float longitude and latitude of the end point in decimal degrees format.
+            If the rhumb line passes the pole returns None.
+    """
+    return get_rhumb(ellipsoid_name).direct(lon_initial, lat_initial, azimuth, distance)
+
+
+def rhumb_direct_solution_batch(lon_initial, lat_initial, azimuth, distance, ellipsoid_name):
+    """ Vectorized version of rhumb_direct_solution, see Rhumb.direct_batch.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param azimuth: float or array_like, azimuths of the rhumb lines in decimal degrees format
+    :param distance: float or array_like, distances from the initial points to the end points; meters
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return lon_end, lat_end: ndarray, ndarray longitudes and latitudes of the end points in decimal degrees
+                              format, NaN if the rhumb line passes the pole
+    """
+    return get_rhumb(ellipsoid_name).direct_batch(lon_initial, lat_initial, azimuth, distance)
+
+
+def rhumb_inverse_solution(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name):
+    """ Computes the distance and the azimuth of the rhumb line (loxodrome) between two points,
+    see Rhumb.inverse.
+    :param lon_initial: float, longitude of the initial point in decimal degrees format
+    :param lat_initial: float, latitude of the initial point in decimal degrees format
+    :param lon_end: float, longitude of the end point in decimal degrees format
+    :param lat_end: float, latitude of the end point in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return distance, azimuth, azimuth_reverse: float, float, float distance between points in meters,
+            azimuth of the rhumb line and azimuth from the end point to the initial point in decimal degrees
+            format <0, 360)
+    """
+    return get_rhumb(ellipsoid_name).inverse(lon_initial, lat_initial, lon_end, lat_end)
+
+
+def rhumb_inverse_solution_batch(lon_initial, lat_initial, lon_end, lat_end, ellipsoid_name):
+    """ Vectorized version of rhumb_inverse_solution, see Rhumb.inverse_batch.
+    :param lon_initial: float or array_like, longitudes of the initial points in decimal degrees format
+    :param lat_initial: float or array_like, latitudes of the initial points in decimal degrees format
+    :param lon_end: float or array_like, longitudes of the end points in decimal degrees format
+    :param lat_end: float or array_like, latitudes of the end points in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :return distance, azimuth, azimuth_reverse: ndarray, ndarray, ndarray distances in meters, azimuths of the
+            rhumb lines and azimuths from the end points to the initial points in decimal degrees format <0, 360)
+    """
+    return get_rhumb(ellipsoid_name).inverse_batch(lon_initial, lat_initial, lon_end, lat_end)
@@ -0,0 +1,194 @@
+"""
+spatial_index.py
+spatial_index module provides spatial index of points (fixes, obstacles) for geodesic radius and k-nearest
+neighbours queries. Index is k-d tree over ECEF coordinates, candidates are screened by chord distance and
+confirmed by exact geodesic distance on the ellipsoid.
+"""
+import json
+import os
+
+import numpy as np
+
+from .ecef import chord_radius, geodetic_to_ecef
+from .ellipsoid_calc import vincenty_inverse_solution_batch
+
+# Default maximum number of points in the leaf node of the index
+INDEX_LEAF_SIZE = 32
+
+# Files of the index saved by SpatialIndex.save
+_INDEX_ARRAYS = ['lon', 'lat', 'xyz', 'order', 'start', 'end', 'bbox_min', 'bbox_max']
+_INDEX_META = 'meta.json'
+
+
+class SpatialIndex:
+    """ Class keeps k-d tree of the points for geodesic radius and k-nearest neighbours queries.
+    Tree is built once for all points (bulk loading) and stored in flat arrays: complete binary tree in which node i
+    has children 2 * i + 1 and 2 * i + 2 and covers points order[start:end] split at the median of the widest
+    dimension. Index can be pickled or saved to directory and loaded with memory mapped arrays.
+    Attributes:
+    -----------
+    ellipsoid_name : str
+        Ellipsoid short name, e.g.: WGS84.
+    lon : ndarray
+        Longitudes of the points in decimal degrees format.
+    lat : ndarray
+        Latitudes of the points in decimal degrees format.
+    xyz : ndarray
+        N x 3 ECEF coordinates of the points, in the order of the tree leaves; meters.
+    order : ndarray
+        Indices of the points in the order of the tree leaves.
+    depth : int
+        Depth of the tree, leaves are at this depth.
+    start : ndarray
+        Start positions of the points of each node in the order array.
+    end : ndarray
+        End positions of the points of each node in the order array.
+    bbox_min : ndarray
+        Minimum ECEF coordinates of the points of each node; meters.
+    bbox_max : ndarray
+        Maximum ECEF coordinates of the points of each node; meters.
+    """
+
+    def __init__(self, lon, lat, ellipsoid_name, leaf_size=INDEX_LEAF_SIZE):
+        self.ellipsoid_name = ellipsoid_name
+        self.lon = np.asarray(lon, dtype=np.float64).ravel()
+        self.lat = np.asarray(lat, dtype=np.float64).ravel()
+        n = len(self.lon)
+        if not n:
+            raise ValueError('Spatial index error. Index requires at least one point.')
+
+        self.depth = max(0, int(np.ceil(np.log2(n / leaf_size))))
+        xyz = np.stack(geodetic_to_ecef(self.lon, self.lat, ellipsoid_name), axis=-1)
+        order = np.arange(n)
+
+        node_count = 2 ** (self.depth + 1) - 1
+        first_leaf = 2 ** self.depth - 1
+        start = np.zeros(node_count, dtype=np.int64)
+        end = np.zeros(node_count, dtype=np.int64)
+        end[0] = n
+        for node in range(first_leaf):
+            s, e = start[node], end[node]
+            m = (s + e) // 2
+            if e - s > 1:
+                points = xyz[order[s:e]]
+                dim = np.argmax(points.max(axis=0) - points.min(axis=0))
+                order[s:e] = order[s:e][np.argpartition(points[:, dim], m - s)]
+            start[2 * node + 1], end[2 * node + 1] = s, m
+            start[2 * node + 2], end[2 * node + 2] = m, e
+
+        self.order = order
+        self.xyz = xyz[order]
+        self.start = start
+        self.end = end
+
+        # Bounding boxes of the leaves, then of the internal nodes bottom up
+        self.bbox_min = np.full((node_count, 3), np.inf)
+        self.bbox_max = np.full((node_count, 3), -np.inf)
+        for node in range(first_leaf, node_count):
+            if end[node] > start[node]:
+                self.bbox_min[node] = self.xyz[start[node]:end[node]].min(axis=0)
+                self.bbox_max[node] = self.xyz[start[node]:end[node]].max(axis=0)
+        for level in range(self.depth - 1, -1, -1):
+            nodes = np.arange(2 ** level - 1, 2 ** (level + 1) - 1)
+            self.bbox_min[nodes] = np.minimum(self.bbox_min[2 * nodes + 1], self.bbox_min[2 * nodes + 2])
+            self.bbox_max[nodes] = np.maximum(self.bbox_max[2 * nodes + 1], self.bbox_max[2 * nodes + 2])
+
+    def __len__(self):
+        return len(self.lon)
+
+    def candidates(self, lon, lat, radius):
+        """ Returns indices of the points which may be within geodesic radius from the query point.
+        Points that are rejected are certainly farther than radius, points returned can be slightly farther.
+        :param lon: float, longitude of the query point in decimal degrees format
+        :param lat: float, latitude of the query point in decimal degrees format
+        :param radius: float, geodesic radius; meters
+        :return: ndarray, indices of the candidate points
+        """
+        query = np.array(geodetic_to_ecef(lon, lat, self.ellipsoid_name))
+        threshold_sq = chord_radius(radius) ** 2
+
+        # Descend the tree level by level, keeping nodes which bounding boxes are within threshold
+        nodes = np.zeros(1, dtype=np.int64)
+        for level in range(self.depth + 1):
+            gap = np.maximum(0, np.maximum(self.bbox_min[nodes] - query, query - self.bbox_max[nodes]))
+            nodes = nodes[np.einsum('ij,ij->i', gap, gap) <= threshold_sq]
+            if level < self.depth:
+                nodes = np.stack([2 * nodes + 1, 2 * nodes + 2], axis=-1).ravel()
+
+        positions = np.concatenate([np.arange(self.start[node], self.end[node]) for node in nodes] or
+                                   [np.zeros(0, dtype=np.int64)])
+        diff = self.xyz[positions] - query
+        positions = positions[np.einsum('ij,ij->i', diff, diff) <= threshold_sq]
+        return self.order[positions]
+
+    def query_radius(self, lon, lat, radius):
+        """ Returns points within geodesic radius from the query point sorted by distance.
+        :param lon: float, longitude of the query point in decimal degrees format
+        :param lat: float, latitude of the query point in decimal degrees format
+        :param radius: float, geodesic radius; meters
+        :return indices, distances: ndarray, ndarray indices of the points and geodesic distances to them; meters
+        """
+        indices = self.candidates(lon, lat, radius)
+        distances = vincenty_inverse_solution_batch(lon, lat, self.lon[indices], self.lat[indices],
+                                                    self.ellipsoid_name)[0]
+        inside = distances <= radius
+        indices, distances = indices[inside], distances[inside]
+        sort = np.argsort(distances, kind='stable')
+        return indices[sort], distances[sort]
+
+    def query_knn(self, lon, lat, k):
+        """ Returns k points nearest to the query point by geodesic distance, sorted by distance.
+        :param lon: float, longitude of the query point in decimal degrees format
+        :param lat: float, latitude of the query point in decimal degrees format
+        :param k: int, number of points, if it exceeds number of the points of the index all points are returned
+        :return indices, distances: ndarray, ndarray indices of the points and geodesic distances to them; meters
+        """
+        k = min(k, len(self))
+        if k < 1:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        # Descend to the leaf of the query point, then go up to the first node with at least k points.
+        # Geodesic distance to the k-th nearest point of that node is an upper bound of the k-th distance
+        query = np.array(geodetic_to_ecef(lon, lat, self.ellipsoid_name))
+        node = 0
+        for _ in range(self.depth):
+            left, right = 2 * node + 1, 2 * node + 2
+            gap_left = np.maximum(0, np.maximum(self.bbox_min[left] - query, query - self.bbox_max[left]))
+            gap_right = np.maximum(0, np.maximum(self.bbox_min[right] - query, query - self.bbox_max[right]))
+            node = left if gap_left @ gap_left <= gap_right @ gap_right else right
+        while self.end[node] - self.start[node] < k:
+            node = (node - 1) // 2
+        start, end = self.start[node], self.end[node]
+
+        diff = self.xyz[start:end] - query
+        nearest = self.order[start:end][np.argpartition(np.einsum('ij,ij->i', diff, diff), k - 1)[:k]]
+        distances = vincenty_inverse_solution_batch(lon, lat, self.lon[nearest], self.lat[nearest],
+                                                    self.ellipsoid_name)[0]
+        indices, distances = self.query_radius(lon, lat, np.nanmax(distances))
+        return indices[:k], distances[:k]
+
+    def save(self, path):
+        """ Saves index to directory, arrays are saved as .npy files, so they can be memory mapped by load.
+        :param path: str, path to the directory, it is created if it does not exist
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in _INDEX_ARRAYS:
+            np.save(os.path.join(path, name + '.npy'), getattr(self, name))
+        with open(os.path.join(path, _INDEX_META), 'w') as f:
+            json.dump({'ellipsoid_name': self.ellipsoid_name, 'depth': self.depth}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """ Loads index saved by save method.
+        :param path: str, path to the directory of the index
+        :param mmap: bool, True if arrays should be memory mapped instead of read into memory
+        :return: SpatialIndex
+        """
+        index = cls.__new__(cls)
+        with open(os.path.join(path, _INDEX_META)) as f:
+            meta = json.load(f)
+        index.ellipsoid_name = meta['ellipsoid_name']
+        index.depth = meta['depth']
+        for name in _INDEX_ARRAYS:
+            setattr(index, name, np.load(os.path.join(path, name + '.npy'), mmap_mode='r' if mmap else None))
+        return index
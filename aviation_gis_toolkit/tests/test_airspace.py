@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.airspace import *
+
+
+class AirspaceTests(unittest.TestCase):
+
+    def test_contains(self):
+        # Edges along the parallels: rhumb lines follow the parallels, geodesics bulge towards the pole
+        lon, lat = [-60, 60, 60, -60], [50, 50, 40, 40]
+        rhumb = AirspacePolygon(lon, lat, 'WGS84', EDGE_RHUMB)
+        geodesic = AirspacePolygon(lon + [-60], lat + [50], 'WGS84')
+        self.assertEqual(4, len(geodesic))
+        self.assertAlmostEqual(67.2667338, geodesic.bbox[3], places=6)
+        self.assertEqual([True, False, False, False], list(rhumb.contains([0, 0, 0, 70], [49.9, 50.1, 60, 45])))
+        # On the central meridian the edges reach 67.2667338 and 59.2647767
+        self.assertEqual([False, False, True, True, False],
+                         list(geodesic.contains([0, 0, 0, 0, 70], [49.9, 59.26, 59.27, 67.26, 45])))
+        self.assertFalse(geodesic.contains(0, 67.27))
+        # Points on the south edge
+        self.assertEqual([True, False], list(rhumb.contains(0, [40.000001, 39.999999])))
+
+        # Mixed edges: geodesic to the north, rhumb lines elsewhere, shape of the points is kept
+        mixed = AirspacePolygon(lon, lat, 'WGS84', [EDGE_GEODESIC, EDGE_RHUMB, EDGE_RHUMB, EDGE_RHUMB])
+        self.assertEqual([[True, True], [True, False]],
+                         mixed.contains([[0, 0], [0, 0]], [[50.1, 67.26], [40.1, 39.9]]).tolist())
+
+        with self.assertRaises(ValueError):
+            AirspacePolygon([0, 1], [0, 1], 'WGS84')
+        with self.assertRaises(ValueError):
+            AirspacePolygon(lon, lat, 'WGS84', 'EDGE_PARALLEL')
+        # Geodesic edge between nearly antipodal vertices
+        with self.assertRaises(ValueError):
+            AirspacePolygon([0, 179.7, 90], [0, 0.3, 45], 'WGS84')
+
+    def test_contains_antimeridian(self):
+        polygon = AirspacePolygon([170, -170, -160, 175], [-10, -15, 5, 10], 'WGS84')
+        self.assertEqual((170.0, -160.0), (polygon.bbox[0], polygon.bbox[2]))
+        self.assertEqual([True, True, True, False, False],
+                         polygon.contains([180, -180, 179, 0, 169], [0, 0, 0, 0, 0]).tolist())
+
+    def test_contains_pole(self):
+        # Boundary circling around the pole
+        north = AirspacePolygon(np.arange(-180, 180, 30), np.full(12, 70), 'WGS84')
+        south = AirspacePolygon(np.arange(180, -180, -30), np.full(12, -75), 'WGS84', EDGE_RHUMB)
+        self.assertTrue(north.north_pole_inside)
+        self.assertTrue(south.south_pole_inside)
+        self.assertEqual([True, True, False, False], north.contains([0, 123, 15, 0], [90, 80, 69.9, -80]).tolist())
+        self.assertEqual([True, True, False], south.contains([0, 15, 0], [-90, -75.1, -74.9]).tolist())
+
+        # Sector with vertex at the pole
+        sector = AirspacePolygon([0, 0, 90], [60, 90, 60], 'WGS84')
+        self.assertFalse(sector.north_pole_inside)
+        self.assertEqual((0.0, 90.0), (sector.bbox[0], sector.bbox[2]))
+        self.assertEqual([True, True, False, False], sector.contains([45, 1, -1, 91], [89.9, 80, 80, 80]).tolist())
+
+    def test_contains_batch(self):
+        polygons = [AirspacePolygon([10, 20, 20, 10], [40, 40, 50, 50], 'WGS84'),
+                    AirspacePolygon([15, 25, 25, 15], [45, 45, 55, 55], 'WGS84')]
+        result = contains_batch(polygons, [12, 17, 22, 30], [42, 47, 52, 47])
+        self.assertEqual([[True, True, False, False], [False, True, True, False]], result.tolist())
+
+
+    def test_polygon_area_perimeter_batch(self):
+        # 1 x 1 degree box, box across the antimeridian, octagon around the north pole, empty polygon,
+        # quadrilateral of about 1 km across
+        lon = [20, 21, 21, 20, 170, -170, -170, 170] + list(range(0, 360, 45)) + [16.95, 16.965, 16.96, 16.945]
+        lat = [50, 50, 51, 51, -10, -10, 10, 10] + [80] * 8 + [52.4, 52.401, 52.41, 52.408]
+        offsets = [0, 4, 8, 16, 16, 20]
+        area, perimeter = polygon_area_perimeter_batch(lon, lat, offsets, 'WGS84')
+        # Reference values: GeographicLib PolygonArea, a = 6378137 m, f = 1 / 298.25722210088
+        expected_area = [7892061583.255371, 4948480469011.217, 3526764054479.0625, 0, 1022362.3442983627]
+        expected_perimeter = [364369.7208805777, 8808314.462128915, 6808607.440774267, 0, 4082.4619785094474]
+        np.testing.assert_allclose(area, expected_area, rtol=0, atol=0.1)
+        np.testing.assert_allclose(perimeter, expected_perimeter, rtol=1e-10, atol=1e-5)
+
+        # Orientation and closing vertex do not change the results
+        lon_reversed, lat_reversed = lon[3::-1] + [lon[3]], lat[3::-1] + [lat[3]]
+        area_reversed, perimeter_nm = polygon_area_perimeter_batch(lon_reversed, lat_reversed, [0, 5], 'WGS84',
+                                                                   UOM_NM)
+        self.assertAlmostEqual(area[0], area_reversed[0], delta=0.1)
+        self.assertAlmostEqual(364369.7208805777 / 1852, perimeter_nm[0], places=6)
+
+        with self.assertRaises(ValueError):
+            polygon_area_perimeter_batch(lon, lat, [0, 4, 21], 'WGS84')
+        with self.assertRaises(ValueError):
+            polygon_area_perimeter_batch(lon, lat, offsets, 'WGS84', 'X')
+        # Geodesic edge between nearly antipodal vertices
+        with self.assertRaises(ValueError):
+            polygon_area_perimeter_batch([0, 179.7, 90], [0, 0.3, 45], [0, 3], 'WGS84')
+
+
+if __name__ == '__main__':
+    unittest.main()
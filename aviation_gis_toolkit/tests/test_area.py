@@ -0,0 +1,34 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.area import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class AreaTests(unittest.TestCase):
+
+    def test_inverse_area(self):
+        geodesic_area = get_geodesic_area('WGS84')
+        self.assertAlmostEqual(510065621718490.8, geodesic_area.area, delta=1)
+        distance, area = geodesic_area.inverse_area_batch([0, 0, 10, 10], [0, 0, 40, 40], [10, 0, 20, 10],
+                                                          [0, 0, 40, 40])
+        # Edge along the equator and coincident points bound no area
+        self.assertEqual(0, area[1])
+        self.assertAlmostEqual(0, area[0], delta=0.1)
+        # Reversed edge has the opposite area
+        self.assertEqual(0, area[3])
+        reverse = geodesic_area.inverse_area_batch(20, 40, 10, 40)[1]
+        self.assertAlmostEqual(1, -reverse / area[2], places=12)
+        self.assertGreater(area[2], 0)
+
+        # Reference values: GeographicLib, a = 6378137 m, f = 1 / 298.25722210088, edges of 1, 850 and 680 km
+        area = geodesic_area.inverse_area_batch([16.95, 10, -75], [52.4, 40, -30], [16.965, 20, -70],
+                                                [52.401, 40, -34.5])[1]
+        np.testing.assert_allclose(area, [8405154350.915134, 4548515739324.24, -1886407926844.68], rtol=0, atol=0.1)
+        # Edges of 16680 and 19287 km, the latter nearly antipodal, rounding errors of the longitude difference grow
+        area = geodesic_area.inverse_area_batch([0, -75], [10, -30], [150, 100], [-5, 35])[1]
+        self.assertAlmostEqual(13336768120255.91, area[0], delta=0.5)
+        self.assertAlmostEqual(72886563561694.4, area[1], delta=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
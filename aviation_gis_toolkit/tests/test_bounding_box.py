@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.bounding_box import *
+from aviation_gis_toolkit.const import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class BoundingBoxTests(unittest.TestCase):
+
+    def test_geodesic_circle_bbox(self):
+        rng = np.random.default_rng(31)
+        lon = rng.uniform(-180, 180, 300)
+        lat = rng.uniform(-89.9, 89.9, 300)
+        radius = np.exp(rng.uniform(np.log(10), np.log(5000000), 300))
+        lon_west, lat_south, lon_east, lat_north = geodesic_circle_bbox(lon, lat, radius, 'WGS84')
+
+        # Circles sampled densely are inside the boxes and touch them
+        azimuth = np.linspace(0, 360, 3601)
+        lon_circle, lat_circle = vincenty_direct_solution_batch(lon[:, np.newaxis], lat[:, np.newaxis], azimuth,
+                                                                radius[:, np.newaxis], 'WGS84')
+        self.assertTrue(np.all(in_bbox(lon_circle, lat_circle, lon_west[:, np.newaxis], lat_south[:, np.newaxis],
+                                       lon_east[:, np.newaxis], lat_north[:, np.newaxis])))
+        pole = (lat_north == 90) | (lat_south == -90)
+        self.assertTrue(np.allclose(lat_circle.max(axis=1)[~pole], lat_north[~pole], rtol=0, atol=1e-8))
+        self.assertTrue(np.allclose(lat_circle.min(axis=1)[~pole], lat_south[~pole], rtol=0, atol=1e-8))
+        d_lon = np.fabs((lon_circle - lon[:, np.newaxis] + 180) % 360 - 180).max(axis=1)
+        d_lon_east = (lon_east - lon + 180) % 360 - 180
+        self.assertTrue(np.allclose(d_lon[~pole], d_lon_east[~pole], rtol=0, atol=1e-4))
+
+    def test_geodesic_circle_bbox_special_cases(self):
+        # Antimeridian
+        lon_west, lat_south, lon_east, lat_north = geodesic_circle_bbox(179.9, 0.0, 50, 'WGS84', UOM_NM)
+        self.assertGreater(lon_west, lon_east)
+        # On the equator the easternmost point lies on the equator
+        d_lon = np.degrees(50 * 1852 / 6378137.0)
+        self.assertAlmostEqual(179.9 - d_lon, float(lon_west), places=8)
+        self.assertAlmostEqual(179.9 + d_lon - 360, float(lon_east), places=8)
+        self.assertTrue(in_bbox(-179.5, 0.5, lon_west, lat_south, lon_east, lat_north))
+        self.assertFalse(in_bbox(179.0, 0.5, lon_west, lat_south, lon_east, lat_north))
+
+        # Circle containing the pole
+        self.assertEqual((-180.0, 90.0), tuple(float(v) for v in geodesic_circle_bbox(0.0, 89.5, 100, 'WGS84',
+                                                                                      UOM_KM)[::3]))
+        lon_west, lat_south, lon_east, lat_north = geodesic_circle_bbox(45.0, -89.0, [100.0, 200.0], 'WGS84',
+                                                                        UOM_KM)
+        self.assertEqual([False, True], list(lat_south == -90.0))
+        self.assertEqual(180.0, lon_east[1])
@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.datum import *
+
+
+class DatumTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(23)
+        self.lon = rng.uniform(-180, 180, 2000)
+        self.lat = rng.uniform(-89, 89, 2000)
+        self.height = rng.uniform(-100, 5000, 2000)
+
+    def test_transform_datum(self):
+        # Standard WGS72 -> WGS84 shift formulae (NIMA TR8350.2), arc seconds and meters
+        lon, lat, height = transform_datum(self.lon, self.lat, 'WGS72', 'WGS84', self.height)
+        phi = np.radians(self.lat)
+        arc_second = np.radians(1 / 3600)
+        d_lat = 4.5 * np.cos(phi) / (6378135 * arc_second) + 0.3121057e-7 * np.sin(2 * phi) / arc_second
+        d_height = 4.5 * np.sin(phi) + 6378135 * 0.3121057e-7 * np.sin(phi) ** 2 - 2.0 + 1.4
+        d_lon = ((lon - self.lon + 180) % 360 - 180) * 3600
+        self.assertTrue(np.allclose(d_lon, 0.554, rtol=0, atol=1e-6))
+        self.assertTrue(np.allclose((lat - self.lat) * 3600, d_lat, rtol=0, atol=2e-3))
+        self.assertTrue(np.allclose(height - self.height, d_height, rtol=0, atol=0.1))
+
+        # Inverse transformation returns the source coordinates
+        lon_r, lat_r, height_r = transform_datum(lon, lat, 'WGS84', 'WGS72', height)
+        self.assertTrue(np.allclose((lon_r - self.lon + 180) % 360 - 180, 0, rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose(lat_r, self.lat, rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose(height_r, self.height, rtol=0, atol=1e-6))
+
+    def test_molodensky(self):
+        lon_h, lat_h, height_h = transform_datum(self.lon, self.lat, 'WGS72', 'WGS84', self.height)
+        lon_m, lat_m, height_m = transform_datum(self.lon, self.lat, 'WGS72', 'WGS84', self.height,
+                                                 method=DATUM_MOLODENSKY)
+        self.assertTrue(np.allclose((lon_m - lon_h + 180) % 360 - 180, 0, rtol=0, atol=1e-9))
+        self.assertTrue(np.allclose(lat_m, lat_h, rtol=0, atol=1e-9))
+        self.assertTrue(np.allclose(height_m, height_h, rtol=0, atol=1e-3))
+
+        with self.assertRaises(ValueError):
+            transform_datum(0.0, 0.0, 'WGS72', 'WGS84', method='DATUM_UNKNOWN')
+
+    def test_transform_datum_chunks(self):
+        lon, lat, height = transform_datum(self.lon, self.lat, 'WGS72', 'WGS84', self.height)
+        chunks = ((self.lon[i:i + 300], self.lat[i:i + 300], self.height[i:i + 300]) for i in range(0, 2000, 300))
+        result = list(transform_datum_chunks(chunks, 'WGS72', 'WGS84'))
+        self.assertEqual(7, len(result))
+        self.assertTrue(np.array_equal(lon, np.concatenate([r[0] for r in result])))
+        self.assertTrue(np.array_equal(lat, np.concatenate([r[1] for r in result])))
+        self.assertTrue(np.array_equal(height, np.concatenate([r[2] for r in result])))
+
+    def test_register_datum_transformation(self):
+        with self.assertRaises(ValueError):
+            register_datum_transformation('WGS72', 'XXX', helmert_parameters(0, 0, 0, 0, 0, 0, 0))
+        # Transformation with zero parameters between the same ellipsoid is identity
+        register_datum_transformation('WGS84', 'WGS84', helmert_parameters(0, 0, 0, 0, 0, 0, 0))
+        try:
+            lon, lat, height = transform_datum(self.lon, self.lat, 'WGS84', 'WGS84', self.height,
+                                               method=DATUM_MOLODENSKY)
+            self.assertTrue(np.allclose(lat, self.lat, rtol=0, atol=1e-12))
+            self.assertTrue(np.allclose(height, self.height, rtol=0, atol=1e-9))
+        finally:
+            del datum_transformations[('WGS84', 'WGS84')]
+
+if __name__ == '__main__':
+    unittest.main()
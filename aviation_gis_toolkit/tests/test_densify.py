@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.densify import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class DensifyTests(unittest.TestCase):
+
+    def test_densify_batch(self):
+        # Edge along the parallel 60 (geodesic bulges north), short edge, one vertex polyline, empty polyline,
+        # edge across the antimeridian
+        lon = [0, 40, 40.01, 10, 179, -179]
+        lat = [60, 60, 60, 10, 50, 50]
+        offsets = [0, 3, 4, 4, 6]
+        tolerance = 100.0
+        lon_d, lat_d, offsets_d = densify_batch(lon, lat, offsets, tolerance, 'WGS84')
+        self.assertEqual(0, offsets_d[0])
+        self.assertEqual(len(lon_d), offsets_d[-1])
+        self.assertEqual([1, 0], list(np.diff(offsets_d)[1:3]))
+
+        # Original vertices are kept in order, short edge is not densified
+        first = slice(offsets_d[0], offsets_d[1])
+        self.assertEqual([0, 40, 40.01], list(lon_d[first][[0, -2, -1]]))
+        self.assertTrue(np.all(np.diff(lon_d[first]) > 0))
+        self.assertTrue(np.all(lat_d[first][1:-2] > 60))
+
+        # Deviation of the geodesic from the straight segments, sampled densely: distance along the meridian
+        # from the geodesic point to the straight segment is not less than the deviation
+        lon0, lat0, lon1, lat1 = lon_d[first][:-1], lat_d[first][:-1], lon_d[first][1:], lat_d[first][1:]
+        distance, azimuth, _ = vincenty_inverse_solution_batch(lon0, lat0, lon1, lat1, 'WGS84')
+        t = np.linspace(0, 1, 129)[1:-1, np.newaxis]
+        lon_s, lat_s = vincenty_direct_solution_batch(lon0, lat0, azimuth, distance * t, 'WGS84')
+        lat_segment = lat0 + (lat1 - lat0) * (lon_s - lon0) / (lon1 - lon0)
+        deviation = vincenty_inverse_solution_batch(lon_s, lat_s, lon_s, lat_segment, 'WGS84')[0]
+        self.assertLessEqual(np.max(deviation), tolerance)
+        # Geodesic bulges by 256 km, deviation falls with the square of the number of segments: at least 51 segments
+        # are needed, bisection gives 64
+        self.assertEqual(66, offsets_d[1] - offsets_d[0])
+
+        last = lon_d[offsets_d[3]:offsets_d[4]]
+        self.assertEqual((179, -179), (last[0], last[-1]))
+        self.assertTrue(np.all(np.fabs(last) >= 179))
+
+    def test_densify_batch_tolerance(self):
+        # Random edges sampled densely, deviation is the distance along the meridian to the straight segment
+        # reduced to the normal of the segment
+        rng = np.random.default_rng(24)
+        lon = rng.uniform(-150, 150, 400)
+        lat = rng.uniform(-80, 80, 400)
+        lon[1::2] = lon[::2] + rng.uniform(-30, 30, 200)
+        lat[1::2] = np.clip(lat[::2] + rng.uniform(-20, 20, 200), -80, 80)
+        tolerance = 100.0
+        lon_d, lat_d, offsets_d = densify_batch(lon, lat, np.arange(0, 401, 2), tolerance, 'WGS84')
+
+        segment = np.ones(len(lon_d) - 1, dtype=bool)
+        segment[offsets_d[1:-1] - 1] = False
+        lon0, lat0, lon1, lat1 = lon_d[:-1][segment], lat_d[:-1][segment], lon_d[1:][segment], lat_d[1:][segment]
+        distance, azimuth, _ = vincenty_inverse_solution_batch(lon0, lat0, lon1, lat1, 'WGS84')
+        t = np.linspace(0, 1, 129)[1:-1, np.newaxis]
+        lon_s, lat_s = vincenty_direct_solution_batch(lon0, lat0, azimuth, distance * t, 'WGS84')
+        lat_segment = lat0 + (lat1 - lat0) * (lon_s - lon0) / (lon1 - lon0)
+        deviation = vincenty_inverse_solution_batch(lon_s, lat_s, lon_s, lat_segment, 'WGS84')[0] * \
+            np.fabs(np.sin(np.radians(azimuth)))
+        self.assertLessEqual(np.max(deviation), tolerance)
+
+        # Edge between nearly antipodal vertices
+        with self.assertRaises(ValueError):
+            densify_batch([0, 179.7], [0, 0.3], [0, 2], tolerance, 'WGS84')
+
+    def test_densify_batch_inflection(self):
+        # Geodesic crossing the equator is S-shaped in longitude/latitude, midpoint lies on the straight segment
+        lon, lat, offsets = densify_batch([-60, 60], [-30, 30], [0, 2], 1, 'WGS84', UOM_KM)
+        self.assertGreater(len(lon), 20)
+        self.assertEqual([0, len(lon)], list(offsets))
+
+    def test_densify_batch_projection(self):
+        def projection(lon, lat):
+            return np.radians(lon) * 6378137.0, np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * 6378137.0
+
+        lon, lat, offsets = densify_batch([0, 40], [60, 60], [0, 2], 50.0, 'WGS84')
+        lon_p, lat_p, offsets_p = densify_batch([0, 40], [60, 60], [0, 2], 50.0, 'WGS84', projection=projection)
+        # Mercator projection doubles distances at latitude 60
+        self.assertGreater(len(lon_p), len(lon))
+
+        with self.assertRaises(ValueError):
+            densify_batch([0, 40], [60, 60], [0, 2], 0, 'WGS84')
+        with self.assertRaises(ValueError):
+            densify_batch([0, 40], [60, 60], [0, 3], 100.0, 'WGS84')
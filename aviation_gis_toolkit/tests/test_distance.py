@@ -1,5 +1,6 @@
 import unittest
-from aviation_gis_toolkit.distance import Distance
+import numpy as np
+from aviation_gis_toolkit.distance import Distance, convert_dist_batch_to_m
 from aviation_gis_toolkit.const import *
 
 
@@ -215,3 +216,16 @@ class DistanceTests(unittest.TestCase):
         d2 = Distance('2755', UOM_FT)
         d1 = Distance('839.7241')
         self.assertFalse(d1 < d2)
+
+    def test_convert_dist_batch_to_m(self):
+        self.assertTrue(np.array_equal([1852.0, 3704.0], convert_dist_batch_to_m([1, 2], UOM_NM)))
+        self.assertTrue(np.array_equal([1000.0, 0.3048, 1609.344, 5.0],
+                                       convert_dist_batch_to_m([1, 1, 1, 5], [UOM_KM, UOM_FT, UOM_SM, UOM_M])))
+        for uom in UOM_LIST:
+            self.assertEqual(Distance(2.5, uom).convert_dist_to_m(), convert_dist_batch_to_m(2.5, uom))
+        with self.assertRaises(ValueError):
+            convert_dist_batch_to_m([1, 2], 'mi')
+        with self.assertRaises(ValueError):
+            convert_dist_batch_to_m([1, 2], [UOM_M, 'mi'])
+        with self.assertRaises(ValueError):
+            convert_dist_batch_to_m([1, -2], UOM_M)
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.ecef import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class EcefTests(unittest.TestCase):
+
+    def test_geodetic_to_ecef(self):
+        x, y, z = geodetic_to_ecef(0.0, 0.0, 'WGS84')
+        self.assertEqual((6378137.0, 0.0, 0.0), (float(x), float(y), float(z)))
+        x, y, z = geodetic_to_ecef(90.0, 90.0, 'WGS84', height=100.0)
+        self.assertAlmostEqual(0.0, float(x), places=6)
+        self.assertAlmostEqual(0.0, float(y), places=6)
+        self.assertAlmostEqual(6356852.3141, float(z), places=6)
+
+        rng = np.random.default_rng(17)
+        lon = rng.uniform(-180, 180, 1000)
+        lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 1000)))
+        height = rng.uniform(-500, 20000, 1000)
+        lon_r, lat_r, height_r = ecef_to_geodetic(*geodetic_to_ecef(lon, lat, 'WGS72', height), 'WGS72')
+        self.assertTrue(np.allclose(lon, lon_r, rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose(lat, lat_r, rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose(height, height_r, rtol=0, atol=1e-6))
+
+    def test_chord_prefilter(self):
+        rng = np.random.default_rng(19)
+        lon = rng.uniform(-180, 180, 5000)
+        lat = rng.uniform(-89, 89, 5000)
+        scale = np.exp(rng.uniform(-12, 2, 5000))
+        lon_end = lon + rng.normal(0, 1, 5000) * scale
+        lat_end = np.clip(lat + rng.normal(0, 1, 5000) * scale, -90, 90)
+        radius = rng.uniform(0, 300000, 5000)
+
+        distance = vincenty_inverse_solution_batch(lon, lat, lon_end, lat_end, 'WGS84')[0]
+        chord = chord_distance_batch(lon, lat, lon_end, lat_end, 'WGS84')
+        self.assertTrue(np.all(chord <= chord_radius(distance)))
+
+        # Prefilter never rejects pairs within radius
+        candidates = chord_prefilter(lon, lat, lon_end, lat_end, radius, 'WGS84')
+        self.assertTrue(np.all(candidates[distance <= radius]))
+        self.assertTrue(np.array_equal(distance <= radius,
+                                       within_geodesic_radius(lon, lat, lon_end, lat_end, radius, 'WGS84')))
+
+    def test_ecef_points(self):
+        rng = np.random.default_rng(23)
+        lon = rng.uniform(14, 24, 20000)
+        lat = rng.uniform(49, 55, 20000)
+        points = EcefPoints(lon, lat, 'WGS84')
+        self.assertEqual(20000, len(points))
+        self.assertTrue(np.allclose(1, np.linalg.norm(points.unit, axis=1)))
+
+        indices, distances = points.within_radius(19.0, 52.0, 30000)
+        distance = vincenty_inverse_solution_batch(19.0, 52.0, lon, lat, 'WGS84')[0]
+        self.assertTrue(np.array_equal(np.flatnonzero(distance <= 30000), indices))
+        self.assertTrue(np.array_equal(distance[indices], distances))
+        self.assertTrue(set(indices) <= set(points.candidates(19.0, 52.0, 30000)))
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from aviation_gis_toolkit.ellipsoid_calc import *
 
 
@@ -53,3 +54,295 @@ class AngleTests(unittest.TestCase):
         ellipsoid_name = 'WGS84'
         self.assertEqual((139.58969185673908, -33.8212028224309),
                          vincenty_direct_solution(lon_initial, lat_initial, azimuth_initial, distance, ellipsoid_name))
+
+    def test_vincenty_direct_solution_batch(self):
+        lon_end, lat_end = vincenty_direct_solution_batch([0.0, 0.0, 0.0, 0.0, 0.0, 137.5],
+                                                          [0.0, 0.0, 0.0, 0.0, 0.0, -32.5],
+                                                          [0.0, 90.0, 180.0, 270.0, 360.0, 127.5],
+                                                          [10000.0, 10000.0, 1000.0, 10000, 100000.0, 243855.411],
+                                                          'WGS84')
+        self.assertEqual([0.0, 0.08983152841248263, 0.0, -0.08983152841248263, 0.0, 139.58969185673908],
+                         lon_end.tolist())
+        self.assertEqual([0.09043694695356691, 5.5376636427532604e-18, -0.009043694727216058,
+                          -1.661299092825978e-17, 0.9043687229398173, -33.8212028224309],
+                         lat_end.tolist())
+
+    def test_vincenty_direct_solution_batch_broadcast(self):
+        azimuths = np.array([[0.0, 45.0, 90.0], [135.0, 180.0, 225.0]])
+        lon_end, lat_end = vincenty_direct_solution_batch(21.5, 52.25, azimuths, 150000.0, 'WGS72')
+        self.assertEqual((2, 3), lon_end.shape)
+        self.assertEqual((2, 3), lat_end.shape)
+        for (i, j), azimuth in np.ndenumerate(azimuths):
+            lon, lat = vincenty_direct_solution(21.5, 52.25, azimuth, 150000.0, 'WGS72')
+            self.assertAlmostEqual(lon, lon_end[i, j], places=12)
+            self.assertAlmostEqual(lat, lat_end[i, j], places=12)
+
+    def test_vincenty_direct_solution_batch_matches_scalar(self):
+        rng = np.random.default_rng(2020)
+        lon = rng.uniform(-180, 180, 500)
+        lat = rng.uniform(-89, 89, 500)
+        azimuth = rng.uniform(0, 360, 500)
+        distance = rng.uniform(0, 19000000, 500)
+        lon_end, lat_end = vincenty_direct_solution_batch(lon, lat, azimuth, distance, 'WGS84')
+        for i in range(500):
+            lon_s, lat_s = vincenty_direct_solution(lon[i], lat[i], azimuth[i], distance[i], 'WGS84')
+            self.assertAlmostEqual(lon_s, lon_end[i], places=12)
+            self.assertAlmostEqual(lat_s, lat_end[i], places=12)
+
+    def test_vincenty_inverse_solution(self):
+        # Flinders Peak - Buninyong, example from Vincenty's paper
+        distance, azimuth_initial, azimuth_reverse = vincenty_inverse_solution(144.42486788888889, -37.95103341666667,
+                                                                               143.92649552777777, -37.65282113888889,
+                                                                               'WGS84')
+        self.assertAlmostEqual(54972.271, distance, places=3)
+        self.assertAlmostEqual(306.86815833, azimuth_initial, places=5)
+        self.assertAlmostEqual(127.17363056, azimuth_reverse, places=5)
+
+        # Round trip with the direct solution
+        distance, azimuth_initial, azimuth_reverse = vincenty_inverse_solution(137.5, -32.5,
+                                                                               139.58969185673908, -33.8212028224309,
+                                                                               'WGS84')
+        self.assertAlmostEqual(243855.411, distance, places=5)
+        self.assertAlmostEqual(127.5, azimuth_initial, places=9)
+
+        self.assertEqual((1113194.9079251972, 90.0, 270.0), vincenty_inverse_solution(0.0, 0.0, 10.0, 0.0, 'WGS84'))
+        self.assertEqual((0.0, 0.0, 0.0), vincenty_inverse_solution(21.0, 52.0, 21.0, 52.0, 'WGS84'))
+        # Nearly antipodal points - solution does not converge
+        self.assertIsNone(vincenty_inverse_solution(0.0, 0.0, 179.7, 0.1, 'WGS84'))
+
+    def test_vincenty_direct_solution_with_azimuth(self):
+        # Flinders Peak - Buninyong, example from Vincenty's paper
+        lon_end, lat_end, azimuth_reverse = vincenty_direct_solution_with_azimuth(144.42486788888889,
+                                                                                  -37.95103341666667,
+                                                                                  306.86815833, 54972.271, 'WGS84')
+        self.assertAlmostEqual(143.92649552777777, lon_end, places=7)
+        self.assertAlmostEqual(-37.65282113888889, lat_end, places=7)
+        self.assertAlmostEqual(127.17363056, azimuth_reverse, places=5)
+        self.assertEqual((lon_end, lat_end), vincenty_direct_solution(144.42486788888889, -37.95103341666667,
+                                                                      306.86815833, 54972.271, 'WGS84'))
+        self.assertEqual((0.08983152841248263, 5.5376636427532604e-18, 270.0),
+                         vincenty_direct_solution_with_azimuth(0.0, 0.0, 90.0, 10000.0, 'WGS84'))
+
+        rng = np.random.default_rng(5)
+        lon = rng.uniform(-180, 180, 2000)
+        lat = rng.uniform(-89, 89, 2000)
+        azimuth = rng.uniform(0, 360, 2000)
+        distance = rng.uniform(1, 15000000, 2000)
+        lon_end, lat_end, azimuth_reverse = vincenty_direct_solution_with_azimuth_batch(lon, lat, azimuth, distance,
+                                                                                        'WGS84')
+        expected = vincenty_inverse_solution_batch(lon, lat, lon_end, lat_end, 'WGS84')[2]
+        self.assertTrue(np.allclose(0, (azimuth_reverse - expected + 180) % 360 - 180, atol=1e-7))
+        for i in range(0, 2000, 200):
+            result = vincenty_direct_solution_with_azimuth(lon[i], lat[i], azimuth[i], distance[i], 'WGS84')
+            self.assertAlmostEqual(0, (result[2] - azimuth_reverse[i] + 180) % 360 - 180, places=9)
+
+        # Series solution gives the same azimuth
+        geodesic = get_geodesic('WGS84')
+        azimuth_series = geodesic.direct_series_with_azimuth_batch(lon, lat, azimuth, distance)[2]
+        self.assertTrue(np.allclose(0, (azimuth_series - azimuth_reverse + 180) % 360 - 180, atol=1e-7))
+
+    def test_vincenty_inverse_solution_batch(self):
+        rng = np.random.default_rng(2020)
+        lon_initial = rng.uniform(-180, 180, 500)
+        lat_initial = rng.uniform(-89, 89, 500)
+        lon_end = rng.uniform(-180, 180, 500)
+        lat_end = rng.uniform(-89, 89, 500)
+        distance, azimuth_initial, azimuth_reverse = vincenty_inverse_solution_batch(lon_initial, lat_initial,
+                                                                                     lon_end, lat_end, 'WGS84')
+        for i in range(500):
+            expected = vincenty_inverse_solution(lon_initial[i], lat_initial[i], lon_end[i], lat_end[i], 'WGS84')
+            self.assertAlmostEqual(expected[0], distance[i], places=6)
+            self.assertAlmostEqual(expected[1], azimuth_initial[i], places=9)
+            self.assertAlmostEqual(expected[2], azimuth_reverse[i], places=9)
+
+        distance, azimuth_initial, azimuth_reverse = vincenty_inverse_solution_batch(0.0, 0.0, [0.0, 10.0, 179.7],
+                                                                                     [0.0, 0.0, 0.1], 'WGS84')
+        self.assertEqual([0.0, 1113194.9079251972], distance[:2].tolist())
+        self.assertEqual([0.0, 90.0], azimuth_initial[:2].tolist())
+        self.assertEqual([0.0, 270.0], azimuth_reverse[:2].tolist())
+        self.assertTrue(np.isnan(distance[2]))
+
+    def test_vincenty_inverse_solution_matrix(self):
+        rng = np.random.default_rng(1)
+        lon_initial, lat_initial = rng.uniform(-180, 180, 30), rng.uniform(-80, 80, 30)
+        lon_end, lat_end = rng.uniform(-180, 180, 20), rng.uniform(-80, 80, 20)
+        # Budget small enough to force a chunk per a few rows
+        result = vincenty_inverse_solution_matrix(lon_initial, lat_initial, lon_end, lat_end, 'WGS84',
+                                                  chunk_bytes=20000)
+        expected = vincenty_inverse_solution_batch(lon_initial[:, np.newaxis], lat_initial[:, np.newaxis],
+                                                   lon_end, lat_end, 'WGS84')
+        for matrix, expected_matrix in zip(result, expected):
+            self.assertEqual((30, 20), matrix.shape)
+            self.assertTrue(np.array_equal(expected_matrix, matrix, equal_nan=True))
+
+    def test_get_geodesic(self):
+        geodesic = get_geodesic('WGS84')
+        self.assertIs(geodesic, get_geodesic('WGS84'))
+        self.assertEqual(6378137.0, geodesic.a)
+        self.assertEqual(6356752.3141, geodesic.b)
+        self.assertEqual(1 / 298.25722210088, geodesic.f)
+        self.assertEqual((139.58969185673908, -33.8212028224309), geodesic.direct(137.5, -32.5, 127.5, 243855.411))
+        with self.assertRaises(KeyError):
+            get_geodesic('TEST')
+
+    def test_register_ellipsoid(self):
+        register_ellipsoid('TEST_GRS80', 6378137.0, 6356752.314140347, 1 / 298.257222101)
+        try:
+            self.assertEqual(ellipsoid(A=6378137.0, B=6356752.314140347, F=1 / 298.257222101),
+                             ellipsoids['TEST_GRS80'])
+            geodesic = get_geodesic('TEST_GRS80')
+            self.assertEqual(geodesic.direct(137.5, -32.5, 127.5, 243855.411),
+                             vincenty_direct_solution(137.5, -32.5, 127.5, 243855.411, 'TEST_GRS80'))
+
+            # Re-registering replaces cached instance
+            register_ellipsoid('TEST_GRS80', 6378137.0, 6378137.0, 0.0)
+            self.assertIsNot(geodesic, get_geodesic('TEST_GRS80'))
+            self.assertEqual(0.0, get_geodesic('TEST_GRS80').f)
+        finally:
+            del ellipsoids['TEST_GRS80']
+
+        with self.assertRaises(ValueError):
+            register_ellipsoid('TEST', 6378137.0, 6400000.0, 1 / 298.257222101)
+
+    def test_geodesic_line(self):
+        geodesic = get_geodesic('WGS84')
+        line = geodesic.line(137.5, -32.5, 127.5)
+        distances = np.arange(0.0, 500000.0, 185.2)
+
+        lon_end, lat_end = line.positions(distances)
+        expected_lon, expected_lat = geodesic.direct_batch(137.5, -32.5, 127.5, distances)
+        self.assertTrue(np.array_equal(expected_lon, lon_end))
+        self.assertTrue(np.array_equal(expected_lat, lat_end))
+
+        # Warm-started sequence
+        for distance in distances:
+            lon, lat = line.position(distance)
+            expected_lon, expected_lat = geodesic.direct(137.5, -32.5, 127.5, distance)
+            self.assertAlmostEqual(expected_lon, lon, places=9)
+            self.assertAlmostEqual(expected_lat, lat, places=9)
+
+        # Going back along the line
+        lon, lat = line.position(243855.411)
+        self.assertAlmostEqual(139.58969185673908, lon, places=9)
+        self.assertAlmostEqual(-33.8212028224309, lat, places=9)
+
+    def test_series_direct_solution(self):
+        self.assertEqual((8.983152841252231, 5.514853708245245e-16),
+                         series_direct_solution(0.0, 0.0, 90.0, 1000000.0, 'WGS84'))
+        self.assertEqual(150.00000000000003, series_direct_solution(0.0, 90.0, 30.0, 1000000.0, 'WGS84')[0])
+
+        rng = np.random.default_rng(2020)
+        lon = rng.uniform(-180, 180, 300)
+        lat = rng.uniform(-89, 89, 300)
+        azimuth = rng.uniform(0, 360, 300)
+        distance = rng.uniform(0, 19000000, 300)
+        lon_end, lat_end = series_direct_solution_batch(lon, lat, azimuth, distance, 'WGS84')
+        for i in range(300):
+            lon_s, lat_s = series_direct_solution(lon[i], lat[i], azimuth[i], distance[i], 'WGS84')
+            self.assertAlmostEqual(0, (lon_s - lon_end[i] + 180) % 360 - 180, places=10)
+            self.assertAlmostEqual(lat_s, lat_end[i], places=10)
+            # Sub-millimetre agreement with Vincenty
+            lon_v, lat_v = vincenty_direct_solution(lon[i], lat[i], azimuth[i], distance[i], 'WGS84')
+            self.assertLess(vincenty_inverse_solution(lon_v, lat_v, lon_s, lat_s, 'WGS84')[0], 0.001)
+
+    def test_vincenty_iteration_cap(self):
+        geodesic = Geodesic(6378137.0, 6356752.3141, 1 / 298.25722210088, max_iterations=2)
+        # Direct solution falls back to the series solution
+        self.assertEqual(geodesic.direct_series(137.5, -32.5, 127.5, 243855.411),
+                         geodesic.direct(137.5, -32.5, 127.5, 243855.411))
+        lon_end, lat_end = geodesic.direct_batch([137.5, 137.5], [-32.5, -32.5], [127.5, 127.5], [243855.411, 0.0])
+        series_lon, series_lat = geodesic.direct_series_batch(137.5, -32.5, 127.5, 243855.411)
+        self.assertEqual([series_lon, 137.5], lon_end.tolist())
+        self.assertEqual([series_lat, -32.5], lat_end.tolist())
+        self.assertEqual(geodesic.direct_series(137.5, -32.5, 127.5, 243855.411),
+                         geodesic.line(137.5, -32.5, 127.5).position(243855.411))
+        # Inverse solution does not return result
+        self.assertIsNone(geodesic.inverse(137.5, -32.5, 139.58969185673908, -33.8212028224309))
+        self.assertEqual((0.0, 0.0, 0.0), geodesic.inverse(137.5, -32.5, 137.5, -32.5))
+
+    def test_vincenty_telemetry(self):
+        geodesic = Geodesic(6378137.0, 6356752.3141, 1 / 298.25722210088)
+        geodesic.telemetry = VincentyTelemetry(worst_cases_size=2)
+
+        geodesic.direct(137.5, -32.5, 127.5, 243855.411)
+        geodesic.direct_batch([0.0, 0.0], [0.0, 0.0], [0.0, 90.0], [10000.0, 10000.0])
+        # Along the equator the correction of sigma is zero, single iteration is enough
+        self.assertEqual({1: 1, 3: 1, 4: 1}, geodesic.telemetry.histograms[PROBLEM_DIRECT])
+        self.assertEqual(3, geodesic.telemetry.calls[PROBLEM_DIRECT])
+        self.assertEqual(0, geodesic.telemetry.non_converged[PROBLEM_DIRECT])
+
+        geodesic.inverse(0.0, 0.0, 179.7, 0.1)
+        geodesic.inverse_batch(0.0, 0.0, [10.0, 179.5], [0.0, 0.2])
+        self.assertEqual(3, geodesic.telemetry.calls[PROBLEM_INVERSE])
+        self.assertEqual(2, geodesic.telemetry.non_converged[PROBLEM_INVERSE])
+        self.assertEqual(2, geodesic.telemetry.histograms[PROBLEM_INVERSE][VINCENTY_MAX_ITERATIONS])
+        self.assertEqual([worst_case(VINCENTY_MAX_ITERATIONS, False, PROBLEM_INVERSE, (0.0, 0.0, 179.7, 0.1)),
+                          worst_case(VINCENTY_MAX_ITERATIONS, False, PROBLEM_INVERSE, (0.0, 0.0, 179.5, 0.2))],
+                         geodesic.telemetry.worst_cases)
+
+        geodesic.telemetry.reset()
+        self.assertEqual(0, sum(geodesic.telemetry.calls.values()))
+        self.assertEqual([], geodesic.telemetry.worst_cases)
+
+    def test_method_error_bounds(self):
+        rng = np.random.default_rng(2020)
+        for ellipsoid_name in ['WGS84', 'WGS72']:
+            lon = rng.uniform(-180, 180, 2000)
+            lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 2000)))
+            azimuth = rng.uniform(0, 360, 2000)
+            distance = rng.uniform(0, 20000000, 2000)
+            lon_end, lat_end = vincenty_direct_solution_batch(lon, lat, azimuth, distance, ellipsoid_name)
+
+            for method in [METHOD_SPHERICAL, METHOD_ANDOYER_LAMBERT, METHOD_SERIES]:
+                bound = np.array([get_method_error_bound(PROBLEM_DIRECT, method, d) for d in distance])
+                lon_m, lat_m = direct_solution_batch(lon, lat, azimuth, distance, ellipsoid_name, method)
+                error = vincenty_inverse_solution_batch(lon_end, lat_end, lon_m, lat_m, ellipsoid_name)[0]
+                self.assertTrue(np.all(error <= bound), method)
+                for i in range(0, 2000, 100):
+                    lon_s, lat_s = direct_solution(lon[i], lat[i], azimuth[i], distance[i], ellipsoid_name, method)
+                    self.assertAlmostEqual(0, (lon_s - lon_m[i] + 180) % 360 - 180, places=9)
+                    self.assertAlmostEqual(lat_s, lat_m[i], places=9)
+
+            for method in [METHOD_SPHERICAL, METHOD_ANDOYER_LAMBERT]:
+                bound = np.array([get_method_error_bound(PROBLEM_INVERSE, method, d) for d in distance])
+                distance_m = geodesic_distance_batch(lon, lat, lon_end, lat_end, ellipsoid_name, method)
+                self.assertTrue(np.all(np.abs(distance_m - distance) <= bound), method)
+                for i in range(0, 2000, 100):
+                    self.assertAlmostEqual(distance_m[i], geodesic_distance(lon[i], lat[i], lon_end[i], lat_end[i],
+                                                                            ellipsoid_name, method), places=6)
+
+        self.assertEqual(0.0, geodesic_distance(21.0, 52.0, 21.0, 52.0, 'WGS84', METHOD_ANDOYER_LAMBERT))
+        self.assertEqual(1113194.9079251972, geodesic_distance(0.0, 0.0, 10.0, 0.0, 'WGS84'))
+        self.assertIsNone(geodesic_distance(0.0, 0.0, 179.7, 0.1, 'WGS84'))
+
+    def test_select_method(self):
+        self.assertEqual(METHOD_SPHERICAL, select_method(PROBLEM_INVERSE, 5000, 300 * 1852))
+        self.assertEqual(METHOD_ANDOYER_LAMBERT, select_method(PROBLEM_INVERSE, 10, 300 * 1852))
+        self.assertEqual(METHOD_VINCENTY, select_method(PROBLEM_INVERSE, 0.1, 300 * 1852))
+        # Andoyer-Lambert is not valid for very long distances
+        self.assertEqual(METHOD_VINCENTY, select_method(PROBLEM_INVERSE, 1000, 15000000))
+        self.assertEqual(METHOD_ANDOYER_LAMBERT, select_method(PROBLEM_DIRECT, 1000, [1000, 15000000]))
+        self.assertEqual(math.inf, get_method_error_bound(PROBLEM_INVERSE, METHOD_ANDOYER_LAMBERT, 15000000))
+
+    def test_direct_solution_cache(self):
+        expected = vincenty_direct_solution(21.0, 52.0, 45.0, 10000.0, 'WGS84')
+        self.assertIsNone(get_direct_solution_cache())
+        cache = enable_direct_solution_cache(maxsize=2)
+        try:
+            self.assertEqual(expected, vincenty_direct_solution(21.0, 52.0, 45.0, 10000.0, 'WGS84'))
+            # Floating point noise does not defeat the cache
+            self.assertEqual(expected, vincenty_direct_solution(21.0 + 1e-14, 52.0, 45.0, 10000.0 - 1e-9, 'WGS84'))
+            self.assertEqual((1, 1, 0, 2, 1), cache.info())
+            vincenty_direct_solution(21.0, 52.0, 45.0, 10000.0, 'WGS72')
+            vincenty_direct_solution(21.0, 52.0, 90.0, 10000.0, 'WGS84')
+            self.assertEqual((1, 3, 1, 2, 2), cache.info())
+            # Least recently used entry was evicted
+            self.assertEqual(expected, vincenty_direct_solution(21.0, 52.0, 45.0, 10000.0, 'WGS84'))
+            self.assertEqual((1, 4, 2, 2, 2), cache.info())
+            cache.clear()
+            self.assertEqual((0, 0, 0, 2, 0), cache.info())
+        finally:
+            disable_direct_solution_cache()
+        self.assertIsNone(get_direct_solution_cache())
+        with self.assertRaises(ValueError):
+            DirectSolutionCache(maxsize=0)
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.distance import Distance
+from aviation_gis_toolkit.ellipsoid_calc import *
+from aviation_gis_toolkit.holding import *
+
+
+class HoldingTests(unittest.TestCase):
+
+    def test_racetrack_batch(self):
+        n = 6
+        lon, lat = racetrack_batch(21.0, 52.0, 270.0, Distance(5, UOM_NM), Distance('2', UOM_NM), 'WGS84',
+                                   arc_vertex_count=n)
+        self.assertEqual((2 * n + 3, ), lon.shape)
+        self.assertEqual((21.0, 52.0), (lon[0], lat[0]))
+        self.assertEqual((21.0, 52.0), (lon[-1], lat[-1]))
+
+        # Inbound leg from the east, right turns: pattern lies north of the inbound leg
+        distance, _, azimuth_reverse = vincenty_inverse_solution_batch(lon[2 * n + 1], lat[2 * n + 1], 21.0, 52.0,
+                                                                       'WGS84')
+        self.assertAlmostEqual(5 * 1852, distance, places=6)
+        self.assertAlmostEqual(90, azimuth_reverse, places=9)
+        self.assertTrue(np.all(lat[1:-2] > 52))
+        self.assertAlmostEqual(4 * 1852, vincenty_inverse_solution(21.0, 52.0, lon[n], lat[n], 'WGS84')[0], delta=1e-3)
+        outbound = vincenty_inverse_solution(lon[n], lat[n], lon[n + 1], lat[n + 1], 'WGS84')[0]
+        self.assertAlmostEqual(5 * 1852, outbound, delta=1)
+
+        # Numbers in uom are equivalent to Distance objects, left turns put the pattern on the other side
+        lon_batch, lat_batch = racetrack_batch(21.0, 52.0, [270.0, 270.0, 90.0], 5, 2, 'WGS84', UOM_NM,
+                                               right_turns=[True, False, True], arc_vertex_count=n)
+        self.assertTrue(np.array_equal(lon, lon_batch[0]))
+        self.assertTrue(np.array_equal(lat, lat_batch[0]))
+        self.assertTrue(np.all(lat_batch[1:, 1:-2] < 52))
+
+        with self.assertRaises(ValueError):
+            racetrack_batch(21.0, 52.0, 270.0, Distance('x', UOM_NM), Distance(2, UOM_NM), 'WGS84')
+        with self.assertRaises(ValueError):
+            racetrack_batch(21.0, 52.0, 270.0, 5, -2, 'WGS84', UOM_NM)
+
+    def test_holding_pattern_batch(self):
+        # 180 kt at bank angle 25 degrees: rate of turn 2.83 degrees per second, 100 kt: limited to 3
+        self.assertTrue(np.allclose([1.0125623, 100 / (60 * np.pi)], holding_turn_radius([180, 100])))
+
+        lon_fix = np.array([21.0, -75.5, 179.9])
+        lat_fix = np.array([52.0, 40.0, -60.0])
+        lon, lat = holding_pattern_batch(lon_fix, lat_fix, [[90.0], [315.0]], 180, 'WGS84', outbound_time=1.5)
+        self.assertEqual((2, 3, 39), lon.shape)
+        expected = racetrack_batch(lon_fix, lat_fix, 315.0, 4.5, holding_turn_radius(180), 'WGS84', UOM_NM)
+        self.assertTrue(np.array_equal(expected[0], lon[1]))
+        self.assertTrue(np.array_equal(expected[1], lat[1]))
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.intersection import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class IntersectionTests(unittest.TestCase):
+
+    def test_radial_intersection(self):
+        # Fixes defined by radials from two stations, stations 10 - 300 km from the fixes
+        rng = np.random.default_rng(25)
+        lon_fix = rng.uniform(-180, 180, 500)
+        lat_fix = rng.uniform(-80, 80, 500)
+        lon_1, lat_1 = vincenty_direct_solution_batch(lon_fix, lat_fix, rng.uniform(0, 360, 500),
+                                                      rng.uniform(10000, 300000, 500), 'WGS84')
+        lon_2, lat_2 = vincenty_direct_solution_batch(lon_fix, lat_fix, rng.uniform(0, 360, 500),
+                                                      rng.uniform(10000, 300000, 500), 'WGS84')
+        distance_1, azimuth_1, reverse_1 = vincenty_inverse_solution_batch(lon_1, lat_1, lon_fix, lat_fix, 'WGS84')
+        distance_2, azimuth_2, reverse_2 = vincenty_inverse_solution_batch(lon_2, lat_2, lon_fix, lat_fix, 'WGS84')
+
+        lon, lat, d_1, d_2, converged = radial_intersection_batch(lon_1, lat_1, azimuth_1, lon_2, lat_2, azimuth_2,
+                                                                  'WGS84')
+        # Only nearly collinear radials may not converge, all fixes where the radials cross at 1 degree or more
+        # are found
+        crossing = np.degrees(np.arcsin(np.fabs(np.sin(np.radians(reverse_1 - reverse_2)))))
+        self.assertTrue(np.all(converged[crossing >= 1]))
+        error = vincenty_inverse_solution_batch(lon_fix, lat_fix, lon, lat, 'WGS84')[0]
+        self.assertTrue(np.all(error[converged] < 1e-3))
+        self.assertTrue(np.allclose(distance_1[converged], d_1[converged], rtol=0, atol=1e-3))
+        self.assertTrue(np.allclose(distance_2[converged], d_2[converged], rtol=0, atol=1e-3))
+        self.assertTrue(np.all(np.isnan(lon[~converged])))
+
+        lon_s, lat_s = radial_intersection(lon_1[0], lat_1[0], azimuth_1[0], lon_2[0], lat_2[0], azimuth_2[0], 'WGS84')
+        self.assertEqual((float(lon[0]), float(lat[0])), (lon_s, lat_s))
+        # Diverging radials
+        self.assertIsNone(radial_intersection(0.0, 0.0, 315.0, 1.0, 0.0, 45.0, 'WGS84'))
+
+        # Fixes 0.5 - 3 km from one station and 500 - 900 km from the other one, radials cross at 30 - 90 degrees,
+        # intersection on the sphere may lie behind the near station
+        azimuth_near = rng.uniform(0, 360, 500)
+        azimuth_far = azimuth_near + rng.choice([-1, 1], 500) * rng.uniform(30, 90, 500) + rng.choice([0, 180], 500)
+        lon_3, lat_3 = vincenty_direct_solution_batch(lon_fix, lat_fix, azimuth_near, rng.uniform(500, 3000, 500),
+                                                      'WGS84')
+        lon_4, lat_4 = vincenty_direct_solution_batch(lon_fix, lat_fix, azimuth_far,
+                                                      rng.uniform(500000, 900000, 500), 'WGS84')
+        azimuth_3 = vincenty_inverse_solution_batch(lon_3, lat_3, lon_fix, lat_fix, 'WGS84')[1]
+        distance_4, azimuth_4, _ = vincenty_inverse_solution_batch(lon_4, lat_4, lon_fix, lat_fix, 'WGS84')
+        station_3 = lon_3, lat_3, azimuth_3
+        station_4 = lon_4, lat_4, azimuth_4
+        for args in (station_3 + station_4, station_4 + station_3):
+            lon_n, lat_n, _, _, converged_n = radial_intersection_batch(*args, 'WGS84')
+            self.assertTrue(np.all(converged_n))
+            error = vincenty_inverse_solution_batch(lon_fix, lat_fix, lon_n, lat_n, 'WGS84')[0]
+            self.assertTrue(np.all(error < 1e-3))
+        # Radial from the near station and arc around the far one
+        lon_n, lat_n, _, converged_n = radial_arc_intersection_batch(*station_3, lon_4, lat_4, distance_4, 'WGS84')
+        lon_f, lat_f, _, converged_f = radial_arc_intersection_batch(*station_3, lon_4, lat_4, distance_4, 'WGS84',
+                                                                     far=True)
+        self.assertTrue(np.all(converged_n & converged_f))
+        error = np.fmin(vincenty_inverse_solution_batch(lon_fix, lat_fix, lon_n, lat_n, 'WGS84')[0],
+                        vincenty_inverse_solution_batch(lon_fix, lat_fix, lon_f, lat_f, 'WGS84')[0])
+        self.assertTrue(np.all(error < 1e-3))
+
+        # Fixes defined by the radial and DME arc, the fix is the nearer or the farther intersection
+        lon_n, lat_n, d_n, converged_n = radial_arc_intersection_batch(lon_1, lat_1, azimuth_1, lon_2, lat_2,
+                                                                       distance_2, 'WGS84')
+        lon_f, lat_f, d_f, converged_f = radial_arc_intersection_batch(lon_1, lat_1, azimuth_1, lon_2, lat_2,
+                                                                       distance_2, 'WGS84', far=True)
+        self.assertTrue(np.all(converged_n & converged_f))
+        self.assertTrue(np.all(d_n <= d_f))
+        for lon_i, lat_i in ((lon_n, lat_n), (lon_f, lat_f)):
+            radius = vincenty_inverse_solution_batch(lon_2, lat_2, lon_i, lat_i, 'WGS84')[0]
+            self.assertTrue(np.allclose(distance_2, radius, rtol=0, atol=1e-3))
+        error = np.fmin(vincenty_inverse_solution_batch(lon_fix, lat_fix, lon_n, lat_n, 'WGS84')[0],
+                        vincenty_inverse_solution_batch(lon_fix, lat_fix, lon_f, lat_f, 'WGS84')[0])
+        # Nearly tangent radials locate the fix less precisely
+        self.assertTrue(np.all(error < 0.1))
+        self.assertGreater(np.sum(error < 1e-3), 490)
+
+        # Station inside the arc: both intersections are the one ahead, radial missing the arc
+        lon_a, lat_a = radial_arc_intersection(0.0, 0.0, 90.0, 0.1, 0.0, 50000.0, 'WGS84')
+        self.assertEqual((lon_a, lat_a), radial_arc_intersection(0.0, 0.0, 90.0, 0.1, 0.0, 50000.0, 'WGS84', far=True))
+        self.assertAlmostEqual(50000.0, vincenty_inverse_solution(0.1, 0.0, lon_a, lat_a, 'WGS84')[0], places=3)
+        self.assertIsNone(radial_arc_intersection(0.0, 0.0, 0.0, 1.0, 0.0, 50000.0, 'WGS84'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.ellipsoid_calc import *
+from aviation_gis_toolkit.parallel_calc import *
+
+
+class ParallelCalcTests(unittest.TestCase):
+
+    def test_parallel_executor(self):
+        rng = np.random.default_rng(7)
+        lon = rng.uniform(-180, 180, 1000)
+        lat = rng.uniform(-90, 90, 1000)
+        azimuth = rng.uniform(0, 360, (3, 1000))
+        distance = rng.uniform(0, 20000000, 1000)
+
+        with ParallelExecutor(workers=2, chunk_size=256) as executor:
+            lon_end, lat_end = executor.direct_batch(lon, lat, azimuth, distance, 'WGS84')
+            lon_serial, lat_serial = vincenty_direct_solution_batch(lon, lat, azimuth, distance, 'WGS84')
+            self.assertEqual((3, 1000), lon_end.shape)
+            self.assertTrue(np.array_equal(lon_serial, lon_end))
+            self.assertTrue(np.array_equal(lat_serial, lat_end))
+
+            results = executor.inverse_batch(lon, lat, lon_end, lat_end, 'WGS72')
+            results_serial = vincenty_inverse_solution_batch(lon, lat, lon_end, lat_end, 'WGS72')
+            for result, result_serial in zip(results, results_serial):
+                self.assertTrue(np.array_equal(result_serial, result, equal_nan=True))
+
+            distance_end = executor.distance_batch(lon, lat, lon_end, lat_end, 'WGS84', METHOD_ANDOYER_LAMBERT)
+            self.assertTrue(np.array_equal(geodesic_distance_batch(lon, lat, lon_end, lat_end, 'WGS84',
+                                                                   METHOD_ANDOYER_LAMBERT), distance_end))
+
+            # Small batches are computed in the calling process
+            lon_end, lat_end = executor.direct_batch(21.0, 52.0, 45.0, 10000.0, 'WGS84', METHOD_SERIES)
+            self.assertEqual(series_direct_solution(21.0, 52.0, 45.0, 10000.0, 'WGS84'),
+                             (float(lon_end), float(lat_end)))
+
+        with self.assertRaises(ValueError):
+            ParallelExecutor(chunk_size=0)
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.ellipsoid_calc import *
+from aviation_gis_toolkit.range_ring import *
+
+
+class RangeRingTests(unittest.TestCase):
+
+    def test_range_ring_batch(self):
+        lon_center = np.array([21.0, -75.5, 179.9])
+        lat_center = np.array([52.0, 40.0, -89.0])
+        radius = np.array([[10 * 1852.0], [25 * 1852.0]])
+        lon, lat = range_ring_batch(lon_center, lat_center, radius, 'WGS84', vertex_count=72)
+        self.assertEqual((2, 3, 73), lon.shape)
+        self.assertEqual((2, 3, 73), lat.shape)
+        # Rings are closed
+        self.assertTrue(np.array_equal(lon[..., 0], lon[..., -1]))
+        self.assertTrue(np.array_equal(lat[..., 0], lat[..., -1]))
+
+        distance, azimuth, _ = vincenty_inverse_solution_batch(lon_center[:, np.newaxis], lat_center[:, np.newaxis],
+                                                               lon, lat, 'WGS84')
+        self.assertTrue(np.allclose(np.broadcast_to(radius[..., np.newaxis], distance.shape), distance, atol=1e-6))
+        expected_azimuth = np.append(np.arange(0, 360, 5.0), 0.0)
+        self.assertTrue(np.allclose(0, (azimuth - expected_azimuth + 180) % 360 - 180, atol=1e-7))
+
+        lon_s, lat_s = vincenty_direct_solution(-75.5, 40.0, 5.0, 25 * 1852.0, 'WGS84')
+        self.assertAlmostEqual(lon_s, lon[1, 1, 1], places=12)
+        self.assertAlmostEqual(lat_s, lat[1, 1, 1], places=12)
+
+    def test_arc_batch(self):
+        # Clockwise arc crossing north
+        lon, lat = arc_batch(21.0, 52.0, 15 * 1852.0, 350.0, 20.0, 'WGS84', vertex_count=6)
+        self.assertEqual((7, ), lon.shape)
+        _, azimuth, _ = vincenty_inverse_solution_batch(21.0, 52.0, lon, lat, 'WGS84')
+        self.assertTrue(np.allclose([350.0, 355.0, 0.0, 5.0, 10.0, 15.0, 20.0],
+                                    azimuth - 360 * (azimuth > 359.999999), atol=1e-9))
+
+        # Counterclockwise arc between the same bearings is the complementary one
+        lon, lat = arc_batch(21.0, 52.0, 15 * 1852.0, 350.0, 20.0, 'WGS84', vertex_count=33, clockwise=False)
+        _, azimuth, _ = vincenty_inverse_solution_batch(21.0, 52.0, lon, lat, 'WGS84')
+        self.assertTrue(np.allclose(np.linspace(350.0, 20.0, 34), azimuth, atol=1e-9))
+
+        # Many arcs at once, equal bearings give full circle
+        lon, lat = arc_batch([21.0, 22.0], [52.0, 53.0], [1852.0, 3704.0], [90.0, 45.0], [180.0, 45.0], 'WGS72',
+                             vertex_count=4)
+        self.assertEqual((2, 5), lon.shape)
+        _, azimuth, _ = vincenty_inverse_solution_batch([[21.0], [22.0]], [[52.0], [53.0]], lon, lat, 'WGS72')
+        self.assertTrue(np.allclose([[90.0, 112.5, 135.0, 157.5, 180.0], [45.0, 135.0, 225.0, 315.0, 45.0]],
+                                    azimuth, atol=1e-9))
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from aviation_gis_toolkit.ellipsoid_calc import *
+from aviation_gis_toolkit.result_cache import *
+
+
+class ResultCacheTests(unittest.TestCase):
+
+    def test_persistent_result_cache(self):
+        rng = np.random.default_rng(11)
+        lon = rng.uniform(-180, 180, 500)
+        lat = rng.uniform(-90, 90, 500)
+        azimuth = rng.uniform(0, 360, 500)
+        distance = rng.uniform(0, 20000000, 500)
+        lon_end, lat_end = vincenty_direct_solution_batch(lon, lat, azimuth, distance, 'WGS84')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite')
+            with PersistentResultCache(path) as cache:
+                results = cache.direct_batch(lon, lat, azimuth, distance, 'WGS84')
+                self.assertTrue(np.array_equal(lon_end, results[0]))
+                self.assertTrue(np.array_equal(lat_end, results[1]))
+                self.assertEqual((0, 1, 0), cache.info()[:3])
+                self.assertEqual(8000, cache.info().currsize)
+
+            # Results are reused in the next session, floating point noise does not defeat the cache
+            with PersistentResultCache(path) as cache:
+                results = cache.direct_batch(lon + 1e-13, lat, azimuth, distance, 'WGS84')
+                self.assertTrue(np.array_equal(lon_end, results[0]))
+                self.assertTrue(np.array_equal(lat_end, results[1]))
+                self.assertEqual((1, 0), cache.info()[:2])
+
+                # Ellipsoid and method are part of the key
+                cache.direct_batch(lon, lat, azimuth, distance, 'WGS72')
+                cache.direct_batch(lon, lat, azimuth, distance, 'WGS84', METHOD_SERIES)
+                self.assertEqual((1, 2), cache.info()[:2])
+
+                expected = vincenty_inverse_solution_batch(lon, lat, lon_end, lat_end, 'WGS84')
+                for _ in range(2):
+                    results = cache.inverse_batch(lon, lat, lon_end, lat_end, 'WGS84')
+                    for result, result_expected in zip(results, expected):
+                        self.assertTrue(np.array_equal(result_expected, result, equal_nan=True))
+                self.assertTrue(np.array_equal(expected[0], cache.distance_batch(lon, lat, lon_end, lat_end, 'WGS84'),
+                                               equal_nan=True))
+                self.assertEqual((3, 3), cache.info()[:2])
+
+            # Size based eviction of the least recently used entries
+            with PersistentResultCache(path, max_bytes=20000) as cache:
+                cache.direct_batch(lon, lat, azimuth, distance, 'WGS84')
+                distance_sph = cache.distance_batch(lon, lat, lon_end, lat_end, 'WGS84', METHOD_SPHERICAL)
+                self.assertTrue(np.array_equal(geodesic_distance_batch(lon, lat, lon_end, lat_end, 'WGS84',
+                                                                       METHOD_SPHERICAL), distance_sph))
+                info = cache.info()
+                self.assertEqual(3, info.evictions)
+                self.assertEqual(8000 + 4000, info.currsize)
+                cache.clear()
+                self.assertEqual((0, 0, 0, 20000, 0), cache.info())
+
+        with self.assertRaises(ValueError):
+            PersistentResultCache(':memory:', max_bytes=0)
@@ -0,0 +1,41 @@
+import unittest
+import math
+import numpy as np
+from aviation_gis_toolkit.rhumb import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class RhumbTests(unittest.TestCase):
+
+    def test_rhumb_solution(self):
+        # Rhumb lines along meridians and the equator are geodesics
+        lon_v, lat_v = vincenty_direct_solution(10.0, 45.0, 0.0, 100000.0, 'WGS84')
+        lon_r, lat_r = rhumb_direct_solution(10.0, 45.0, 0.0, 100000.0, 'WGS84')
+        self.assertEqual(10.0, lon_r)
+        self.assertAlmostEqual(lat_v, lat_r, places=11)
+        self.assertAlmostEqual(math.degrees(1000000.0 / 6378137.0),
+                               rhumb_direct_solution(0.0, 0.0, 90.0, 1000000.0, 'WGS84')[0], places=11)
+        self.assertEqual((10018754.171394622, 90.0, 270.0), rhumb_inverse_solution(0.0, 0.0, 90.0, 0.0, 'WGS84'))
+        # Line spirals into the pole
+        self.assertIsNone(rhumb_direct_solution(0.0, 89.9, 45.0, 100000.0, 'WGS84'))
+
+        rng = np.random.default_rng(18)
+        lon = rng.uniform(-180, 180, 1000)
+        lat = rng.uniform(-70, 70, 1000)
+        azimuth = rng.uniform(0, 360, 1000)
+        distance = np.exp(rng.uniform(0, np.log(2000000), 1000))
+        lon_end, lat_end = rhumb_direct_solution_batch(lon, lat, azimuth, distance, 'WGS72')
+        distance_r, azimuth_r, azimuth_reverse = rhumb_inverse_solution_batch(lon, lat, lon_end, lat_end, 'WGS72')
+        self.assertTrue(np.allclose(distance, distance_r, rtol=0, atol=1e-5))
+        self.assertTrue(np.allclose(0, (azimuth - azimuth_r + 180) % 360 - 180, rtol=0, atol=1e-6))
+        self.assertTrue(np.allclose(180, (azimuth_reverse - azimuth_r) % 360, rtol=0, atol=1e-9))
+        self.assertEqual((float(lon_end[7]), float(lat_end[7])),
+                         rhumb_direct_solution(lon[7], lat[7], azimuth[7], distance[7], 'WGS72'))
+
+        # Rhumb line between two points is never shorter than the geodesic
+        geodesic_distance = vincenty_inverse_solution_batch(lon, lat, lon_end, lat_end, 'WGS72')[0]
+        self.assertTrue(np.all(geodesic_distance <= distance_r + 1e-6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import math
+import numpy as np
+from aviation_gis_toolkit.route import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class RouteTests(unittest.TestCase):
+
+    def test_cross_track_batch(self):
+        # Route heading north along the Greenwich meridian, points right, left and on the extension of the leg
+        cross_track, along_track = cross_track_batch([0.0, 0.0], [0.0, 1.0], [1.0, -1.0, 0.0], [0.5, 0.5, 2.0],
+                                                     'WGS84', UOM_NM)
+        self.assertEqual((3, 1), cross_track.shape)
+        self.assertAlmostEqual(60.1054428, cross_track[0, 0], places=6)
+        self.assertAlmostEqual(-60.1054428, cross_track[1, 0], places=6)
+        self.assertAlmostEqual(0.0, cross_track[2, 0], places=9)
+        self.assertAlmostEqual(vincenty_inverse_solution(0.0, 0.0, 0.0, 2.0, 'WGS84')[0] / 1852, along_track[2, 0],
+                               places=8)
+
+        # Geodesic from the foot point to the point is perpendicular to the leg, Vincenty reference solutions
+        # differ from the series ones by a few micrometers over 1000 km
+        rng = np.random.default_rng(19)
+        route_lon, route_lat = [10.0, 12.0, 15.0, 14.0], [50.0, 52.0, 51.0, 47.0]
+        lon, lat = rng.uniform(0, 25, (20, 50)), rng.uniform(40, 60, (20, 50))
+        cross_track, along_track = cross_track_batch(route_lon, route_lat, lon, lat, 'WGS84', band=math.inf)
+        self.assertEqual((20, 50, 3), cross_track.shape)
+        for i in range(3):
+            leg_azimuth = vincenty_inverse_solution(route_lon[i], route_lat[i], route_lon[i + 1], route_lat[i + 1],
+                                                    'WGS84')[1]
+            backwards = along_track[..., i] < 0
+            lon_foot, lat_foot, azimuth_reverse = vincenty_direct_solution_with_azimuth_batch(
+                route_lon[i], route_lat[i], np.where(backwards, leg_azimuth + 180, leg_azimuth),
+                np.fabs(along_track[..., i]), 'WGS84')
+            distance, azimuth = vincenty_inverse_solution_batch(lon_foot, lat_foot, lon, lat, 'WGS84')[:2]
+            angle = (azimuth - np.where(backwards, azimuth_reverse, azimuth_reverse + 180)) % 360
+            self.assertTrue(np.allclose(np.fabs(cross_track[..., i]), distance, rtol=0, atol=1e-5))
+            angle_error = np.radians(angle - np.where(cross_track[..., i] > 0, 90, 270))
+            self.assertTrue(np.all(np.fabs(angle_error) * distance < 1e-5))
+
+        # Spherical approximation
+        cross_track_s, along_track_s = cross_track_batch(route_lon, route_lat, lon, lat, 'WGS84',
+                                                         method=METHOD_SPHERICAL)
+        total = np.hypot(cross_track, along_track)
+        self.assertTrue(np.all(np.fabs(cross_track_s - cross_track) < 0.005 * total))
+        self.assertTrue(np.all(np.fabs(along_track_s - along_track) < 0.005 * total))
+
+        # Points within the band along the legs are solved on the ellipsoid, the other ones keep spherical distances
+        cross_track_b, along_track_b = cross_track_batch(route_lon, route_lat, lon, lat, 'WGS84', UOM_KM, band=100)
+        leg_length = vincenty_inverse_solution_batch(route_lon[:-1], route_lat[:-1], route_lon[1:], route_lat[1:],
+                                                     'WGS84')[0]
+        near = (np.fabs(cross_track) <= 100000) & (along_track >= -100000) & (along_track <= leg_length + 100000)
+        self.assertTrue(np.any(near) and np.any(~near))
+        self.assertTrue(np.allclose(cross_track_b[near], cross_track[near] / 1000, rtol=0, atol=1e-9))
+        self.assertTrue(np.allclose(along_track_b[near], along_track[near] / 1000, rtol=0, atol=1e-9))
+        far = (np.fabs(cross_track) > 110000) | (along_track < -110000) | (along_track > leg_length + 110000)
+        self.assertTrue(np.allclose(cross_track_b[far], cross_track_s[far] / 1000, rtol=0, atol=1e-9))
+        self.assertTrue(np.allclose(along_track_b[far], along_track_s[far] / 1000, rtol=0, atol=1e-9))
+        self.assertTrue(np.all(cross_track_batch(route_lon, route_lat, lon, lat, 'WGS84')[0] ==
+                               cross_track_batch(route_lon, route_lat, lon, lat, 'WGS84', band=CROSS_TRACK_BAND)[0]))
+
+        # Legs between coincident vertices and geodesics the inverse solution can not solve
+        with self.assertRaises(ValueError):
+            cross_track_batch([10, 10], [50, 50], lon, lat, 'WGS84')
+        with self.assertRaises(ValueError):
+            cross_track_batch([10, 10], [50, 50], lon, lat, 'WGS84', method=METHOD_SPHERICAL)
+        with self.assertRaises(ValueError):
+            cross_track_batch([0, 179.7], [0, 0.3], lon, lat, 'WGS84')
+        with self.assertRaises(ValueError):
+            cross_track_batch(route_lon, route_lat, lon, lat, 'WGS84', uom='mi')
+        with self.assertRaises(ValueError):
+            cross_track_batch(route_lon, route_lat, lon, lat, 'WGS84', method=METHOD_SERIES)
+
+
+if __name__ == '__main__':
+    unittest.main()
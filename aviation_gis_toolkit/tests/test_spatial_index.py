@@ -0,0 +1,53 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from aviation_gis_toolkit.ellipsoid_calc import *
+from aviation_gis_toolkit.spatial_index import *
+
+
+class SpatialIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(29)
+        self.lon = rng.uniform(-180, 180, 20000)
+        self.lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 20000)))
+        self.index = SpatialIndex(self.lon, self.lat, 'WGS84', leaf_size=16)
+
+    def test_query_radius(self):
+        for lon, lat, radius in [(19.0, 52.0, 300000.0), (180.0, 0.0, 200000.0), (0.0, 90.0, 500000.0),
+                                 (-45.0, -30.0, 1.0)]:
+            distance = vincenty_inverse_solution_batch(lon, lat, self.lon, self.lat, 'WGS84')[0]
+            indices, distances = self.index.query_radius(lon, lat, radius)
+            self.assertEqual(set(np.flatnonzero(distance <= radius)), set(indices))
+            self.assertTrue(np.array_equal(distance[indices], distances))
+            self.assertTrue(np.all(np.diff(distances) >= 0))
+
+    def test_query_knn(self):
+        for lon, lat in [(19.0, 52.0), (-179.9, -10.0), (0.0, -90.0)]:
+            distance = vincenty_inverse_solution_batch(lon, lat, self.lon, self.lat, 'WGS84')[0]
+            indices, distances = self.index.query_knn(lon, lat, 25)
+            self.assertTrue(np.array_equal(np.sort(distance)[:25], distances))
+            self.assertTrue(np.array_equal(distance[indices], distances))
+
+        index = SpatialIndex([21.0, 22.0], [52.0, 52.0], 'WGS84')
+        indices, distances = index.query_knn(21.9, 52.0, 5)
+        self.assertEqual([1, 0], list(indices))
+
+    def test_persistence(self):
+        expected = self.index.query_knn(19.0, 52.0, 10)
+        index = pickle.loads(pickle.dumps(self.index))
+        self.assertTrue(np.array_equal(expected[0], index.query_knn(19.0, 52.0, 10)[0]))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index')
+            self.index.save(path)
+            index = SpatialIndex.load(path)
+            self.assertIsInstance(index.xyz, np.memmap)
+            self.assertTrue(np.array_equal(expected[0], index.query_knn(19.0, 52.0, 10)[0]))
+            self.assertTrue(np.array_equal(expected[1], index.query_knn(19.0, 52.0, 10)[1]))
+            del index
+
+        with self.assertRaises(ValueError):
+            SpatialIndex([], [], 'WGS84')
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.track import *
+from aviation_gis_toolkit.ellipsoid_calc import *
+
+
+class TrackTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(20)
+        self.lon = 20 + np.cumsum(rng.normal(0, 0.01, 1000))
+        self.lat = 50 + np.cumsum(rng.normal(0, 0.01, 1000))
+        self.segments = vincenty_inverse_solution_batch(self.lon[:-1], self.lat[:-1], self.lon[1:], self.lat[1:],
+                                                        'WGS84')[0]
+
+    def test_track_lengths(self):
+        segments, cumulative = track_lengths(self.lon, self.lat, 'WGS84', chunk_size=77)
+        self.assertEqual(0.0, segments[0])
+        self.assertTrue(np.array_equal(self.segments, segments[1:]))
+        self.assertTrue(np.allclose(np.cumsum(segments), cumulative, rtol=1e-12, atol=0))
+        self.assertEqual((0, ), track_lengths([], [], 'WGS84')[0].shape)
+
+        segments_s = track_lengths(self.lon, self.lat, 'WGS84', method=METHOD_SPHERICAL)[0]
+        self.assertTrue(np.allclose(segments, segments_s, rtol=0.006, atol=0))
+
+    def test_iter_track_lengths(self):
+        # Results do not depend on the split of the track, empty chunks are skipped
+        bounds = [0, 1, 1, 300, 301, 1000]
+        chunks = [(self.lon[s:e], self.lat[s:e]) for s, e in zip(bounds[:-1], bounds[1:])]
+        results = list(iter_track_lengths(chunks, 'WGS84'))
+        self.assertEqual([1, 299, 1, 699], [len(r[0]) for r in results])
+        segments = np.concatenate([r[0] for r in results])
+        cumulative = np.concatenate([r[1] for r in results])
+        self.assertTrue(np.array_equal(track_lengths(self.lon, self.lat, 'WGS84')[0], segments))
+        self.assertAlmostEqual(float(np.sum(self.segments)), cumulative[-1], places=6)
+
+    def test_track_lengths_nan(self):
+        # Only the segments to and from the invalid point are NaN, the running total continues
+        lat = self.lat[:5].copy()
+        lat[2] = np.nan
+        segments, cumulative = track_lengths(self.lon[:5], lat, 'WGS84', chunk_size=3)
+        self.assertTrue(np.array_equal([False, False, True, True, False], np.isnan(segments)))
+        self.assertTrue(np.array_equal([False, False, True, True, False], np.isnan(cumulative)))
+        self.assertAlmostEqual(self.segments[0] + self.segments[3], cumulative[4], places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from aviation_gis_toolkit.const import *
+from aviation_gis_toolkit.distance import Distance
+from aviation_gis_toolkit.ellipsoid_calc import *
+from aviation_gis_toolkit.traverse import *
+
+
+class TraverseTests(unittest.TestCase):
+
+    def test_traverse(self):
+        legs = [(45.0, Distance(10, UOM_NM)), (135.0, Distance('12,5', UOM_KM)), (270.0, Distance(30000, UOM_FT))]
+        points = traverse(21.0, 52.0, iter(legs), 'WGS84')
+        lon, lat = 21.0, 52.0
+        for bearing, distance in legs:
+            lon, lat = vincenty_direct_solution(lon, lat, bearing, distance.convert_dist_to_m(), 'WGS84')
+            self.assertEqual((lon, lat), next(points))
+        with self.assertRaises(StopIteration):
+            next(points)
+
+        with self.assertRaises(ValueError):
+            list(traverse(21.0, 52.0, [(45.0, Distance(10, 'mi'))], 'WGS84'))
+
+    def test_traverse_batch(self):
+        rng = np.random.default_rng(13)
+        lon_start = rng.uniform(-180, 180, 100)
+        lat_start = rng.uniform(-80, 80, 100)
+        bearings = rng.uniform(0, 360, (100, 6))
+        distances = rng.uniform(0, 50, (100, 6))
+        uom = rng.choice(UOM_LIST, (100, 6))
+
+        lon, lat = traverse_batch(lon_start, lat_start, bearings, distances, uom, 'WGS84')
+        self.assertEqual((100, 7), lon.shape)
+        self.assertTrue(np.array_equal(lon_start, lon[:, 0]))
+        self.assertTrue(np.array_equal(lat_start, lat[:, 0]))
+        for i in range(0, 100, 10):
+            legs = [(bearing, Distance(distance, u)) for bearing, distance, u in zip(bearings[i], distances[i], uom[i])]
+            points = np.array(list(traverse(lon_start[i], lat_start[i], legs, 'WGS84')))
+            self.assertTrue(np.allclose(points[:, 0], lon[i, 1:], rtol=0, atol=1e-11))
+            self.assertTrue(np.allclose(points[:, 1], lat[i, 1:], rtol=0, atol=1e-11))
+
+        # Single start point, many variants of the traverse with the same distances
+        lon, lat = traverse_batch(21.0, 52.0, bearings[:3, :2], [10, 20], UOM_NM, 'WGS72')
+        self.assertEqual((3, 3), lat.shape)
+        self.assertTrue(np.all(lon[:, 0] == 21.0))
@@ -0,0 +1,72 @@
+"""
+track.py
+track module provides functionality to compute segment and cumulative lengths of long tracks, e.g. recorded
+aircraft tracks, block by block with constant memory use.
+"""
+import numpy as np
+
+from .ellipsoid_calc import METHOD_VINCENTY, geodesic_distance_batch
+
+# Default number of the points processed at once by track_lengths
+TRACK_CHUNK_SIZE = 1 << 16
+
+
+def iter_track_lengths(chunks, ellipsoid_name, method=METHOD_VINCENTY):
+    """ Computes segment and cumulative lengths of the track given as stream of coordinate chunks,
+    e.g. read block by block from a file. Last point of each chunk and the length so far are carried to the next
+    chunk, so results do not depend on how the track is split into chunks, up to the floating point summation order
+    of the cumulative lengths.
+    Segments which can not be computed, e.g. ending at point with NaN coordinates, are NaN, as well as cumulative
+    lengths at their end points, and they are left out of the cumulative lengths of the following points.
+    :param chunks: iterable of (array_like, array_like), longitudes and latitudes of the consecutive points
+                   of the track in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method of distance computation, e.g. METHOD_VINCENTY
+    :return: generator of (ndarray, ndarray), for each point of the chunk length of the segment ending at the point
+             and length of the track from its first point to the point; meters. Segment length of the first point
+             of the track is 0.
+    """
+    lon_last, lat_last = None, None
+    total = 0.0
+    for lon, lat in chunks:
+        lon = np.asarray(lon, dtype=np.float64).ravel()
+        lat = np.asarray(lat, dtype=np.float64).ravel()
+        if not lon.size:
+            continue
+
+        if lon_last is None:
+            lon_last, lat_last = lon[0], lat[0]
+        segments = geodesic_distance_batch(np.concatenate(([lon_last], lon[:-1])),
+                                           np.concatenate(([lat_last], lat[:-1])),
+                                           lon, lat, ellipsoid_name, method)
+        cumulative = np.nancumsum(segments)
+        cumulative += total
+
+        lon_last, lat_last = lon[-1], lat[-1]
+        total = cumulative[-1]
+        cumulative[np.isnan(segments)] = np.nan
+        yield segments, cumulative
+
+
+def track_lengths(lon, lat, ellipsoid_name, method=METHOD_VINCENTY, chunk_size=TRACK_CHUNK_SIZE):
+    """ Computes segment and cumulative lengths of the track, see iter_track_lengths. Track is processed in chunks,
+    so temporary arrays do not grow with the track, e.g. for memory mapped arrays.
+    :param lon: array_like, longitudes of the consecutive points of the track in decimal degrees format
+    :param lat: array_like, latitudes of the consecutive points of the track in decimal degrees format
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method of distance computation, e.g. METHOD_VINCENTY
+    :param chunk_size: int, number of the points processed at once
+    :return segments, cumulative: ndarray, ndarray lengths of the segments ending at the points and lengths
+                                  of the track to the points; meters
+    """
+    n = len(lon)
+    segments = np.empty(n)
+    cumulative = np.empty(n)
+    chunks = ((lon[i:i + chunk_size], lat[i:i + chunk_size]) for i in range(0, n, chunk_size))
+    start = 0
+    for segments_chunk, cumulative_chunk in iter_track_lengths(chunks, ellipsoid_name, method):
+        end = start + len(segments_chunk)
+        segments[start:end] = segments_chunk
+        cumulative[start:end] = cumulative_chunk
+        start = end
+    return segments, cumulative
@@ -0,0 +1,80 @@
+"""
+traverse.py
+traverse module provides functionality to compute traverses - chains of legs defined by bearing and distance
+from the previous point, e.g. airspace boundaries or survey traverses.
+"""
+import numpy as np
+
+from .distance import convert_dist_batch_to_m
+from .ellipsoid_calc import METHOD_VINCENTY, direct_solution, direct_solution_batch
+
+
+def traverse(lon_start, lat_start, legs, ellipsoid_name, method=METHOD_VINCENTY):
+    """ Computes points of the traverse, points are yielded one by one as legs are consumed,
+    so legs can be any iterable, e.g. generator reading legs from a file.
+    :param lon_start: float, longitude of the start point in decimal degrees format
+    :param lat_start: float, latitude of the start point in decimal degrees format
+    :param legs: iterable of (float, Distance), bearing (azimuth) from the previous point in decimal degrees
+                 format and distance from the previous point, distance can be in any unit of UOM_LIST
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method of the direct solution, e.g. METHOD_VINCENTY
+    :return: generator of (float, float), longitude and latitude of the end point of each leg
+             in decimal degrees format
+    """
+    lon, lat = lon_start, lat_start
+    for bearing, distance in legs:
+        if not distance.is_valid:
+            raise ValueError(distance.err_msg)
+        lon, lat = direct_solution(lon, lat, bearing, distance.convert_dist_to_m(), ellipsoid_name, method)
+        yield lon, lat
+
+
+def iter_traverse_batch(lon_start, lat_start, bearings, distances, uom, ellipsoid_name, method=METHOD_VINCENTY):
+    """ Computes many traverses at once, legs are processed one by one, each leg for all traverses
+    in single vectorized direct solution. Traverses with fewer legs can be padded with zero distance legs.
+    :param lon_start: float or array_like, longitudes of the start points in decimal degrees format, shape S
+    :param lat_start: float or array_like, latitudes of the start points in decimal degrees format, shape S
+    :param bearings: array_like, bearings (azimuths) of the legs from the previous points in decimal degrees
+                     format, shape S + (L, ) where L is the number of legs
+    :param distances: array_like, distances of the legs from the previous points, shape S + (L, )
+    :param uom: str or array_like, unit of measure of all distances or units of measure of each distance,
+                e.g. UOM_NM
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method of the direct solution, e.g. METHOD_VINCENTY
+    :return: generator of (ndarray, ndarray), longitudes and latitudes of the end points of the leg
+             in decimal degrees format for all traverses, shape S
+    """
+    bearings = np.asarray(bearings, dtype=np.float64)
+    distances = convert_dist_batch_to_m(distances, uom)
+    bearings, distances = np.broadcast_arrays(bearings, distances)
+
+    lon = np.asarray(lon_start, dtype=np.float64)
+    lat = np.asarray(lat_start, dtype=np.float64)
+    for i in range(bearings.shape[-1]):
+        lon, lat = direct_solution_batch(lon, lat, bearings[..., i], distances[..., i], ellipsoid_name, method)
+        yield lon, lat
+
+
+def traverse_batch(lon_start, lat_start, bearings, distances, uom, ellipsoid_name, method=METHOD_VINCENTY):
+    """ Computes points of many traverses at once, see iter_traverse_batch.
+    :param lon_start: float or array_like, longitudes of the start points in decimal degrees format, shape S
+    :param lat_start: float or array_like, latitudes of the start points in decimal degrees format, shape S
+    :param bearings: array_like, bearings (azimuths) of the legs from the previous points in decimal degrees
+                     format, shape S + (L, ) where L is the number of legs
+    :param distances: array_like, distances of the legs from the previous points, shape S + (L, )
+    :param uom: str or array_like, unit of measure of all distances or units of measure of each distance,
+                e.g. UOM_NM
+    :param ellipsoid_name: str, ellipsoid short name, e.g.: WGS84
+    :param method: str, method of the direct solution, e.g. METHOD_VINCENTY
+    :return lon, lat: ndarray, ndarray longitudes and latitudes of the points of the traverses in decimal degrees
+                      format, shape S + (L + 1, ), first point is the start point
+    """
+    lon = [np.asarray(lon_start, dtype=np.float64)]
+    lat = [np.asarray(lat_start, dtype=np.float64)]
+    for lon_end, lat_end in iter_traverse_batch(lon_start, lat_start, bearings, distances, uom, ellipsoid_name,
+                                                method):
+        lon.append(lon_end)
+        lat.append(lat_end)
+    lon = np.stack(np.broadcast_arrays(*lon), axis=-1)
+    lat = np.stack(np.broadcast_arrays(*lat), axis=-1)
+    return lon, lat